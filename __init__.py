@@ -1,26 +1,34 @@
 """
 Flashcards - A Python flashcard application
 """
+import importlib
 
 __version__ = "0.5"
 __author__ = "Your Name"
 
-# Import main components if needed
-from .import_utils import import_quizlet_lineskip_fix
-from .deck_utils import deck_menu_constructor
-from display_utils import card_displayer, display_deck
-from .quiz_multiple_choice import multiple_choice_quiz
-from .quiz_write_answer import write_answer_quiz
-from .quiz_self_report import self_report_quiz
-from .memory_game import memory_game
+# Main components, name -> module. Each module is only imported the first time one of its names is used
+_EXPORTS = {
+    'import_quizlet_lineskip_fix': 'import_utils',
+    'deck_menu_constructor': 'deck_utils',
+    'card_displayer': 'display_utils',
+    'display_deck': 'display_utils',
+    'multiple_choice_quiz': 'quiz_multiple_choice',
+    'write_answer_quiz': 'quiz_write_answer',
+    'self_report_quiz': 'quiz_self_report',
+    'memory_game': 'memory_game'
+}
 
-__all__ = [
-    'import_quizlet_lineskip_fix',
-    'deck_menu_constructor',
-    'card_displayer',
-    'display_deck',
-    'multiple_choice_quiz',
-    'write_answer_quiz',
-    'self_report_quiz',
-    'memory_game'
-]
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
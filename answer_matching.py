@@ -0,0 +1,149 @@
+"""
+Forgiving grading of typed answers
+
+Both the answer and the guess are normalized first: Unicode NFKC, case folded, punctuation dropped and
+whitespace collapsed. Answers made only of punctuation, like "!=", keep it. A guess is then accepted if
+    - it normalizes to the same text as the answer,
+    - it is within a few typos of a short answer, measured as Damerau-Levenshtein (optimal string alignment)
+      distance, computed only inside a narrow band and given up on as soon as it is over the limit,
+    - it has the same words as a short answer, in any order, or
+    - it has nearly the same words as a long answer, in any order.
+Numbers are never forgiven: unless the guess normalizes to the answer, its numbers must be the answer's, so
+"Python 2" isn't taken for "Python 3".
+
+The normalized form and words of each answer are worked out once and cached by the AnswerGrader, so grading
+a guess against a multi-paragraph answer takes well under a millisecond.
+"""
+import re
+import unicodedata
+from collections import namedtuple
+
+# One typo allowed for every CHARS_PER_EDIT characters of the answer, up to MAX_EDITS
+CHARS_PER_EDIT = 5
+MAX_EDITS = 3
+# Answers longer than this, once normalized, are only compared by their words
+MAX_EDIT_LENGTH = 80
+# Share of words the guess and answer must have in common (Dice coefficient) to be accepted
+MIN_WORD_SIMILARITY = 0.85
+
+_PUNCTUATION = re.compile(r"[^\w\s]|_")
+_NUMBER = re.compile(r"\d+")
+
+# Result of grading a guess: correct if it was accepted, exact if it was accepted without any forgiveness
+Grade = namedtuple("Grade", ["correct", "exact"])
+
+
+def normalize(text, keep_punctuation=False):
+    """Return text in NFKC form, case folded, with punctuation removed and whitespace collapsed."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    if not keep_punctuation:
+        text = _PUNCTUATION.sub(" ", text)
+    return " ".join(text.split())
+
+
+def bounded_distance(first, second, limit):
+    """
+    Optimal string alignment distance between two strings, if it is at most limit.
+
+    :param str first: one string
+    :param str second: the other string
+    :param int limit: the largest distance of interest
+    :return int: the distance, or limit + 1 if it is larger than limit
+    """
+    if first == second:
+        return 0
+    # Common prefixes and suffixes never change the distance
+    shortest = min(len(first), len(second))
+    start = 0
+    while start < shortest and first[start] == second[start]:
+        start += 1
+    end = 0
+    while end < shortest - start and first[-1 - end] == second[-1 - end]:
+        end += 1
+    first = first[start:len(first) - end]
+    second = second[start:len(second) - end]
+    if len(first) > len(second):
+        first, second = second, first
+    too_far = limit + 1
+    if len(second) - len(first) > limit:
+        return too_far
+    if not first:
+        return len(second)
+
+    # Only cells within limit of the diagonal can hold a distance of at most limit
+    width = len(second)
+    before = None
+    previous = [column if column <= limit else too_far for column in range(width + 1)]
+    for row in range(1, len(first) + 1):
+        current = [too_far] * (width + 1)
+        if row <= limit:
+            current[0] = row
+        low = max(1, row - limit)
+        high = min(width, row + limit)
+        best = current[0] if low == 1 else too_far
+        char = first[row - 1]
+        for column in range(low, high + 1):
+            cost = 0 if char == second[column - 1] else 1
+            value = min(previous[column] + 1, current[column - 1] + 1, previous[column - 1] + cost)
+            if (row > 1 and column > 1 and char == second[column - 2] and first[row - 2] == second[column - 1]
+                    and before[column - 2] + 1 < value):
+                value = before[column - 2] + 1
+            current[column] = value
+            if value < best:
+                best = value
+        if best > limit:
+            return too_far
+        before, previous = previous, current
+    return min(previous[width], too_far)
+
+
+def word_similarity(first_words, second_words):
+    """Dice coefficient of two sets of words, from 0 (nothing shared) to 1 (the same words)."""
+    if not first_words and not second_words:
+        return 1.0
+    return 2 * len(first_words & second_words) / (len(first_words) + len(second_words))
+
+
+class AnswerGrader:
+    """
+    Grades guesses against a deck's answers, caching the normalized form of each answer.
+    """
+
+    def __init__(self):
+        self._answers = {}
+
+    def _prepare(self, answer):
+        """Normalized text, words, numbers and whether punctuation counts for an answer, found on first use"""
+        prepared = self._answers.get(answer)
+        if prepared is None:
+            normalized = normalize(answer)
+            keep_punctuation = not normalized
+            if keep_punctuation:
+                normalized = normalize(answer, keep_punctuation=True)
+            words = sorted(normalized.split())
+            prepared = self._answers[answer] = (normalized, words, _NUMBER.findall(normalized), keep_punctuation)
+        return prepared
+
+    def grade(self, guess, answer):
+        """
+        Grade a typed guess.
+
+        :param str guess: what the user typed
+        :param str answer: the answer on the card
+        :return Grade: whether the guess is accepted, and whether it was exactly right
+        """
+        if guess == answer:
+            return Grade(True, True)
+        normalized, words, numbers, keep_punctuation = self._prepare(answer)
+        guess = normalize(guess, keep_punctuation)
+        if guess == normalized:
+            return Grade(True, False)
+        if not guess or _NUMBER.findall(guess) != numbers:
+            return Grade(False, False)
+        guess_words = sorted(guess.split())
+        if len(normalized) > MAX_EDIT_LENGTH:
+            return Grade(word_similarity(set(guess_words), set(words)) >= MIN_WORD_SIMILARITY, False)
+        limit = min(MAX_EDITS, len(normalized) // CHARS_PER_EDIT)
+        if limit and bounded_distance(guess, normalized, limit) <= limit:
+            return Grade(True, False)
+        return Grade(guess_words == words, False)
@@ -3,20 +3,121 @@
 Application controller module for the Flashcards application.
 Contains the main application logic separated into modular functions.
 """
+import importlib
 import json
 import glob
 import os
-from typing import Dict, List, Tuple, Optional, Any
+import sys
+import time
+from collections.abc import MutableMapping
+from typing import TYPE_CHECKING, Callable, Dict, List, Mapping, Tuple, Optional, Any
 
-# Import all modules
-from import_utils import import_quizlet_lineskip_fix
+# Import the modules every session needs, indexes, quiz modes, games and importers are loaded through LAZY_ENTRIES
 from deck_utils import deck_menu_constructor
-from display_utils import display_deck
-from quiz_multiple_choice import multiple_choice_quiz
-from quiz_write_answer import write_answer_quiz
-from quiz_self_report import self_report_quiz
-from memory_game import memory_game
-from constants import MENU_DECK, MENU_MAIN, MENU_GAME, TEST_TYPE_PROMPT, FRONT_TO_BACK_PROMPT
+from deck_journal import append_operation, needs_compaction, clear_journal, rotate_journal, \
+	finish_compaction
+from deck_store import BackgroundDeckWriter, write_deck_file, load_deck_file
+from display_utils import iter_display_deck, DeckPager
+from constants import MENU_DECK, MENU_MAIN, MENU_GAME, TEST_TYPE_PROMPT, FRONT_TO_BACK_PROMPT, PAGE_SIZE, \
+	PAGE_PROMPT
+
+if TYPE_CHECKING:
+	from similarity_index import SimilarityIndex
+	from search_index import SearchIndex
+	from review_history import ReviewHistory
+	from answer_matching import AnswerGrader
+
+
+# Started on first use by get_deck_writer, stopped by shutdown_deck_writer
+_deck_writer: Optional[BackgroundDeckWriter] = None
+
+# Loaded on first use by get_review_history
+_review_history: Optional["ReviewHistory"] = None
+
+# Write answer graders by deck path, so each answer is only normalized once per session
+_answer_graders: Dict[Optional[str], "AnswerGrader"] = {}
+
+# Indexes, quiz modes, games and importers, name -> (module, attribute). A module is only imported the first
+# time one of its entries is used, so starting up costs the same however many modes there are
+LAZY_ENTRIES: Dict[str, Tuple[str, str]] = {
+	"open_similarity_index": ("similarity_index", "open_similarity_index"),
+	"get_open_index": ("similarity_index", "get_open_index"),
+	"save_similarity_index": ("similarity_index", "save_similarity_index"),
+	"open_schedule": ("review_scheduler", "open_schedule"),
+	"get_open_schedule": ("review_scheduler", "get_open_schedule"),
+	"save_schedule": ("review_scheduler", "save_schedule"),
+	"open_search_index": ("search_index", "open_search_index"),
+	"get_open_search_index": ("search_index", "get_open_search_index"),
+	"AnswerGrader": ("answer_matching", "AnswerGrader"),
+	"choose_quiz_length": ("quiz_session", "choose_quiz_length"),
+	"multiple_choice_quiz": ("quiz_multiple_choice", "multiple_choice_quiz"),
+	"write_answer_quiz": ("quiz_write_answer", "write_answer_quiz"),
+	"self_report_quiz": ("quiz_self_report", "self_report_quiz"),
+	"memory_game": ("memory_game", "memory_game"),
+	"import_quizlet_lineskip_fix": ("import_utils", "import_quizlet_lineskip_fix"),
+	"import_quizlet_streaming": ("import_utils", "import_quizlet_streaming"),
+	"import_many": ("batch_import", "import_many"),
+	"format_summary": ("batch_import", "format_summary"),
+}
+
+
+def register_entry(name: str, module_name: str, attribute: Optional[str] = None) -> None:
+	"""
+	Register a quiz mode, game or importer without importing its module.
+
+	Args:
+		name: Name the entry is loaded by
+		module_name: Module to import the first time the entry is used
+		attribute: Name of the entry in its module, the same as name by default
+	"""
+	LAZY_ENTRIES[name] = (module_name, attribute or name)
+
+
+def load_entry(name: str) -> Callable:
+	"""
+	Get a registered quiz mode, game or importer, importing its module on first use.
+
+	Args:
+		name: Name the entry was registered under
+
+	Returns:
+		The function the entry names
+	"""
+	module_name, attribute = LAZY_ENTRIES[name]
+	return getattr(importlib.import_module(module_name), attribute)
+
+
+def get_loaded_entry(name: str) -> Optional[Callable]:
+	"""
+	Get a registered entry only if its module was already imported by load_entry.
+
+	An index or schedule can only be open once its module is loaded, so edits and saves use this to
+	skip the ones never used this session without importing them.
+
+	Args:
+		name: Name the entry was registered under
+
+	Returns:
+		The function the entry names, or None if its module isn't loaded
+	"""
+	module_name, attribute = LAZY_ENTRIES[name]
+	module = sys.modules.get(module_name)
+	return None if module is None else getattr(module, attribute)
+
+
+def get_open_sidecar(getter: str, deck_file_path: str) -> Any:
+	"""
+	Get a deck's open similarity index, review schedule or search index, if it has one.
+
+	Args:
+		getter: Entry name of the get_open_* function of the sidecar's module
+		deck_file_path: Path to the deck file
+
+	Returns:
+		The open sidecar, or None
+	"""
+	get_open = get_loaded_entry(getter)
+	return None if get_open is None else get_open(deck_file_path)
 
 
 def get_program_directory() -> str:
@@ -27,20 +128,26 @@ def get_program_directory() -> str:
 		return os.getcwd()
 
 
-def get_valid_deck_choice(decks: List[str]) -> str:
+def get_valid_deck_choice(decks: List[str], card_counts: Optional[List[Optional[int]]] = None) -> str:
 	"""
 	Get a valid deck choice from the user with proper validation.
 
 	Args:
 		decks: List of deck file paths
+		card_counts: Number of cards in each deck, as kept in the deck catalog, shown next to the names
 
 	Returns:
 		User's deck choice as string
 	"""
 	numbered_paths_and_names = deck_menu_constructor(decks)
-	decks_choice_display = ""
-	for name_path_tup in numbered_paths_and_names:
-		decks_choice_display += f"{name_path_tup[0]}) {name_path_tup[1]}\n"
+	display_lines = []
+	for index, name_path_tup in enumerate(numbered_paths_and_names):
+		line = f"{name_path_tup[0]}) {name_path_tup[1]}"
+		if card_counts is not None:
+			count = card_counts[index]
+			line += " (unreadable)" if count is None else f" ({count} cards)"
+		display_lines.append(line + "\n")
+	decks_choice_display = "".join(display_lines)
 
 	while True:
 		try:
@@ -62,25 +169,28 @@ def get_valid_deck_choice(decks: List[str]) -> str:
 			print("Error: Please enter a valid number or 'i' for importer.")
 
 
-def load_deck(file_path: str) -> Optional[Dict[str, str]]:
+def load_deck(file_path: str) -> Optional[Mapping[str, str]]:
 	"""
-	Load a deck from a JSON file with error handling.
+	Load a deck from a JSON file, or open a compact .fcdk deck, with error handling.
 
 	Args:
-		file_path: Path to the JSON file
+		file_path: Path to the JSON or compact deck file
 
 	Returns:
-		Dictionary containing the deck data, or None if loading failed
+		Mapping containing the deck data, or None if loading failed.
+		Compact decks are read-only and decode cards as they are used.
 	"""
 	try:
-		with open(file_path, 'r', encoding='utf-8') as file:
-			return json.load(file)
+		return load_deck_file(file_path)
 	except FileNotFoundError:
 		print(f"Error: File '{file_path}' not found.")
 		return None
 	except json.JSONDecodeError:
 		print(f"Error: Invalid JSON format in file '{file_path}'.")
 		return None
+	except ValueError as e:
+		print(f"Error: {e}")
+		return None
 	except Exception as e:
 		print(f"Error loading deck: {e}")
 		return None
@@ -88,7 +198,7 @@ def load_deck(file_path: str) -> Optional[Dict[str, str]]:
 
 def save_deck(deck: Dict[str, str], file_path: str) -> bool:
 	"""
-	Save a deck to a JSON file with error handling.
+	Save a deck to a JSON file with error handling. The whole deck is written, so its journal is cleared.
 
 	Args:
 		deck: Dictionary containing the deck data
@@ -97,22 +207,130 @@ def save_deck(deck: Dict[str, str], file_path: str) -> bool:
 	Returns:
 		True if successful, False otherwise
 	"""
+	if not is_editable(deck):
+		# Read-only decks can't have changed since they were opened
+		return True
 	try:
-		with open(file_path, 'w', encoding='utf-8') as file:
-			json.dump(deck, file, sort_keys=True, indent=4, ensure_ascii=False)
+		# A queued background write holds an older copy and must not land after this one
+		flush_deck_writes()
+		write_deck_file(deck, file_path)
+		clear_journal(file_path)
 		return True
 	except Exception as e:
 		print(f"Error saving deck: {e}")
 		return False
 
 
-def handle_display_deck(deck: Dict[str, str]) -> None:
-	"""Handle displaying the current deck."""
-	print(f"\nCurrent deck:\n{display_deck(deck)}\n")
+def checkpoint_deck(deck: Mapping[str, str], file_path: str) -> bool:
+	"""
+	Make sure a deck's edits are on disk when leaving a menu.
 
+	Edits are already journaled as they are made, so the deck file is only
+	rewritten once its journal has grown big enough to be worth compacting,
+	and then on the background writer thread.
+
+	Args:
+		deck: Dictionary containing the deck data
+		file_path: Path of the deck file
+
+	Returns:
+		True if successful, False otherwise
+	"""
+	save_deck_sidecars(file_path)
+	if not is_editable(deck) or not needs_compaction(file_path):
+		return True
+	try:
+		moved_journal = rotate_journal(file_path)
+		get_deck_writer().submit(deck, file_path, on_done=lambda: finish_compaction(moved_journal))
+		return True
+	except Exception as e:
+		print(f"Error saving deck: {e}")
+		return False
+
+
+def save_deck_sidecars(file_path: str) -> None:
+	"""Save the similarity index and review schedule kept next to a deck, if they changed."""
+	try:
+		for name in ("save_similarity_index", "save_schedule"):
+			save = get_loaded_entry(name)
+			if save is not None:
+				save(file_path)
+	except Exception as e:
+		print(f"Error saving deck data: {e}")
+
+
+def get_deck_writer() -> BackgroundDeckWriter:
+	"""Return the background deck writer, starting it if needed."""
+	global _deck_writer
+	if _deck_writer is None:
+		_deck_writer = BackgroundDeckWriter()
+	return _deck_writer
+
+
+def flush_deck_writes() -> None:
+	"""Block until every deck queued for writing is on disk."""
+	if _deck_writer is not None:
+		_deck_writer.flush()
+
+
+def shutdown_deck_writer() -> None:
+	"""Write any queued decks and stop the background writer. Call before the application exits."""
+	global _deck_writer
+	if _deck_writer is not None:
+		_deck_writer.close()
+		_deck_writer = None
+
+
+def is_editable(deck: Mapping[str, str]) -> bool:
+	"""Check whether cards can be added to or removed from a deck."""
+	return isinstance(deck, MutableMapping)
+
+
+def handle_display_deck(deck: Mapping[str, str]) -> None:
+	"""Handle displaying the current deck, printing each card as soon as it is rendered."""
+	print("\nCurrent deck:")
+	for card_display in iter_display_deck(deck):
+		print(card_display, end="")
+	print("\n")
+
+
+def handle_browse_deck(deck: Mapping[str, str], page_size: int = PAGE_SIZE) -> None:
+	"""Handle browsing the current deck one page at a time, only rendering the page shown."""
+	pager = DeckPager(deck, page_size)
+	page_number = 0
+	while True:
+		print(f"\n{pager.render_page(page_number)}")
+		command = input(PAGE_PROMPT).strip()
+		if command.lower() == "q":
+			return
+		elif command.lower() in ["n", ""]:
+			if page_number + 1 < pager.page_count:
+				page_number += 1
+			else:
+				print("This is the last page.")
+		elif command.lower() == "p":
+			if page_number > 0:
+				page_number -= 1
+			else:
+				print("This is the first page.")
+		elif command.startswith("/") and len(command) > 1:
+			found = pager.search(command[1:], after_page=page_number)
+			if found is None:
+				print(f"No card contains '{command[1:]}'.")
+			else:
+				page_number = found
+		elif command.isdigit() and 1 <= int(command) <= pager.page_count:
+			page_number = int(command) - 1
+		else:
+			print(f"Error: Please enter n, p, q, /text or a page number between 1 and {pager.page_count}.")
+
+
+def handle_add_card(deck: Dict[str, str], deck_file_path: Optional[str] = None) -> None:
+	"""Handle adding a new card to the deck, journaling it if the deck's file path is given."""
+	if not is_editable(deck):
+		print("Error: This deck is read-only. Convert it to JSON to edit it.")
+		return
 
-def handle_add_card(deck: Dict[str, str]) -> None:
-	"""Handle adding a new card to the deck."""
 	new_item_front = input("Please type the card front: ").strip()
 	if not new_item_front:
 		print("Error: Card front cannot be empty.")
@@ -125,13 +343,28 @@ def handle_add_card(deck: Dict[str, str]) -> None:
 
 	if new_item_front not in deck:
 		deck[new_item_front] = new_item_back
+		if deck_file_path is not None:
+			append_operation(deck_file_path, "add", new_item_front, new_item_back)
+			similarity = get_open_sidecar("get_open_index", deck_file_path)
+			if similarity is not None:
+				similarity.add(new_item_back)
+			schedule = get_open_sidecar("get_open_schedule", deck_file_path)
+			if schedule is not None:
+				schedule.add(new_item_front)
+			search = get_open_sidecar("get_open_search_index", deck_file_path)
+			if search is not None:
+				search.add(new_item_front, new_item_back)
 		print("Card added successfully!")
 	else:
 		print("Error: Card with this front already exists in deck.")
 
 
-def handle_remove_card(deck: Dict[str, str]) -> None:
-	"""Handle removing a card from the deck."""
+def handle_remove_card(deck: Dict[str, str], deck_file_path: Optional[str] = None) -> None:
+	"""Handle removing a card from the deck, journaling it if the deck's file path is given."""
+	if not is_editable(deck):
+		print("Error: This deck is read-only. Convert it to JSON to edit it.")
+		return
+
 	if not deck:
 		print("Error: Deck is empty. No cards to remove.")
 		return
@@ -143,9 +376,58 @@ def handle_remove_card(deck: Dict[str, str]) -> None:
 
 	if remove in deck:
 		print(f"Removed: {remove} --> {deck[remove]}")
-		del deck[remove]
+		removed_back = deck.pop(remove)
+		if deck_file_path is not None:
+			append_operation(deck_file_path, "remove", remove)
+			similarity = get_open_sidecar("get_open_index", deck_file_path)
+			if similarity is not None:
+				similarity.remove(removed_back)
+			schedule = get_open_sidecar("get_open_schedule", deck_file_path)
+			if schedule is not None:
+				schedule.remove(remove)
+			search = get_open_sidecar("get_open_search_index", deck_file_path)
+			if search is not None:
+				search.remove(remove)
 	else:
 		print("Error: Card not found in deck.")
+		if deck_file_path is not None:
+			suggestions = get_search_index(deck, deck_file_path).suggest(remove)
+			if suggestions:
+				print("Did you mean: " + ", ".join(suggestions) + "?")
+
+
+def get_search_index(deck: Mapping[str, str], deck_file_path: str) -> "SearchIndex":
+	"""
+	Get the search index of a deck's cards, building it on first use.
+
+	Args:
+		deck: The current deck dictionary
+		deck_file_path: Path to the deck file, card edits keep the index of this path up to date
+
+	Returns:
+		The deck's search index
+	"""
+	index = get_open_sidecar("get_open_search_index", deck_file_path)
+	if index is None or index.deck is not deck:
+		print("Indexing cards...")
+	return load_entry("open_search_index")(deck, deck_file_path)
+
+
+def handle_search_deck(deck: Mapping[str, str], deck_file_path: str) -> None:
+	"""Handle searching the fronts and backs of the current deck for words or parts of words."""
+	query = input("Search for: ").strip()
+	if not query:
+		print("Error: Please enter something to search for.")
+		return
+
+	result = get_search_index(deck, deck_file_path).search(query)
+	if not result.total:
+		print(f"No card contains '{query}'.")
+		return
+	for front in result.fronts:
+		print(f"{front} --> {deck[front]}")
+	if result.total > len(result.fronts):
+		print(f"Showing {len(result.fronts)} of {result.total} matching cards.")
 
 
 def get_valid_direction() -> str:
@@ -162,8 +444,33 @@ def get_valid_direction() -> str:
 		print("Error: Please enter 'f' for front-to-back or 'b' for back-to-front.")
 
 
-def handle_quiz_selection(deck: Dict[str, str]) -> None:
-	"""Handle quiz type selection and execution."""
+def get_similarity_index(deck: Mapping[str, str], deck_file_path: str) -> "SimilarityIndex":
+	"""
+	Get the similarity index of a deck's answers, loading or building it on first use.
+
+	Args:
+		deck: The current deck dictionary
+		deck_file_path: Path to the deck file, the index is saved next to it
+
+	Returns:
+		The deck's similarity index
+	"""
+	if get_open_sidecar("get_open_index", deck_file_path) is None:
+		print("Preparing similar answers...")
+	return load_entry("open_similarity_index")(deck, deck_file_path)
+
+
+def handle_quiz_selection(deck: Mapping[str, str], deck_file_path: Optional[str] = None,
+						  questions: Optional[List[Tuple[str, str]]] = None, on_answer=None) -> None:
+	"""
+	Handle quiz type selection and execution.
+
+	Args:
+		deck: The current deck dictionary
+		deck_file_path: Path to the deck file
+		questions: (front, back) pairs to ask, instead of letting the user choose a quiz length
+		on_answer: Called with ((front, back), correct, seconds taken) after each answer
+	"""
 	if not deck:
 		print("Error: Deck is empty. Cannot start quiz.")
 		return
@@ -174,50 +481,151 @@ def handle_quiz_selection(deck: Dict[str, str]) -> None:
 
 			if test_type == "1":
 				direction = get_valid_direction()
-				multiple_choice_quiz(deck, direction)
-				break
+				similarity = None
+				if direction == "f" and deck_file_path is not None \
+						and get_yes_no_input("Use similar-looking answers as the wrong choices?"):
+					similarity = get_similarity_index(deck, deck_file_path)
+				record = answer_recorder(deck_file_path, "multiple choice", direction, on_answer)
+				multiple_choice_quiz = load_entry("multiple_choice_quiz")
+				multiple_choice_quiz(deck, direction, similarity=similarity, questions=questions, on_answer=record)
 			elif test_type == "2":
 				direction = get_valid_direction()
-				write_answer_quiz(deck, direction)
-				break
+				record = answer_recorder(deck_file_path, "write the answer", direction, on_answer)
+				grader = _answer_graders.get(deck_file_path)
+				if grader is None:
+					grader = _answer_graders[deck_file_path] = load_entry("AnswerGrader")()
+				write_answer_quiz = load_entry("write_answer_quiz")
+				write_answer_quiz(deck, direction, questions=questions, on_answer=record, grader=grader)
 			elif test_type == "3":
 				direction = get_valid_direction()
-				self_report_quiz(deck, direction)
-				break
+				record = answer_recorder(deck_file_path, "self report", direction, on_answer)
+				load_entry("self_report_quiz")(deck, direction, questions=questions, on_answer=record)
 			else:
 				print("Error: Please enter 1, 2, or 3 for quiz type.")
+				continue
+			flush_review_history()
+			break
 
 		except KeyboardInterrupt:
 			print("\nQuiz cancelled.")
 			break
 
 
-def handle_memory_game(deck: Dict[str, str]) -> None:
+def get_review_history() -> "ReviewHistory":
+	"""Return the review history of every deck, loading it if needed."""
+	global _review_history
+	if _review_history is None:
+		# Only sessions that quiz or show stats need the history, so it is imported here
+		from review_history import ReviewHistory, HISTORY_DIRECTORY
+		_review_history = ReviewHistory(os.path.join(get_program_directory(), HISTORY_DIRECTORY))
+	return _review_history
+
+
+def flush_review_history() -> None:
+	"""Write the answers recorded since the last flush to disk."""
+	if _review_history is None:
+		return
+	try:
+		_review_history.flush()
+	except Exception as e:
+		print(f"Error saving review history: {e}")
+
+
+def answer_recorder(deck_file_path: Optional[str], mode: str, direction: str, on_answer=None):
+	"""
+	Build a quiz on_answer callback that logs each answer to the review history.
+
+	Args:
+		deck_file_path: Path to the deck file, answers are not logged if None
+		mode: The quiz mode, one of review_history.MODES
+		direction: 'f' or 'b'
+		on_answer: Another callback to call after logging, if any
+
+	Returns:
+		The callback, taking ((front, back), correct, seconds taken)
+	"""
+	if deck_file_path is None:
+		return on_answer
+	history = get_review_history()
+	deck_name = os.path.basename(deck_file_path)
+
+	def record(pair: Tuple[str, str], correct: bool, latency: float) -> None:
+		history.record(deck_name, pair[0], mode, direction, correct, latency)
+		if on_answer is not None:
+			on_answer(pair, correct, latency)
+
+	return record
+
+
+def handle_review_stats(deck_file_path: str) -> None:
+	"""Show the answers recorded for a deck: totals, the hardest cards and the accuracy day by day."""
+	history = get_review_history()
+	deck_name = os.path.basename(deck_file_path)
+	answers, correct, latency = history.deck_summary(deck_name)
+	if not answers:
+		print("No answers have been recorded for this deck yet.")
+		return
+
+	timing = "" if latency is None else f", {latency:.1f} seconds on average"
+	print(f"\nAnswers: {answers}, {round(100 * correct / answers, 2)}% correct{timing}")
+	print("\nHardest cards:")
+	for front, accuracy, count in history.hardest_cards(deck_name):
+		print(f"{round(100 * accuracy)}% of {count}: {front}")
+	print("\nAccuracy by day:")
+	for start, accuracy, count in history.learning_curve(deck_name)[-14:]:
+		print(f"{time.strftime('%Y-%m-%d', time.gmtime(start))}: {round(100 * accuracy)}% of {count}")
+
+
+def handle_review_due(deck: Mapping[str, str], deck_file_path: str) -> None:
+	"""Quiz the cards that are due for review, most overdue first, and reschedule them by the answers."""
+	if not deck:
+		print("Error: Deck is empty. Cannot start review.")
+		return
+
+	schedule = load_entry("open_schedule")(deck, deck_file_path)
+	due = schedule.due_cards(load_entry("choose_quiz_length")(len(deck)))
+	if not due:
+		next_due = schedule.next_due()
+		print(f"No cards are due for review. The next one is due on "
+			  f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(next_due[0]))}.")
+		return
+
+	handle_quiz_selection(deck, deck_file_path, questions=[(front, deck[front]) for front in due],
+						  on_answer=schedule.record_answer)
+	save_deck_sidecars(deck_file_path)
+
+
+def handle_memory_game(deck: Mapping[str, str]) -> None:
 	"""Handle memory game execution."""
 	if not deck:
 		print("Error: Deck is empty. Cannot start memory game.")
 		return
-	memory_game(deck)
+	load_entry("memory_game")(deck)
 
 
-def get_valid_file_choice(files: List[str]) -> int:
+def get_valid_file_choice(files: List[str], allow_all: bool = False) -> Optional[int]:
 	"""
 	Get a valid file choice from the user.
 
 	Args:
 		files: List of file paths
+		allow_all: Whether the user may type 'a' to choose every file
 
 	Returns:
-		Valid file choice index
+		Valid file choice index, or None if all files were chosen
 	"""
 	numbered_paths_and_names = deck_menu_constructor(files)
 	files_choice_display = ""
 	for name_path_tup in numbered_paths_and_names:
 		files_choice_display += f"{name_path_tup[0]}) {name_path_tup[1]}\n"
+	if allow_all:
+		files_choice_display += "Or type 'a' to import all of them: "
 
 	while True:
 		try:
 			file_choice = input(f"Please choose a file: \n{files_choice_display}").strip()
+			if allow_all and file_choice.lower() == "a":
+				return None
 			choice_num = int(file_choice)
 			if 1 <= choice_num <= len(files):
 				return choice_num - 1  # Return 0-based index
@@ -247,6 +655,51 @@ def get_yes_no_input(prompt: str) -> bool:
 			print("Error: Please enter 'y' for yes or 'n' for no.")
 
 
+def get_separators() -> Optional[Tuple[str, str]]:
+	"""
+	Ask which Quizlet export format a file uses.
+
+	Returns:
+		(fbsep, cardsep) tuple, or None if the user gave an empty separator
+	"""
+	is_default = get_yes_no_input(
+		"Did you export using the default Quizlet export?\n"
+		"Separating cards with spaces and card front and backs with tabs?"
+	)
+	if is_default:
+		return "\t", "\n"
+	fbsep = input("Please input the separator you used between card fronts and backs: ").strip()
+	cardsep = input("Please input the separator you used between cards: ").strip()
+	if not fbsep or not cardsep:
+		print("Error: Separators cannot be empty.")
+		return None
+	return fbsep, cardsep
+
+
+def handle_batch_import(txts: List[str]) -> bool:
+	"""
+	Convert every .txt file in parallel and print a summary.
+
+	Args:
+		txts: List of file paths to convert
+
+	Returns:
+		True if at least one file was imported, False otherwise
+	"""
+	separators = get_separators()
+	if separators is None:
+		return False
+	overwrite = get_yes_no_input("Overwrite decks that already exist as JSON files?")
+
+	print(f"Importing {len(txts)} files...")
+	results = load_entry("import_many")(txts, *separators, overwrite=overwrite)
+	if not results:
+		print("Import cancelled, every file already has a deck.")
+		return False
+	print(load_entry("format_summary")(results))
+	return any(result.error is None for result in results)
+
+
 def handle_import_functionality(program_directory: str) -> bool:
 	"""
 	Handle the import functionality for text files.
@@ -263,17 +716,18 @@ def handle_import_functionality(program_directory: str) -> bool:
 		return False
 
 	try:
-		file_index = get_valid_file_choice(txts)
+		file_index = get_valid_file_choice(txts, allow_all=len(txts) > 1)
+		if file_index is None:
+			return handle_batch_import(txts)
 		numbered_paths_and_names = deck_menu_constructor(txts)
 		selected_file_path = numbered_paths_and_names[file_index][2]
 
 		is_quizlet = get_yes_no_input("Is the file a Quizlet export or in the Quizlet export format?")
 
 		if is_quizlet:
-			is_default = get_yes_no_input(
-				"Did you export using the default Quizlet export?\n"
-				"Separating cards with spaces and card front and backs with tabs?"
-			)
+			separators = get_separators()
+			if separators is None:
+				return False
 
 			# Check if file already exists as JSON
 			json_path = selected_file_path.replace('.txt', '.json')
@@ -284,15 +738,12 @@ def handle_import_functionality(program_directory: str) -> bool:
 					return False
 
 			print("Importing...")
-			if is_default:
-				import_quizlet_lineskip_fix(selected_file_path)
+			fbsep, cardsep = separators
+			if cardsep == "\n":
+				load_entry("import_quizlet_lineskip_fix")(selected_file_path)
 			else:
-				fbsep = input("Please input the separator you used between card fronts and backs: ").strip()
-				cardsep = input("Please input the separator you used between cards: ").strip()
-				if not fbsep or not cardsep:
-					print("Error: Separators cannot be empty.")
-					return False
-				import_quizlet_lineskip_fix(selected_file_path, fbsep=fbsep, cardsep=cardsep)
+				# Custom exports can be very large, so convert them in chunks
+				load_entry("import_quizlet_streaming")(selected_file_path, fbsep=fbsep, cardsep=cardsep)
 
 			print("Import completed successfully!")
 			return True
@@ -330,14 +781,14 @@ def run_main_menu(deck: Dict[str, str], deck_file_path: str) -> bool:
 			elif menu_choice == "3":
 				# Exit application
 				print("Thanks for playing, see you next time!")
-				save_deck(deck, deck_file_path)
+				checkpoint_deck(deck, deck_file_path)
 				return False
 			else:
 				print("Error: Invalid menu choice. Please enter a number between 1 and 3.")
 
 		except KeyboardInterrupt:
 			print("\n\nExiting application...")
-			save_deck(deck, deck_file_path)
+			checkpoint_deck(deck, deck_file_path)
 			return False
 		except Exception as e:
 			print(f"An unexpected error occurred: {e}")
@@ -363,12 +814,12 @@ def run_deck_menu(deck: Dict[str, str], deck_file_path: str) -> bool:
 			if menu_choice == "1":
 				handle_display_deck(deck)
 			elif menu_choice == "2":
-				handle_add_card(deck)
+				handle_add_card(deck, deck_file_path)
 			elif menu_choice == "3":
-				handle_remove_card(deck)
+				handle_remove_card(deck, deck_file_path)
 			elif menu_choice == "4":
 				# Save and return to deck selection
-				if save_deck(deck, deck_file_path):
+				if checkpoint_deck(deck, deck_file_path):
 					print("Deck saved successfully!")
 				return True
 			elif menu_choice == "5":
@@ -376,14 +827,18 @@ def run_deck_menu(deck: Dict[str, str], deck_file_path: str) -> bool:
 				if handle_import_functionality(program_directory):
 					return True  # Return to deck selection after successful import
 			elif menu_choice == "6":
+				handle_browse_deck(deck)
+			elif menu_choice == "7":
+				handle_search_deck(deck, deck_file_path)
+			elif menu_choice == "8":
 				run_main_menu(deck, deck_file_path)
 				return False
 			else:
-				print("Error: Invalid menu choice. Please enter a number between 1 and 6.")
+				print("Error: Invalid menu choice. Please enter a number between 1 and 8.")
 
 		except KeyboardInterrupt:
 			print("\n\nExiting application...")
-			save_deck(deck, deck_file_path)
+			checkpoint_deck(deck, deck_file_path)
 			return False
 		except Exception as e:
 			print(f"An unexpected error occurred: {e}")
@@ -406,18 +861,22 @@ def run_game_menu(deck: Dict[str, str], deck_file_path: str) -> bool:
 			menu_choice = input(MENU_GAME).strip()
 
 			if menu_choice == "1":
-				handle_quiz_selection(deck)
+				handle_quiz_selection(deck, deck_file_path)
 			elif menu_choice == "2":
 				handle_memory_game(deck)
 			elif menu_choice == "3":
+				handle_review_due(deck, deck_file_path)
+			elif menu_choice == "4":
+				handle_review_stats(deck_file_path)
+			elif menu_choice == "5":
 				run_main_menu(deck, deck_file_path)
 				return False
 			else:
-				print("Error: Invalid menu choice. Please enter a number between 1 and 3.")
+				print("Error: Invalid menu choice. Please enter a number between 1 and 5.")
 
 		except KeyboardInterrupt:
 			print("\n\nExiting application...")
-			save_deck(deck, deck_file_path)
+			checkpoint_deck(deck, deck_file_path)
 			return False
 		except Exception as e:
 			print(f"An unexpected error occurred: {e}")
@@ -0,0 +1,140 @@
+"""
+Batch import of many flashcard exports at once, spread over all CPU cores
+
+Can be run on its own:
+    python batch_import.py DIRECTORY_OR_GLOB [--fbsep SEP] [--cardsep SEP] [--workers N] [--overwrite]
+
+Exports that already have a .json deck are left alone unless --overwrite is given, as with main.py import.
+The decks are streamed out in file order, so unlike a single file import their cards aren't sorted and a
+repeated front is written each time, though loading either deck gives the same cards.
+"""
+import argparse
+import glob
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from import_utils import import_quizlet_streaming
+
+# Outcome of converting one file. error is None on success, otherwise the message of what went wrong
+ImportResult = namedtuple("ImportResult", ["path", "cards", "skipped", "size", "seconds", "error"])
+
+
+def find_exports(target):
+    """
+    Find the export files to convert.
+
+    :param str target: A directory, whose .txt files are all used, or a glob pattern.
+    :return list: sorted list of file paths.
+    """
+    if os.path.isdir(target):
+        target = os.path.join(target, "*.txt")
+    return sorted(path for path in glob.glob(target) if os.path.isfile(path))
+
+
+def convert_export(filepath, fbsep="\t", cardsep="\n"):
+    """
+    Convert one export to a .json deck next to it, timing the conversion. Runs inside a worker process.
+
+    :param str filepath: File path of file to be converted, must be a .txt file
+    :param str fbsep: Separation value between front and back of card, default is tab "\t.
+    :param str cardsep: Separation value between card and card, default is linebreak "\n".
+    :return ImportResult: what happened to the file.
+    """
+    skipped = 0
+
+    def count_skipped(item):
+        nonlocal skipped
+        skipped += 1
+
+    start = time.perf_counter()
+    try:
+        size = os.path.getsize(filepath)
+        # Fails without touching the .json deck when the file isn't an export in this format
+        cards = import_quizlet_streaming(filepath, fbsep, cardsep, on_skip=count_skipped)
+    except Exception as e:
+        return ImportResult(filepath, 0, skipped, 0, time.perf_counter() - start, str(e))
+    return ImportResult(filepath, cards, skipped, size, time.perf_counter() - start, None)
+
+
+def import_many(paths, fbsep="\t", cardsep="\n", workers=None, overwrite=True):
+    """
+    Convert many exports in parallel, each worker writing its own .json deck.
+
+    :param list paths: File paths of the files to be converted.
+    :param str fbsep: Separation value between front and back of card, default is tab "\t.
+    :param str cardsep: Separation value between card and card, default is linebreak "\n".
+    :param int workers: Number of worker processes, defaults to the number of CPUs.
+    :param bool overwrite: If False, files that already have a .json deck are left alone.
+    :return list: an ImportResult per converted file, in the order of paths.
+    """
+    if not overwrite:
+        paths = [path for path in paths if not os.path.exists(os.path.splitext(path)[0] + ".json")]
+    if not paths:
+        return []
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(convert_export, path, fbsep, cardsep): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                results[path] = future.result()
+            except Exception as e:
+                # The worker itself died, eg. it was killed or ran out of memory
+                results[path] = ImportResult(path, 0, 0, 0, 0.0, str(e))
+    return [results[path] for path in paths]
+
+
+def format_summary(results):
+    """
+    Build a printable report of a batch import.
+
+    :param list results: ImportResult tuples from import_many.
+    :return str: one line per file followed by the totals, and a note on card order if any deck was written.
+    """
+    lines = []
+    for result in results:
+        name = os.path.basename(result.path)
+        if result.error is not None:
+            lines.append(f"FAILED  {name}: {result.error}")
+            continue
+        seconds = max(result.seconds, 1e-9)
+        lines.append(f"ok      {name}: {result.cards} cards, {result.skipped} skipped, "
+                     f"{result.cards / seconds:,.0f} cards/s, {result.size / seconds / 1e6:.2f} MB/s")
+    failed = sum(1 for result in results if result.error is not None)
+    cards = sum(result.cards for result in results)
+    skipped = sum(result.skipped for result in results)
+    lines.append(f"{len(results) - failed} of {len(results)} files imported, {cards} cards, "
+                 f"{skipped} skipped, {failed} failed.")
+    if failed < len(results):
+        lines.append("The decks keep their cards in file order, where importing a single file sorts them.")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command line entry point, returns the exit status."""
+    parser = argparse.ArgumentParser(description="Convert many Quizlet exports to .json decks in parallel.")
+    parser.add_argument("target", help="a directory of .txt exports, or a glob pattern")
+    parser.add_argument("--fbsep", default="\t", help="separator between card front and back (default: tab)")
+    parser.add_argument("--cardsep", default="\n", help="separator between cards (default: linebreak)")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: all cores)")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="replace the decks of exports that already have one (default: leave them)")
+    args = parser.parse_args(argv)
+
+    paths = find_exports(args.target)
+    if not paths:
+        print(f"Error: No files found for '{args.target}'.")
+        return 1
+    results = import_many(paths, args.fbsep, args.cardsep, args.workers, overwrite=args.overwrite)
+    if results:
+        print(format_summary(results))
+    if len(results) < len(paths):
+        print(f"{len(paths) - len(results)} of {len(paths)} files already have a deck and were left alone, "
+              f"use --overwrite to replace them.")
+    return 1 if any(result.error is not None for result in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,216 @@
+"""
+Add, update and remove many cards at once
+
+A batch of edits is checked as a whole before the deck is touched: the edit kinds, empty fronts and backs,
+and the fronts to update or remove that aren't in the deck. If anything is wrong nothing is changed and
+every problem is reported together. Adding a front the deck already has is handled by the conflict policy:
+    skip        the card already in the deck stays,
+    overwrite   its back is replaced,
+    rename      the new card is added as "front (2)", "front (3)", ... instead.
+
+The deck file is then written once, whatever the size of the batch, and its journal cleared, so a script
+loading 100,000 cards takes a couple of seconds rather than a journal write per card.
+
+Edits can be read from a CSV or TSV file with a header row naming the columns "front" and "back", and
+optionally "op" (add, update or remove, add if left out). A file without a header is read as front, back rows.
+
+Can be run on its own:
+    python bulk_edit.py DECK EDITS [--policy skip|overwrite|rename] [--delimiter CHAR]
+"""
+import argparse
+import csv
+from collections import namedtuple
+from collections.abc import MutableMapping
+
+from deck_journal import clear_journal
+from deck_store import write_deck_file, load_deck_file
+
+OPERATIONS = ("add", "update", "remove")
+POLICIES = ("skip", "overwrite", "rename")
+# Renamed cards and problems listed by main, the rest are only counted
+MAX_LISTED = 20
+
+# One card edit, back is None for "remove". line is where it came from, for error messages
+CardEdit = namedtuple("CardEdit", ["op", "front", "back", "line"], defaults=(None, None))
+# What a batch did to the deck. skipped lists the fronts left alone, renamed (front, new front) pairs
+BulkResult = namedtuple("BulkResult", ["added", "updated", "removed", "skipped", "renamed"])
+
+
+class BulkEditError(ValueError):
+    """
+    A batch of edits that can't be applied. Nothing was changed.
+
+    :param list problems: one message per invalid edit
+    """
+
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__(f"{len(problems)} invalid edits, first: {problems[0]}")
+
+
+def _where(edit, number):
+    """How to refer to an edit in an error message"""
+    return f"line {edit.line}" if edit.line is not None else f"edit {number}"
+
+
+def _problem(edit):
+    """What is wrong with an edit on its own, None if nothing is"""
+    if edit.op not in OPERATIONS:
+        return f"unknown operation '{edit.op}', expected add, update or remove"
+    if not edit.front:
+        return "card front cannot be empty"
+    if edit.op != "remove" and not edit.back:
+        return "card back cannot be empty"
+    return None
+
+
+def _free_front(front, present):
+    """The first of "front (2)", "front (3)", ... that present(front) is False for"""
+    number = 2
+    while present(f"{front} ({number})"):
+        number += 1
+    return f"{front} ({number})"
+
+
+def apply_edits(deck, edits, policy="skip", deck_path=None):
+    """
+    Apply a batch of edits to a deck as one transaction.
+
+    :param deck: the deck to change, a dictionary or Deck of fronts to backs
+    :param edits: CardEdit tuples, or (op, front, back) tuples, applied in order
+    :param str policy: what to do when adding a front the deck already has, one of POLICIES
+    :param str deck_path: if given, the deck is written to this file once the edits are made
+    :return BulkResult: counts of what was done
+    :raises BulkEditError: if any edit is invalid, in which case the deck is left unchanged
+    :raises ValueError: if the deck is read-only, like a compact deck
+    """
+    if not isinstance(deck, MutableMapping):
+        raise ValueError("This deck is read-only. Convert it to JSON to edit it.")
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown conflict policy '{policy}', expected one of {', '.join(POLICIES)}.")
+    edits = [CardEdit(*edit) for edit in edits]
+    edits = [edit._replace(op=(edit.op or "add").strip().lower(), front=(edit.front or "").strip(),
+                           back=edit.back.strip() if edit.back is not None else None) for edit in edits]
+
+    # Work out the changes against the deck as the batch leaves it, before changing anything
+    changes = {}
+    renamed = []
+    skipped = []
+    added = updated = removed = 0
+
+    def present(front):
+        return changes[front] is not None if front in changes else front in deck
+
+    problems = []
+    for number, edit in enumerate(edits, 1):
+        front = edit.front
+        problem = _problem(edit)
+        if problem is not None:
+            problems.append(f"{_where(edit, number)}: {problem}")
+            continue
+        if edit.op == "add" and present(front):
+            if policy == "skip":
+                skipped.append(front)
+                continue
+            if policy == "rename":
+                front = _free_front(front, present)
+                renamed.append((edit.front, front))
+            else:
+                updated += 1
+                changes[front] = edit.back
+                continue
+        if edit.op == "add":
+            added += 1
+            changes[front] = edit.back
+        elif not present(front):
+            problems.append(f"{_where(edit, number)}: no card with the front '{front}' to {edit.op}")
+        elif edit.op == "update":
+            updated += 1
+            changes[front] = edit.back
+        else:
+            removed += 1
+            changes[front] = None
+    if problems:
+        raise BulkEditError(problems)
+
+    for front, back in changes.items():
+        if back is None:
+            deck.pop(front, None)
+        else:
+            deck[front] = back
+    if deck_path is not None:
+        write_deck_file(deck, deck_path)
+        clear_journal(deck_path)
+    return BulkResult(added, updated, removed, skipped, renamed)
+
+
+def read_edits(path, delimiter=None):
+    """
+    Read edits from a CSV or TSV file.
+
+    :param str path: the file, a ".tsv" or ".tab" file is tab separated unless delimiter is given
+    :param str delimiter: the column separator, a comma by default
+    :return iterator: a CardEdit for each row, blank rows are skipped
+    """
+    if delimiter is None:
+        delimiter = "\t" if path.lower().endswith((".tsv", ".tab")) else ","
+    with open(path, 'r', encoding='utf-8-sig', newline='') as file:
+        rows = csv.reader(file, delimiter=delimiter)
+        columns = None
+        for row in rows:
+            if not any(cell.strip() for cell in row):
+                continue
+            if columns is None:
+                header = [cell.strip().lower() for cell in row]
+                if "front" in header:
+                    columns = {name: header.index(name) for name in ("op", "front", "back") if name in header}
+                    continue
+                columns = {"front": 0, "back": 1}
+            values = {name: row[index] if index < len(row) else None for name, index in columns.items()}
+            yield CardEdit(values.get("op"), values["front"], values.get("back"), rows.line_num)
+
+
+def format_result(result):
+    """
+    Build a printable summary of a batch.
+
+    :param BulkResult result: what the batch did
+    :return str: the counts, and the first renamed cards
+    """
+    lines = [f"{result.added} added, {result.updated} updated, {result.removed} removed, "
+             f"{len(result.skipped)} skipped, {len(result.renamed)} renamed."]
+    lines.extend(f"Renamed: {front} --> {new_front}" for front, new_front in result.renamed[:MAX_LISTED])
+    if len(result.renamed) > MAX_LISTED:
+        lines.append(f"... and {len(result.renamed) - MAX_LISTED} more renamed.")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command line entry point, returns the exit status."""
+    parser = argparse.ArgumentParser(description="Add, update and remove many cards of a deck from a CSV or TSV file.")
+    parser.add_argument("deck", help="the .json deck to edit, created if it doesn't exist")
+    parser.add_argument("edits", help="CSV or TSV file of edits, with front, back and optionally op columns")
+    parser.add_argument("--policy", choices=POLICIES, default="skip",
+                        help="what to do when adding a front the deck already has (default: skip)")
+    parser.add_argument("--delimiter", default=None, help="column separator (default: tab for .tsv, else comma)")
+    args = parser.parse_args(argv)
+
+    try:
+        deck = load_deck_file(args.deck, missing_ok=True)
+        result = apply_edits(deck, read_edits(args.edits, args.delimiter), args.policy, args.deck)
+    except BulkEditError as e:
+        print("Error: No changes were made.")
+        for problem in e.problems[:MAX_LISTED]:
+            print(f"  {problem}")
+        if len(e.problems) > MAX_LISTED:
+            print(f"  ... and {len(e.problems) - MAX_LISTED} more.")
+        return 1
+    except (OSError, ValueError, csv.Error) as e:
+        print(f"Error: {e}")
+        return 1
+    print(format_result(result))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
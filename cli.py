@@ -0,0 +1,259 @@
+"""
+Command line interface, for using the decks from scripts without the menus
+
+    python main.py list
+    python main.py show DECK [--search QUERY] [--limit N]
+    python main.py add DECK FRONT BACK [--policy skip|overwrite|rename]
+    python main.py add DECK --from FILE [--policy skip|overwrite|rename]
+    python main.py remove DECK FRONT [FRONT ...]
+    python main.py import [TARGET] [--fbsep SEP] [--cardsep SEP] [--overwrite]
+    python main.py quiz DECK --answers-from FILE [--direction f|b] [--record]
+    python main.py stats DECK [--count N]
+
+A deck is named by its path, its file name or its name without the extension, looked up in --directory, the
+program's directory by default. Every command takes --json to print its result as JSON for other programs.
+The commands are thin wrappers around the functions of deck_api, which scripts can also call directly.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+import deck_api
+from bulk_edit import BulkEditError, CardEdit, POLICIES, read_edits, format_result
+from deck_store import load_deck_file
+from search_index import SearchIndex
+
+
+def _print_json(value):
+    print(json.dumps(value, ensure_ascii=False, indent=4))
+
+
+def _deck_path(args):
+    return deck_api.find_deck(args.directory, args.deck)
+
+
+def command_list(args):
+    """List the decks and their card counts."""
+    decks = deck_api.list_decks(args.directory)
+    if args.json:
+        _print_json([deck._asdict() for deck in decks])
+        return 0
+    if not decks:
+        print("No deck files found.")
+    for deck in decks:
+        cards = "unreadable" if deck.cards is None else f"{deck.cards} cards"
+        print(f"{deck.name} ({cards})")
+    return 0
+
+
+def command_show(args):
+    """Print the cards of a deck, or the ones matching a search."""
+    deck = load_deck_file(_deck_path(args))
+    if args.search is not None:
+        total, fronts = deck_api.search_cards(deck, args.search, args.limit or len(deck))
+    else:
+        fronts = list(deck)[:args.limit] if args.limit else list(deck)
+        total = len(deck)
+    if args.json:
+        _print_json({"total": total, "cards": [{"front": front, "back": deck[front]} for front in fronts]})
+        return 0
+    for front in fronts:
+        print(f"{front} --> {deck[front]}")
+    if total > len(fronts):
+        print(f"Showing {len(fronts)} of {total} cards.")
+    return 0
+
+
+def _edit(args, edits):
+    """Apply edits to the deck named by args, printing what was done or what was wrong"""
+    path = _deck_path(args)
+    try:
+        result = deck_api.edit_cards(path, edits, args.policy)
+    except BulkEditError as e:
+        if args.json:
+            _print_json({"error": "No changes were made.", "problems": e.problems})
+        else:
+            print("Error: No changes were made.")
+            for problem in e.problems:
+                print(f"  {problem}")
+        return 1
+    if args.json:
+        _print_json(result._asdict())
+    else:
+        print(format_result(result))
+    return 0
+
+
+def command_add(args):
+    """Add a card, or every card of a CSV or TSV file."""
+    if args.from_file is not None:
+        if args.front is not None:
+            print("Error: Give either a card front and back or --from, not both.")
+            return 1
+        return _edit(args, read_edits(args.from_file))
+    if args.front is None or args.back is None:
+        print("Error: Please give the card front and back, or --from FILE.")
+        return 1
+    return _edit(args, [CardEdit("add", args.front, args.back)])
+
+
+def command_remove(args):
+    """Remove cards by their fronts, suggesting close fronts for the ones not found."""
+    status = _edit(args, [CardEdit("remove", front) for front in args.fronts])
+    if status and not args.json:
+        deck = load_deck_file(_deck_path(args))
+        index = SearchIndex(deck)
+        for front in args.fronts:
+            suggestions = index.suggest(front) if front not in deck else []
+            if suggestions:
+                print(f"'{front}' not found. Did you mean: " + ", ".join(suggestions) + "?")
+    return status
+
+
+def command_import(args):
+    """Convert Quizlet exports to JSON decks."""
+    # Only this command needs the process pool, so it is imported here
+    from batch_import import find_exports, import_many, format_summary
+    paths = find_exports(args.target or args.directory)
+    if not paths:
+        print(f"Error: No files found for '{args.target or args.directory}'.")
+        return 1
+    results = import_many(paths, args.fbsep, args.cardsep, args.workers, overwrite=args.overwrite)
+    if args.json:
+        _print_json([result._asdict() for result in results])
+    else:
+        if results:
+            print(format_summary(results))
+        if len(results) < len(paths):
+            print(f"{len(paths) - len(results)} of {len(paths)} files already have a deck and were left alone, "
+                  f"use --overwrite to replace them.")
+    return 1 if any(result.error is not None for result in results) else 0
+
+
+def command_quiz(args):
+    """Grade a file of answers as a write the answer quiz."""
+    path = _deck_path(args)
+    deck = load_deck_file(path)
+    if args.answers_from == "-":
+        answers = deck_api.read_answers(sys.stdin)
+    else:
+        with open(args.answers_from, 'r', encoding='utf-8-sig') as file:
+            answers = deck_api.read_answers(file)
+    result = deck_api.grade_answers(deck, answers, args.direction)
+    if args.record:
+        deck_api.record_answers(deck, path, result.answers, args.direction)
+    correct = sum(answer.correct for answer in result.answers)
+    if args.json:
+        _print_json({"correct": correct, "answers": [answer._asdict() for answer in result.answers],
+                     "unknown": result.unknown})
+        return 0
+    for answer in result.answers:
+        if answer.correct:
+            print(f"Correct: {answer.question}")
+        else:
+            expected = answer.back if args.direction == "f" else answer.front
+            print(f"Wrong: {answer.question} (the answer is: {expected})")
+    for question in result.unknown:
+        print(f"Not in the deck: {question}")
+    if result.answers:
+        print(f"{correct} of {len(result.answers)} correct, {round(100 * correct / len(result.answers), 2)}%")
+    return 0
+
+
+def command_stats(args):
+    """Print the answers recorded for a deck."""
+    stats = deck_api.deck_stats(_deck_path(args), args.count)
+    if args.json:
+        _print_json(stats)
+        return 0
+    if not stats["answers"]:
+        print("No answers have been recorded for this deck yet.")
+        return 0
+    timing = "" if stats["average_seconds"] is None else f", {stats['average_seconds']:.1f} seconds on average"
+    print(f"Answers: {stats['answers']}, {round(100 * stats['correct'] / stats['answers'], 2)}% correct{timing}")
+    print("Hardest cards:")
+    for front, accuracy, count in stats["hardest"]:
+        print(f"{round(100 * accuracy)}% of {count}: {front}")
+    print("Accuracy by day:")
+    for day, accuracy, count in stats["by_day"]:
+        print(f"{day}: {round(100 * accuracy)}% of {count}")
+    return 0
+
+
+def build_parser():
+    """Build the argument parser with a subparser for each command."""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--directory", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="directory holding the decks (default: the program's directory)")
+    common.add_argument("--json", action="store_true", help="print the result as JSON")
+
+    parser = argparse.ArgumentParser(prog="main.py", description="Use flashcard decks without the menus.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", parents=[common], help="list the decks").set_defaults(handler=command_list)
+
+    show = commands.add_parser("show", parents=[common], help="print the cards of a deck")
+    show.add_argument("deck")
+    show.add_argument("--search", default=None, help="only show cards containing these words")
+    show.add_argument("--limit", type=int, default=None, help="the most cards to show")
+    show.set_defaults(handler=command_show)
+
+    add = commands.add_parser("add", parents=[common], help="add cards to a deck")
+    add.add_argument("deck")
+    add.add_argument("front", nargs="?")
+    add.add_argument("back", nargs="?")
+    add.add_argument("--from", dest="from_file", default=None,
+                     help="CSV or TSV file of cards, with front, back and optionally op columns")
+    add.add_argument("--policy", choices=POLICIES, default="skip",
+                     help="what to do when adding a front the deck already has (default: skip)")
+    add.set_defaults(handler=command_add)
+
+    remove = commands.add_parser("remove", parents=[common], help="remove cards from a deck")
+    remove.add_argument("deck")
+    remove.add_argument("fronts", nargs="+", metavar="front")
+    remove.set_defaults(handler=command_remove, policy="skip")
+
+    importer = commands.add_parser("import", parents=[common], help="convert Quizlet exports to decks")
+    importer.add_argument("target", nargs="?", default=None,
+                          help="an export, a directory of .txt exports or a glob pattern (default: --directory)")
+    importer.add_argument("--fbsep", default="\t", help="separator between card front and back (default: tab)")
+    importer.add_argument("--cardsep", default="\n", help="separator between cards (default: linebreak)")
+    importer.add_argument("--workers", type=int, default=None, help="number of worker processes (default: all cores)")
+    importer.add_argument("--overwrite", action="store_true",
+                          help="replace the decks of exports that already have one (default: leave them)")
+    importer.set_defaults(handler=command_import)
+
+    quiz = commands.add_parser("quiz", parents=[common], help="grade a file of typed answers")
+    quiz.add_argument("deck")
+    quiz.add_argument("--answers-from", required=True, metavar="FILE",
+                      help='file of "question<TAB>answer" lines, or - for standard input')
+    quiz.add_argument("--direction", choices=("f", "b"), default="f",
+                      help="f: the questions are fronts, b: the questions are backs (default: f)")
+    quiz.add_argument("--record", action="store_true", help="log the answers and reschedule the cards")
+    quiz.set_defaults(handler=command_quiz)
+
+    stats = commands.add_parser("stats", parents=[common], help="show the answers recorded for a deck")
+    stats.add_argument("deck")
+    stats.add_argument("--count", type=int, default=10, help="how many of the hardest cards to list")
+    stats.set_defaults(handler=command_stats)
+    return parser
+
+
+def main(argv=None):
+    """Command line entry point, returns the exit status."""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except BrokenPipeError:
+        # The output was piped into something that stopped reading, like head. Nothing more can be printed
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (OSError, ValueError, csv.Error) as e:
+        print(f"Error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
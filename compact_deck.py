@@ -0,0 +1,228 @@
+"""
+Compact binary deck format, opened with mmap so cards are only decoded when they are used
+
+Layout of a .fcdk file, all integers little-endian:
+    header        magic b"FCDK", version (u16), reserved (u16), card count n (u32)
+    offset table  2n + 1 u64 offsets into the blob: front 0, back 0, front 1, back 1, ..., end of blob
+    blob          the UTF-8 text of every front and back, cards sorted by front
+
+UTF-8 keeps code point order when compared byte by byte, so a front can be found with a binary search
+over the raw bytes without decoding anything else.
+
+Can be run on its own to convert decks:
+    python compact_deck.py DECK.json    (writes DECK.fcdk)
+    python compact_deck.py DECK.fcdk    (writes DECK.json)
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping, ItemsView, ValuesView
+
+from deck_journal import clear_journal
+from deck_store import atomic_open, write_deck_file, load_deck_file
+
+COMPACT_EXTENSION = ".fcdk"
+MAGIC = b"FCDK"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+OFFSET = struct.Struct("<Q")
+
+
+class CompactItemsView(ItemsView):
+    """Items of a CompactDeck, read straight from the blob instead of looking each front up again"""
+
+    def __iter__(self):
+        deck = self._mapping
+        for index in range(len(deck)):
+            yield deck.card(index)
+
+
+class CompactValuesView(ValuesView):
+    """Backs of a CompactDeck, in front order"""
+
+    def __iter__(self):
+        deck = self._mapping
+        for index in range(len(deck)):
+            yield deck._text(2 * index + 1)
+
+
+class CompactDeck(Mapping):
+    """
+    A read-only deck backed by a memory-mapped .fcdk file.
+
+Behaves like the Dict[str, str] of a JSON deck, but opening it only reads the header, and each card is
+decoded the first time it is asked for.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"'{path}' is not a compact deck file.")
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"'{path}' is not a compact deck file.")
+        magic, version, _, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"'{path}' is not a compact deck file.")
+        self._count = count
+        self._reverse = None
+        self._blob_start = HEADER.size + OFFSET.size * (2 * count + 1)
+        if len(self._map) < self._blob_start or self._blob_start + self._offset(2 * count) != len(self._map):
+            self.close()
+            raise ValueError(f"Compact deck '{path}' is truncated.")
+
+    def _offset(self, slot):
+        return OFFSET.unpack_from(self._map, HEADER.size + OFFSET.size * slot)[0]
+
+    def _raw(self, slot):
+        """The encoded bytes of a front (even slot) or back (odd slot)"""
+        return self._map[self._blob_start + self._offset(slot):self._blob_start + self._offset(slot + 1)]
+
+    def _text(self, slot):
+        return self._raw(slot).decode("utf-8")
+
+    def card(self, index):
+        """Return the (front, back) pair at a position in front order, in constant time."""
+        if not 0 <= index < self._count:
+            raise IndexError("card index out of range")
+        return self._text(2 * index), self._text(2 * index + 1)
+
+    def _find(self, front):
+        """Binary search for a front, returns its index or -1"""
+        if not isinstance(front, str):
+            return -1
+        target = front.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._raw(2 * middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._raw(2 * low) == target:
+            return low
+        return -1
+
+    def __getitem__(self, front):
+        index = self._find(front)
+        if index == -1:
+            raise KeyError(front)
+        return self._text(2 * index + 1)
+
+    def __contains__(self, front):
+        return self._find(front) != -1
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._text(2 * index)
+
+    def __len__(self):
+        return self._count
+
+    def items(self):
+        return CompactItemsView(self)
+
+    def fronts_for(self, back):
+        """Return the fronts of every card with this back. The reverse index is built on the first call."""
+        if self._reverse is None:
+            self._reverse = {}
+            for front, card_back in self.items():
+                self._reverse.setdefault(card_back, []).append(front)
+        return tuple(self._reverse.get(back, ()))
+
+    def values(self):
+        return CompactValuesView(self)
+
+    def close(self):
+        """Release the memory map and the file."""
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+def write_compact_deck(deck, path):
+    """
+    Write a deck in the compact format.
+
+    :param deck: a mapping of card fronts to card backs
+    :param str path: where to write the .fcdk file
+    """
+    offsets = array("Q", [0])
+    chunks = []
+    position = 0
+    for front in sorted(deck):
+        for text in (front, deck[front]):
+            encoded = text.encode("utf-8")
+            chunks.append(encoded)
+            position += len(encoded)
+            offsets.append(position)
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    with atomic_open(path, "wb") as fileobj:
+        fileobj.write(HEADER.pack(MAGIC, VERSION, 0, len(offsets) // 2))
+        fileobj.write(offsets.tobytes())
+        fileobj.writelines(chunks)
+
+
+def json_to_compact(json_path, compact_path=None):
+    """
+    Convert a JSON deck to the compact format.
+
+    :param str json_path: the JSON deck to convert
+    :param str compact_path: where to write, defaults to the same name with a .fcdk extension
+    :return str: path of the written compact deck
+    """
+    if compact_path is None:
+        compact_path = os.path.splitext(json_path)[0] + COMPACT_EXTENSION
+    write_compact_deck(load_deck_file(json_path), compact_path)
+    return compact_path
+
+
+def compact_to_json(compact_path, json_path=None):
+    """
+    Convert a compact deck back to a JSON deck.
+
+    :param str compact_path: the .fcdk deck to convert
+    :param str json_path: where to write, defaults to the same name with a .json extension
+    :return str: path of the written JSON deck
+    """
+    if json_path is None:
+        json_path = os.path.splitext(compact_path)[0] + ".json"
+    with CompactDeck(compact_path) as deck:
+        cards = dict(deck.items())
+    write_deck_file(cards, json_path)
+    clear_journal(json_path)
+    return json_path
+
+
+def main(argv=None):
+    """Command line entry point, converts each deck given to the other format."""
+    paths = sys.argv[1:] if argv is None else argv
+    if not paths:
+        print("Usage: python compact_deck.py DECK.json|DECK.fcdk ...")
+        return 1
+    for path in paths:
+        if path.endswith(COMPACT_EXTENSION):
+            print(f"{path} -> {compact_to_json(path)}")
+        else:
+            print(f"{path} -> {json_to_compact(path)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
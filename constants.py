@@ -25,15 +25,24 @@ MENU_DECK = """\nmenu:
 3. Delete item
 4. Switch decks
 5. Import and convert decks
-6. Return to main menu
+6. Browse deck page by page
+7. Search cards
+8. Return to main menu
 
 Your choice: """
 
+PAGE_SIZE = 10
+
+PAGE_PROMPT = """n: next page, p: previous page, a page number to jump to it,
+/text to search for text, q to stop browsing: """
+
 MENU_GAME = """\nmenu:
 
 1. Quiz yourself
 2. Play a game
-3. Return to main menu
+3. Review due cards
+4. Review statistics
+5. Return to main menu
 
 Your choice: """
 
@@ -0,0 +1,175 @@
+"""
+Deck operations for scripts and the command line interface
+
+Each function takes everything it needs as arguments and returns its result rather than printing it or
+asking for input, so decks can be listed, searched, edited, quizzed and summarized without a terminal.
+"""
+import os
+import time
+from collections import namedtuple
+
+from answer_matching import AnswerGrader
+from bulk_edit import apply_edits
+from deck_store import load_deck_file
+from deck_catalog import refresh_catalog, DECK_EXTENSIONS
+from deck_model import reverse_index
+from review_history import ReviewHistory, HISTORY_DIRECTORY, MODES
+from review_scheduler import open_schedule, save_schedule
+from search_index import SearchIndex
+
+# A deck of a directory, as listed by list_decks
+DeckInfo = namedtuple("DeckInfo", ["name", "path", "cards"])
+# One graded answer. front and back are the card asked, given is what was answered
+GradedAnswer = namedtuple("GradedAnswer", ["question", "front", "back", "given", "correct", "exact"])
+# The answers of a scripted quiz, and the questions that aren't on any card of the deck
+QuizResult = namedtuple("QuizResult", ["answers", "unknown"])
+
+
+def list_decks(directory):
+    """
+    List the decks of a directory with their card counts, from its catalog.
+
+    :param str directory: the directory holding the decks
+    :return list: a DeckInfo for each deck, sorted by file name
+    """
+    catalog = refresh_catalog(directory)
+    return [DeckInfo(os.path.splitext(name)[0], os.path.join(directory, name), entry["cards"])
+            for name, entry in catalog.items()]
+
+
+def find_deck(directory, name):
+    """
+    Find a deck by its path, its file name or its name without the extension.
+
+    :param str directory: the directory to look for file names and names in
+    :param str name: what the deck was called
+    :return str: path of the deck file
+    :raises FileNotFoundError: if no deck has that name
+    """
+    if os.path.isfile(name):
+        return name
+    for candidate in [name] + [name + extension for extension in DECK_EXTENSIONS]:
+        path = os.path.join(directory, candidate)
+        if os.path.isfile(path):
+            return path
+    raise FileNotFoundError(f"No deck named '{name}' in {directory}.")
+
+
+def search_cards(deck, query, limit):
+    """
+    Search the fronts and backs of a deck.
+
+    :param deck: the deck to search
+    :param str query: the words to look for
+    :param int limit: the most cards to return
+    :return SearchResult: the matching fronts, best first, and how many cards matched
+    """
+    return SearchIndex(deck).search(query, limit)
+
+
+def edit_cards(path, edits, policy="skip"):
+    """
+    Add, update and remove cards of a deck file as one batch, writing the deck once.
+
+    :param str path: the deck file
+    :param edits: CardEdit tuples, or (op, front, back) tuples
+    :param str policy: what to do when adding a front the deck already has, see bulk_edit.POLICIES
+    :return BulkResult: what was done
+    :raises ValueError: if the deck is read-only, BulkEditError if an edit is invalid
+    """
+    return apply_edits(load_deck_file(path), edits, policy, deck_path=path)
+
+
+def read_answers(lines):
+    """
+    Read the answers for a scripted quiz, one "question<TAB>answer" line per question.
+
+    :param lines: the lines of the answers file
+    :return list: (question, answer) pairs, in order
+    :raises ValueError: for a line without a tab
+    """
+    answers = []
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        question, separator, answer = line.partition("\t")
+        if not separator:
+            raise ValueError(f"Line {number} has no tab between the question and the answer.")
+        answers.append((question.strip(), answer.strip()))
+    return answers
+
+
+def grade_answers(deck, answers, direction="f", grader=None):
+    """
+    Grade answers to a deck's cards like the write the answer quiz does.
+
+    :param deck: the deck quizzed
+    :param list answers: (question, answer) pairs, the question is a front, or a back when direction is "b"
+    :param str direction: "f" for front to back, and "b" for back to front
+    :param AnswerGrader grader: grader to reuse, keeping the answers it already normalized
+    :return QuizResult: a GradedAnswer for each known question, and the questions that aren't in the deck
+    """
+    if grader is None:
+        grader = AnswerGrader()
+    index = reverse_index(deck) if direction == "b" else None
+    graded = []
+    unknown = []
+    for question, given in answers:
+        # The accepted answers, as (answer, front of the card it is on)
+        if index is not None:
+            accepted = [(front, front) for front in index.fronts_for(question)]
+        else:
+            back = deck.get(question)
+            accepted = [(back, question)] if back is not None else []
+        if not accepted:
+            unknown.append(question)
+            continue
+        grades = [(grader.grade(given, answer), front) for answer, front in accepted]
+        best, front = max(grades, key=lambda item: (item[0].exact, item[0].correct))
+        graded.append(GradedAnswer(question, front, deck[front], given, best.correct, best.exact))
+    return QuizResult(graded, unknown)
+
+
+def record_answers(deck, deck_path, graded, direction="f"):
+    """
+    Log graded answers to the review history kept next to a deck, and reschedule their cards.
+
+    The answers weren't timed, so they are logged without a latency and left out of the average time.
+
+    :param deck: the deck quizzed
+    :param str deck_path: the deck file
+    :param list graded: GradedAnswer tuples from grade_answers
+    :param str direction: "f" or "b"
+    """
+    history = ReviewHistory(os.path.join(os.path.dirname(os.path.abspath(deck_path)), HISTORY_DIRECTORY))
+    schedule = open_schedule(deck, deck_path)
+    deck_name = os.path.basename(deck_path)
+    for answer in graded:
+        history.record(deck_name, answer.front, MODES[1], direction, answer.correct, None)
+        schedule.record_answer((answer.front, answer.back), answer.correct, None)
+    history.flush()
+    save_schedule(deck_path)
+
+
+def deck_stats(deck_path, count=10, days=14):
+    """
+    Summarize the answers recorded for a deck.
+
+    :param str deck_path: the deck file, its history is the one kept in the same directory
+    :param int count: how many of the hardest cards to list
+    :param int days: how many of the latest days of the learning curve to list
+    :return dict: answers, correct, average_seconds (None if no answer was timed), hardest as
+        (front, accuracy, answers) and by_day as (date, accuracy, answers)
+    """
+    history = ReviewHistory(os.path.join(os.path.dirname(os.path.abspath(deck_path)), HISTORY_DIRECTORY))
+    deck_name = os.path.basename(deck_path)
+    answers, correct, latency = history.deck_summary(deck_name)
+    return {
+        "answers": answers,
+        "correct": correct,
+        "average_seconds": latency,
+        "hardest": history.hardest_cards(deck_name, count),
+        "by_day": [(time.strftime('%Y-%m-%d', time.gmtime(start)), accuracy, total)
+                   for start, accuracy, total in history.learning_curve(deck_name)[-days:]],
+    }
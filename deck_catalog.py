@@ -0,0 +1,126 @@
+"""
+Persistent catalog of the decks in a directory
+
+The catalog remembers each deck's size, modification time, card count and content hash in
+".deck_catalog.json", so listing the decks only needs one os.scandir of the directory. A deck is only
+opened again when its file or its journal has changed since the catalog was last refreshed.
+"""
+import hashlib
+import json
+import os
+
+from compact_deck import CompactDeck, COMPACT_EXTENSION
+from deck_journal import JOURNAL_SUFFIX, COMPACTING_SUFFIX
+from deck_store import atomic_open, load_deck_file
+
+CATALOG_FILE = ".deck_catalog.json"
+CATALOG_VERSION = 1
+DECK_EXTENSIONS = (".json", COMPACT_EXTENSION)
+
+
+def _journal_deck(name):
+    """Return the file name of the deck a journal belongs to, or None if name isn't a journal."""
+    if name.endswith(JOURNAL_SUFFIX):
+        return name[:-len(JOURNAL_SUFFIX)]
+    # Journals moved aside for compaction are named <deck>.journal.compacting-<timestamp>
+    deck, separator, stamp = name.rpartition(JOURNAL_SUFFIX + COMPACTING_SUFFIX)
+    if separator and stamp.isdigit():
+        return deck
+    return None
+
+
+def _scan(directory):
+    """
+    Stat every deck in a directory with a single scandir.
+
+    :return dict: file name -> signature, the (mtime_ns, size) of the deck followed by those of its journals
+    """
+    decks = {}
+    journals = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.startswith(".") or not entry.is_file():
+                continue
+            if entry.name.endswith(DECK_EXTENSIONS):
+                stat = entry.stat()
+                decks[entry.name] = [stat.st_mtime_ns, stat.st_size]
+                continue
+            deck = _journal_deck(entry.name)
+            if deck is not None:
+                stat = entry.stat()
+                journals.setdefault(deck, []).append((entry.name, stat.st_mtime_ns, stat.st_size))
+    for name, signature in decks.items():
+        for journal in sorted(journals.get(name, [])):
+            signature.extend(journal[1:])
+    return decks
+
+
+def file_hash(path):
+    """Return the SHA-1 hex digest of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def count_cards(path):
+    """
+    Count the cards in a deck, including its journaled edits.
+
+    :return int: number of cards, or None if the file can't be read or isn't a deck
+    """
+    try:
+        deck = load_deck_file(path)
+    except (OSError, ValueError):
+        return None
+    cards = len(deck)
+    if isinstance(deck, CompactDeck):
+        deck.close()
+    return cards
+
+
+def load_catalog(directory):
+    """Read a directory's saved catalog, an empty one if it is missing or unreadable."""
+    try:
+        with open(os.path.join(directory, CATALOG_FILE), 'r', encoding='utf-8') as file:
+            saved = json.load(file)
+        if saved.get("version") == CATALOG_VERSION:
+            return saved["decks"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+
+def save_catalog(directory, catalog):
+    """Write a directory's catalog."""
+    with atomic_open(os.path.join(directory, CATALOG_FILE)) as file:
+        json.dump({"version": CATALOG_VERSION, "decks": catalog}, file, sort_keys=True, indent=1)
+
+
+def refresh_catalog(directory, catalog=None):
+    """
+    Bring a directory's catalog up to date, only reading the decks that changed.
+
+    :param str directory: the directory holding the decks
+    :param dict catalog: the catalog from the last refresh, read from disk if not given
+    :return dict: file name -> {"signature", "cards", "hash"} for every deck, sorted by file name
+    """
+    if catalog is None:
+        catalog = load_catalog(directory)
+    refreshed = {}
+    changed = False
+    for name, signature in sorted(_scan(directory).items()):
+        entry = catalog.get(name)
+        if entry is None or entry.get("signature") != signature:
+            path = os.path.join(directory, name)
+            entry = {"signature": signature, "cards": count_cards(path), "hash": file_hash(path)}
+            changed = True
+        refreshed[name] = entry
+    if changed or len(refreshed) != len(catalog):
+        try:
+            save_catalog(directory, refreshed)
+        except OSError:
+            # A read-only directory just means the catalog is rebuilt next time
+            pass
+    return refreshed
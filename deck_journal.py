@@ -0,0 +1,139 @@
+"""
+Write-ahead journal of card edits, kept next to each deck file
+
+Adding or removing a card appends one line to "<deck>.journal" instead of rewriting the whole deck.
+Loading a deck replays its journal on top of the deck file, and once the journal grows too big compared to
+the deck it is merged back in by rewriting the deck once and clearing the journal.
+
+While the deck is being rewritten in the background its journal is moved aside to a "compacting" file, so
+new edits go to a fresh journal and the old one is only deleted once the rewritten deck is on disk.
+Replaying a journal that the deck file already contains changes nothing, so a crash at any point is safe.
+"""
+import glob
+import json
+import os
+import time
+
+JOURNAL_SUFFIX = ".journal"
+COMPACTING_SUFFIX = ".compacting-"
+# Compact once the journal is bigger than this many bytes and this fraction of the deck file
+COMPACT_MIN_BYTES = 64 * 1024
+COMPACT_RATIO = 0.25
+
+# fdatasync skips flushing file metadata that doesn't matter here, where the OS has it
+_sync = getattr(os, "fdatasync", os.fsync)
+
+
+def journal_path(deck_path):
+    """Return the path of a deck's journal file."""
+    return deck_path + JOURNAL_SUFFIX
+
+
+def compacting_journals(deck_path):
+    """Return the journals moved aside for compactions that haven't finished, oldest first."""
+    return sorted(glob.glob(glob.escape(journal_path(deck_path)) + COMPACTING_SUFFIX + "*"))
+
+
+def append_operation(deck_path, op, front, back=None):
+    """
+    Durably record one card edit.
+
+    :param str deck_path: path of the deck file that was edited
+    :param str op: "add" or "remove"
+    :param str front: the card front
+    :param str back: the card back, for "add"
+    """
+    entry = [op, front] if back is None else [op, front, back]
+    line = (json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8')
+    with open(journal_path(deck_path), 'ab+') as file:
+        if file.tell() > 0:
+            # Start on a fresh line if a crash cut the last entry short
+            file.seek(-1, os.SEEK_END)
+            if file.read(1) != b"\n":
+                line = b"\n" + line
+        file.write(line)
+        file.flush()
+        _sync(file.fileno())
+
+
+def apply_operation(deck, entry):
+    """Apply one journal entry to a deck dictionary."""
+    if entry[0] == "add":
+        deck[entry[1]] = entry[2]
+    elif entry[0] == "remove":
+        deck.pop(entry[1], None)
+    else:
+        raise ValueError(f"Unknown journal operation '{entry[0]}'.")
+
+
+def replay_journal(deck, deck_path):
+    """
+    Apply every edit recorded in a deck's journals to the loaded deck.
+
+    A line cut short by a crash while it was being written is skipped.
+
+    :param dict deck: the deck as loaded from its file, changed in place
+    :param str deck_path: path of the deck file
+    :return int: number of edits applied
+    """
+    applied = 0
+    for path in compacting_journals(deck_path) + [journal_path(deck_path)]:
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    apply_operation(deck, entry)
+                    applied += 1
+        except FileNotFoundError:
+            pass
+    return applied
+
+
+def needs_compaction(deck_path):
+    """Check whether a deck's journal has grown big enough to be merged back into the deck file."""
+    try:
+        journal_size = os.path.getsize(journal_path(deck_path))
+    except OSError:
+        return False
+    try:
+        deck_size = os.path.getsize(deck_path)
+    except OSError:
+        deck_size = 0
+    return journal_size > max(COMPACT_MIN_BYTES, deck_size * COMPACT_RATIO)
+
+
+def rotate_journal(deck_path):
+    """
+    Move a deck's journal aside before the deck is rewritten, so later edits start a new journal.
+
+    :param str deck_path: path of the deck file
+    :return str: path the journal was moved to, or None if there was no journal
+    """
+    moved_path = f"{journal_path(deck_path)}{COMPACTING_SUFFIX}{time.time_ns():020d}"
+    try:
+        os.rename(journal_path(deck_path), moved_path)
+    except FileNotFoundError:
+        return None
+    return moved_path
+
+
+def finish_compaction(moved_path):
+    """Delete a journal moved aside by rotate_journal, once the rewritten deck is on disk."""
+    if moved_path is None:
+        return
+    try:
+        os.remove(moved_path)
+    except FileNotFoundError:
+        pass
+
+
+def clear_journal(deck_path):
+    """Remove a deck's journals, once the deck file holds all of their edits."""
+    for path in compacting_journals(deck_path) + [journal_path(deck_path)]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
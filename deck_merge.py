@@ -0,0 +1,263 @@
+"""
+Merge every deck in a directory into one, dropping duplicate cards
+
+Each card is identified by the SHA-1 of its front and back in NFKC form with whitespace collapsed, so a card
+imported twice, even with different spacing or line breaks, is only kept once. Cards with the same front but
+a different back are conflicts: the first one, in deck file name order, is kept and the others are listed in
+the report.
+
+Near duplicates, like the same card with a typo fixed or different case, are found with MinHash and locality
+sensitive hashing instead of comparing every pair of cards:
+    - each card's trigrams are hashed into SIGNATURE_SIZE bins, keeping the smallest hash in each bin
+      (one permutation MinHash, with empty bins filled from their neighbours),
+    - the signature is cut into BANDS bands, and cards with an identical band land in the same bucket,
+    - a card is only compared with the first card of each of its buckets, and reported if enough of their
+      signatures match.
+Near duplicates are kept in the merged deck, since telling them apart needs a person, and listed in the
+report. Memory grows with the number of distinct cards, not the number of pairs.
+
+Can be run on its own:
+    python deck_merge.py DIRECTORY [--output FILE] [--report FILE] [--threshold SIMILARITY]
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import unicodedata
+from array import array
+from collections import namedtuple
+from operator import eq
+
+from answer_matching import normalize
+from deck_store import atomic_open, write_deck_file, load_deck_file
+from search_index import trigrams
+
+MERGED_FILE = "merged_deck.json"
+REPORT_FILE = "merge_report.json"
+SIGNATURE_SIZE = 32
+BANDS = 8
+ROWS = SIGNATURE_SIZE // BANDS
+# Share of matching signature bins for two cards to be reported as near duplicates
+NEAR_THRESHOLD = 0.8
+# Hash values are below 2 ** 64 / SIGNATURE_SIZE, filled in empty bins are moved above that
+_BIN_OFFSET = (1 << 64) // SIGNATURE_SIZE
+
+# Where a card of the merged deck came from
+CardSource = namedtuple("CardSource", ["deck", "front", "back"])
+
+
+def find_decks(directory, exclude=()):
+    """
+    Find the JSON decks of a directory.
+
+    :param str directory: the directory to look in
+    :param exclude: paths to leave out, eg. the merged deck and report from an earlier run
+    :return list: sorted deck paths
+    """
+    excluded = {os.path.abspath(path) for path in exclude}
+    return sorted(path for path in glob.glob(os.path.join(directory, "*.json"))
+                  if os.path.isfile(path) and os.path.abspath(path) not in excluded)
+
+
+def normalize_side(text):
+    """
+    Normalize a side of a card for telling duplicates apart: Unicode NFKC with whitespace collapsed.
+
+Case and punctuation are kept, since they are often the point of a card, like "%d" and "%D" or "\\d".
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def card_key(normalized_front, normalized_back):
+    """Return the SHA-1 digest identifying a card by its normalized front and back."""
+    return hashlib.sha1(f"{normalized_front}\x1f{normalized_back}".encode("utf-8")).digest()
+
+
+class NearDuplicateFinder:
+    """
+    Finds cards that are nearly the same as a card seen before, with MinHash signatures and LSH buckets.
+
+    :param float threshold: share of matching signature bins, from 0 to 1, for cards to count as near duplicates
+    """
+
+    def __init__(self, threshold=NEAR_THRESHOLD):
+        self.threshold = threshold
+        self._signatures = array("Q")
+        self._buckets = [{} for _ in range(BANDS)]
+        self._hashes = {}
+
+    def __len__(self):
+        return len(self._signatures) // SIGNATURE_SIZE
+
+    def _bins(self, shingles):
+        """(bin, hash value) of each trigram, cached since decks share most of their trigrams"""
+        hashes = self._hashes
+        for shingle in shingles.difference(hashes):
+            digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+            value, slot = divmod(int.from_bytes(digest, "little"), SIGNATURE_SIZE)
+            hashes[shingle] = (slot, value)
+        return map(hashes.__getitem__, shingles)
+
+    def signature(self, shingles):
+        """
+        One permutation MinHash signature of a set of trigrams.
+
+        :param set shingles: the card's trigrams
+        :return list: SIGNATURE_SIZE values, similar cards have many of them in common
+        """
+        # Largest first, so the smallest value of each bin is the one the dictionary keeps
+        smallest = dict(sorted(self._bins(shingles), reverse=True))
+        bins = [smallest.get(slot) for slot in range(SIGNATURE_SIZE)]
+        if bins.count(None) == SIGNATURE_SIZE:
+            return [0] * SIGNATURE_SIZE
+        # An empty bin takes the value of the next filled one, offset by how far away it is, so two cards
+        # only agree on it if their filled bins do too
+        filled = bins[:]
+        for slot in range(SIGNATURE_SIZE):
+            if filled[slot] is None:
+                distance = 1
+                while filled[(slot + distance) % SIGNATURE_SIZE] is None:
+                    distance += 1
+                bins[slot] = filled[(slot + distance) % SIGNATURE_SIZE] + distance * _BIN_OFFSET
+        return bins
+
+    def similarity(self, first, second):
+        """Estimated similarity of two cards added to the finder, from the share of matching bins."""
+        first *= SIGNATURE_SIZE
+        second *= SIGNATURE_SIZE
+        signatures = self._signatures
+        matching = map(eq, signatures[first:first + SIGNATURE_SIZE], signatures[second:second + SIGNATURE_SIZE])
+        return sum(matching) / SIGNATURE_SIZE
+
+    def add(self, shingles):
+        """
+        Add a card and find the card added before that it is most like.
+
+        :param set shingles: the card's trigrams
+        :return tuple: (card number of the closest earlier card, similarity), or None if none is close enough
+        """
+        card = len(self)
+        bins = self.signature(shingles)
+        self._signatures.extend(bins)
+        candidates = set()
+        for band, buckets in enumerate(self._buckets):
+            key = hash(tuple(bins[band * ROWS:(band + 1) * ROWS]))
+            first = buckets.setdefault(key, card)
+            if first != card:
+                candidates.add(first)
+        best = None
+        for candidate in candidates:
+            similarity = self.similarity(card, candidate)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (candidate, similarity)
+        return best
+
+
+def merge_decks(paths, threshold=NEAR_THRESHOLD):
+    """
+    Merge decks into one, dropping exact duplicates and keeping the first of conflicting cards.
+
+    :param list paths: the decks to merge, cards of earlier decks win conflicts
+    :param float threshold: similarity from 0 to 1 for cards to be reported as near duplicates, None to skip
+    looking for them
+    :return tuple: (merged deck, report dictionary)
+    """
+    merged = {}
+    sources = []
+    seen_cards = set()
+    seen_fronts = {}
+    conflicts = {}
+    near_duplicates = []
+    finder = NearDuplicateFinder(threshold) if threshold is not None else None
+    report = {"decks": [], "skipped_decks": [], "cards": 0, "merged_cards": 0, "exact_duplicates": 0,
+              "conflicts": [], "near_duplicates": near_duplicates}
+
+    for path in paths:
+        deck_name = os.path.basename(path)
+        try:
+            deck = load_deck_file(path)
+        except (OSError, ValueError) as e:
+            report["skipped_decks"].append({"deck": deck_name, "error": str(e)})
+            continue
+        report["decks"].append(deck_name)
+        report["cards"] += len(deck)
+        for front, back in deck.items():
+            normalized_front = normalize_side(front)
+            normalized_back = normalize_side(back)
+            key = card_key(normalized_front, normalized_back)
+            if key in seen_cards:
+                report["exact_duplicates"] += 1
+                continue
+            seen_cards.add(key)
+            front_key = hashlib.sha1(normalized_front.encode("utf-8")).digest()
+            kept = seen_fronts.get(front_key)
+            if kept is not None:
+                # Same front, different back: the first card stays
+                kept = sources[kept]
+                conflict = conflicts.setdefault(kept.front, {"front": kept.front, "kept": kept._asdict(),
+                                                             "dropped": []})
+                conflict["dropped"].append(CardSource(deck_name, front, back)._asdict())
+                continue
+            seen_fronts[front_key] = len(sources)
+            merged[front] = back
+            sources.append(CardSource(deck_name, front, back))
+            if finder is not None:
+                match = finder.add(trigrams(normalize(front)) | trigrams(normalize(back)))
+                if match is not None:
+                    near_duplicates.append({"similarity": round(match[1], 3),
+                                            "card": sources[-1]._asdict(),
+                                            "similar_to": sources[match[0]]._asdict()})
+
+    report["merged_cards"] = len(merged)
+    report["conflicts"] = list(conflicts.values())
+    return merged, report
+
+
+def format_report(report):
+    """
+    Build a printable summary of a merge.
+
+    :param dict report: the report from merge_decks
+    :return str: the totals, one per line
+    """
+    lines = [f"{len(report['decks'])} decks, {report['cards']} cards merged into {report['merged_cards']} cards.",
+             f"{report['exact_duplicates']} exact duplicates dropped.",
+             f"{sum(len(conflict['dropped']) for conflict in report['conflicts'])} conflicting cards dropped, "
+             f"{len(report['conflicts'])} fronts had more than one back.",
+             f"{len(report['near_duplicates'])} near duplicates kept for review."]
+    for skipped in report["skipped_decks"]:
+        lines.append(f"Skipped {skipped['deck']}: {skipped['error']}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command line entry point, returns the exit status."""
+    parser = argparse.ArgumentParser(description="Merge the .json decks of a directory, dropping duplicate cards.")
+    parser.add_argument("directory", help="the directory of .json decks to merge")
+    parser.add_argument("--output", default=None, help=f"merged deck to write (default: DIRECTORY/{MERGED_FILE})")
+    parser.add_argument("--report", default=None, help=f"conflict report to write (default: DIRECTORY/{REPORT_FILE})")
+    parser.add_argument("--threshold", type=float, default=NEAR_THRESHOLD,
+                        help=f"similarity from 0 to 1 for near duplicates (default: {NEAR_THRESHOLD})")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        print(f"Error: '{args.directory}' is not a directory.")
+        return 1
+    output = args.output or os.path.join(args.directory, MERGED_FILE)
+    report_path = args.report or os.path.join(args.directory, REPORT_FILE)
+    paths = find_decks(args.directory, exclude=(output, report_path))
+    if not paths:
+        print(f"Error: No decks found in '{args.directory}'.")
+        return 1
+    merged, report = merge_decks(paths, args.threshold)
+    write_deck_file(merged, output)
+    with atomic_open(report_path) as file:
+        json.dump(report, file, indent=4, ensure_ascii=False)
+    print(format_report(report))
+    print(f"Merged deck written to {output}, report written to {report_path}.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,71 @@
+"""
+Deck model that keeps a reverse index from each back to the fronts that have it
+
+Backs are not unique, several cards can share one, so a back to front quiz has to accept any of those fronts.
+Deck maintains the reverse index as cards are added and removed, so looking up the fronts of a back is a
+single dictionary lookup. It behaves like the Dict[str, str] decks are loaded as.
+"""
+from collections.abc import MutableMapping
+
+
+class Deck(MutableMapping):
+    """
+    A mutable deck of cards, front -> back, indexed both ways.
+
+    :param cards: a mapping or iterable of (front, back) pairs to start with
+    """
+
+    def __init__(self, cards=()):
+        self._cards = {}
+        self._fronts = {}
+        self.update(cards)
+
+    def __getitem__(self, front):
+        return self._cards[front]
+
+    def __setitem__(self, front, back):
+        if front in self._cards:
+            self._unlink(front, self._cards[front])
+        self._cards[front] = back
+        self._fronts.setdefault(back, []).append(front)
+
+    def __delitem__(self, front):
+        self._unlink(front, self._cards.pop(front))
+
+    def _unlink(self, front, back):
+        fronts = self._fronts[back]
+        fronts.remove(front)
+        if not fronts:
+            del self._fronts[back]
+
+    def __iter__(self):
+        return iter(self._cards)
+
+    def __len__(self):
+        return len(self._cards)
+
+    def __contains__(self, front):
+        return front in self._cards
+
+    def __repr__(self):
+        return f"Deck({self._cards!r})"
+
+    def fronts_for(self, back):
+        """Return the fronts of every card with this back, in the order they were added."""
+        return tuple(self._fronts.get(back, ()))
+
+    def backs(self):
+        """Return each distinct back once."""
+        return self._fronts.keys()
+
+
+def reverse_index(deck):
+    """
+    Get an object with a fronts_for(back) method for a deck, building an index if the deck has none.
+
+    :param deck: a Deck, a CompactDeck or a plain mapping of fronts to backs
+    :return: the deck itself if it already keeps a reverse index, otherwise a Deck copy of it
+    """
+    if hasattr(deck, "fronts_for"):
+        return deck
+    return Deck(deck)
@@ -0,0 +1,162 @@
+"""
+Crash-safe deck persistence
+
+Files are written to a temporary file in the same directory, fsynced and then moved over the target with
+os.replace, so a crash leaves either the old file or the new one, never a truncated one.
+BackgroundDeckWriter does the same from a writer thread, so the menus never wait on the disk.
+load_deck_file is the one place deck files are read, by the menus, the command line and the batch tools.
+"""
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from deck_journal import replay_journal
+from deck_model import Deck
+
+# Permissions for newly created files, as open() would give them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+NEW_FILE_MODE = 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_open(path, mode="w", encoding="utf-8"):
+    """
+    Open a file for writing that only replaces path once the with block finishes without an error.
+
+    :param str path: the file to write
+    :param str mode: "w" for text or "wb" for binary
+    :param str encoding: encoding for text mode
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+    try:
+        try:
+            os.chmod(temp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(temp_path, NEW_FILE_MODE)
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_deck_file(deck, path):
+    """
+    Atomically write a deck dictionary as JSON, in the layout the decks are kept in.
+
+    :param deck: a mapping of card fronts to card backs
+    :param str path: the JSON file to write
+    """
+    if not isinstance(deck, dict):
+        deck = dict(deck)
+    with atomic_open(path) as file:
+        json.dump(deck, file, sort_keys=True, indent=4, ensure_ascii=False)
+
+
+def load_deck_file(path, missing_ok=False):
+    """
+    Open a deck file: a JSON deck with the card edits journaled since it was written, or a compact deck.
+
+    :param str path: the deck file
+    :param bool missing_ok: if True a file that doesn't exist yet is an empty deck rather than an error
+    :return: a Deck, or a read-only CompactDeck for .fcdk files
+    :raises OSError: if the file can't be read
+    :raises ValueError: if it isn't a deck of text cards, including json.JSONDecodeError for invalid JSON
+    """
+    # compact_deck writes its JSON decks with this module, so it can only be imported once this one is loaded
+    from compact_deck import CompactDeck, COMPACT_EXTENSION
+    if path.endswith(COMPACT_EXTENSION):
+        return CompactDeck(path)
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            cards = json.load(file)
+    except FileNotFoundError:
+        if not missing_ok:
+            raise
+        cards = {}
+    if not isinstance(cards, dict) or not all(isinstance(back, str) for back in cards.values()):
+        raise ValueError(f"'{os.path.basename(path)}' is not a deck of text cards.")
+    deck = Deck(cards)
+    # Apply the card edits made since the deck file was last written
+    replay_journal(deck, path)
+    return deck
+
+
+class BackgroundDeckWriter:
+    """
+    Writes decks on a background thread.
+
+Each submitted deck is copied, so it can keep being edited while it is written. If a deck is submitted again
+before its last copy was written, only the newest copy is written.
+    """
+
+    def __init__(self, write=write_deck_file):
+        self._write = write
+        self._pending = {}
+        self._busy = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="deck-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, deck, path, on_done=None):
+        """
+        Queue a deck to be written.
+
+        :param deck: a mapping of card fronts to card backs
+        :param str path: the file to write
+        :param on_done: called without arguments on the writer thread once the deck is safely on disk
+        """
+        snapshot = dict(deck)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Deck writer is closed.")
+            callbacks = self._pending[path][1] if path in self._pending else []
+            if on_done is not None:
+                callbacks.append(on_done)
+            self._pending[path] = (snapshot, callbacks)
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                path = next(iter(self._pending))
+                snapshot, callbacks = self._pending.pop(path)
+                self._busy = True
+            try:
+                self._write(snapshot, path)
+                for callback in callbacks:
+                    callback()
+            except Exception as e:
+                print(f"Error saving deck: {e}")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def flush(self):
+        """Block until every queued deck has been written."""
+        with self._condition:
+            while self._pending or self._busy:
+                self._condition.wait()
+
+    def close(self):
+        """Write everything still queued and stop the writer thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
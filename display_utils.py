@@ -1,64 +1,184 @@
 """
 Display utilities for formatting and showing flashcards
 """
+from collections import OrderedDict
+from itertools import islice
 
 def grid_builder(cardstr, rowlen=80):
 	"""Take a string and make it into a list of items not more than rowlen long"""
-	initial_grid = cardstr.split("\n")
 	grid = []
-	for itm in initial_grid:
-		if len(itm) <= rowlen:
+	for itm in cardstr.split("\n"):
+		length = len(itm)
+		if length <= rowlen:
 			grid.append(itm)
-		else:
-			to_grid = []
-			x = 0
-			times_through = 1
-			while len(to_grid) < len(itm) // rowlen + 1:
-				if len(itm[x:]) > rowlen:
-					if itm[x + rowlen - 1].isalpha() and itm[x + rowlen] != " ":
-						to_grid.append(itm[x: x + rowlen].lstrip() + "-")
-						x += rowlen
-					else:
-						to_grid.append(itm[x: x + rowlen].lstrip())
-						x += rowlen
-				else:
-					to_grid.append(itm[x:].lstrip())
-
-			for itm2 in to_grid:
-				grid.append(itm2)
+			continue
+		# Each full row is sliced once, a word cut at the end of a row gets a hyphen.
+		# A line that is an exact multiple of rowlen long repeats its last row, as it always has.
+		x = 0
+		tail = None
+		for _ in range(length // rowlen + 1):
+			if length - x > rowlen:
+				row = itm[x: x + rowlen].lstrip()
+				if itm[x + rowlen - 1].isalpha() and itm[x + rowlen] != " ":
+					row += "-"
+				grid.append(row)
+				x += rowlen
+			else:
+				if tail is None:
+					tail = itm[x:].lstrip()
+				grid.append(tail)
 	return grid
 
 
 def out_put_builder(grid):
 	"""Put lines around strings in a grid"""
-	output = ""
-	longest_line = 0
-	for itm3 in grid:
-		if len(itm3) > longest_line:
-			longest_line = len(itm3)
-	top_line = '\n__' + ('_' * longest_line) + '__\n'
-	empty_line = '| ' + (' ' * longest_line) + ' |\n'
-	bottom_line = '|_' + ('_' * longest_line) + '_|\n'
-
-	def text_line(column):
-		white_space = longest_line - len(grid[column])
-		text_lne = '| ' + (grid[column]) + " " * white_space + ' |\n'
-		return text_lne
-
-	output += top_line + empty_line
+	longest_line = max(map(len, grid), default=0)
+	parts = ['\n__' + ('_' * longest_line) + '__\n', '| ' + (' ' * longest_line) + ' |\n']
 	for row in grid:
-		output += text_line(grid.index(row))
-	output += bottom_line
-	return output
+		parts.append('| ' + row.ljust(longest_line) + ' |\n')
+	parts.append('|_' + ('_' * longest_line) + '_|\n')
+	return "".join(parts)
 
-def card_displayer(card):
+class RenderCache:
+    """
+    Least recently used cache of rendered cards, keyed on (text, rowlen).
+
+The cache holds at most max_entries cards and max_chars characters of card text and rendering combined.
+Everything is dropped when a different rowlen is asked for, as none of it would be used again.
+    """
+
+    def __init__(self, max_entries=2048, max_chars=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.rowlen = None
+        self.chars = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def _check_rowlen(self, rowlen):
+        if rowlen != self.rowlen:
+            self._entries.clear()
+            self.chars = 0
+            self.rowlen = rowlen
+
+    def get(self, text, rowlen):
+        """Return the cached rendering of text, or None"""
+        self._check_rowlen(rowlen)
+        rendered = self._entries.get((text, rowlen))
+        if rendered is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end((text, rowlen))
+        return rendered
+
+    def put(self, text, rowlen, rendered):
+        """Cache the rendering of text, evicting the least recently used cards to make room"""
+        self._check_rowlen(rowlen)
+        size = len(text) + len(rendered)
+        if size > self.max_chars or (text, rowlen) in self._entries:
+            return
+        self._entries[(text, rowlen)] = rendered
+        self.chars += size
+        while len(self._entries) > self.max_entries or self.chars > self.max_chars:
+            (old_text, _), old_rendered = self._entries.popitem(last=False)
+            self.chars -= len(old_text) + len(old_rendered)
+
+    def clear(self):
+        """Empty the cache and reset its statistics"""
+        self._entries.clear()
+        self.chars = self.hits = self.misses = 0
+
+    def info(self):
+        """Return the cache statistics as a dictionary"""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries),
+                "chars": self.chars, "rowlen": self.rowlen}
+
+
+_render_cache = RenderCache()
+
+
+def render_cache_info():
+    """Return the hit/miss statistics and size of the card rendering cache."""
+    return _render_cache.info()
+
+
+def clear_render_cache():
+    """Empty the card rendering cache."""
+    _render_cache.clear()
+
+
+def card_displayer(card, rowlen=80):
     """Take a string and put a box graphic around it. Returns a multiline string"""
-    return out_put_builder(grid_builder(card))
+    rendered = _render_cache.get(card, rowlen)
+    if rendered is None:
+        rendered = out_put_builder(grid_builder(card, rowlen))
+        _render_cache.put(card, rowlen, rendered)
+    return rendered
+
+
+def card_pair_displayer(front, back):
+    """Box the front and back of a card, with an arrow from the front to the back."""
+    return card_displayer(front) + '   |\n   V' + card_displayer(back) + "\n"
+
+
+def iter_display_deck(deck_dict):
+    """Yield the display of the deck one card pair at a time, starting with the Front/Back header."""
+    yield card_pair_displayer("Front", "Back")
+    for key, value in deck_dict.items():
+        yield card_pair_displayer(key, value)
 
 
 def display_deck(deck_dict):
     """Display all of the card pairs in the deck, separated by a '-->'."""
-    printout = card_displayer("Front") + '   |\n   V' + card_displayer("Back") + '\n'
-    for key, value in deck_dict.items():
-        printout += card_displayer(key) + '   |\n   V' + card_displayer(value) + "\n"
-    return printout
+    return "".join(iter_display_deck(deck_dict))
+
+
+class DeckPager:
+    """
+    Split a deck into pages of cards, only reading as far into the deck as the pages that are shown.
+
+    :param deck_dict: a dictionary (or other mapping) of card fronts to card backs
+    :param int page_size: number of cards per page
+    """
+
+    def __init__(self, deck_dict, page_size=10):
+        self.deck_dict = deck_dict
+        self.page_size = page_size
+        self.page_count = max(1, -(-len(deck_dict) // page_size))
+        self._fronts = []
+        self._unread = iter(deck_dict)
+
+    def _read_until(self, count):
+        """Make sure the first count fronts of the deck have been read"""
+        if len(self._fronts) < count:
+            self._fronts.extend(islice(self._unread, count - len(self._fronts)))
+
+    def page(self, number):
+        """Return the (front, back) pairs on a page, pages are numbered from 0."""
+        start = number * self.page_size
+        self._read_until(start + self.page_size)
+        return [(front, self.deck_dict[front]) for front in self._fronts[start:start + self.page_size]]
+
+    def render_page(self, number):
+        """Return the display of one page, with its page number."""
+        parts = [card_pair_displayer("Front", "Back")]
+        for front, back in self.page(number):
+            parts.append(card_pair_displayer(front, back))
+        parts.append(f"Page {number + 1} of {self.page_count}\n")
+        return "".join(parts)
+
+    def search(self, text, after_page=-1):
+        """
+        Find the next page with a card containing text, case insensitively, wrapping around the deck.
+
+        :return int: the page number, or None if no card contains text
+        """
+        text = text.lower()
+        for offset in range(1, self.page_count + 1):
+            number = (after_page + offset) % self.page_count
+            for front, back in self.page(number):
+                if text in front.lower() or text in back.lower():
+                    return number
+        return None
@@ -0,0 +1,66 @@
+"""
+Wrong answer (distractor) sampling for multiple choice questions
+"""
+import random
+
+
+class DistractorSampler:
+    """
+    Draws distinct wrong answers from the answers of a deck.
+
+    Repeated answers are only kept once, so two cards with the same back can never fill two choices with
+    the same text. Drawing k distractors takes O(k) time, whatever the size of the deck.
+
+    :param answers: every possible answer, eg. deck_dict.values()
+    :param rng: a random.Random to draw with, defaults to the random module
+    :param similar: optional index with a nearest(answer, k) method, eg. a SimilarityIndex, whose
+        neighbours are used as distractors before random ones
+    """
+
+    def __init__(self, answers, rng=None, similar=None):
+        self.answers = list(dict.fromkeys(answers))
+        self._positions = {answer: index for index, answer in enumerate(self.answers)}
+        self._rng = rng if rng is not None else random
+        self._similar = similar
+
+    def sample(self, correct, k, exclude=()):
+        """
+        Draw up to k distinct answers that are not the correct one.
+
+        :param str correct: the right answer, never returned
+        :param int k: how many distractors are wanted
+        :param exclude: other answers that are also right, never returned either
+        :return list: k distractors, or as many as the deck has if that is fewer
+        """
+        excluded = {self._positions[answer] for answer in exclude if answer in self._positions}
+        if correct in self._positions:
+            excluded.add(self._positions[correct])
+        k = max(0, min(k, len(self.answers) - len(excluded)))
+        chosen = []
+        if self._similar is not None:
+            for answer in self._similar.nearest(correct):
+                index = self._positions.get(answer)
+                if len(chosen) < k and index is not None and index not in excluded:
+                    chosen.append(answer)
+                    excluded.add(index)
+        if len(chosen) == k:
+            return chosen
+        # Draw spare indexes in case excluded or already chosen answers are among them
+        wanted = k - len(chosen)
+        picks = self._rng.sample(range(len(self.answers)), min(wanted + len(excluded), len(self.answers)))
+        chosen.extend(self.answers[index] for index in picks if index not in excluded)
+        return chosen[:k]
+
+    def choices(self, correct, count, exclude=()):
+        """
+        Build the shuffled choices for a question.
+
+        :param str correct: the right answer
+        :param int count: total number of choices wanted, including the right one
+        :param exclude: other answers that are also right, left out of the choices
+        :return tuple: (list of choices, index of the right answer in it)
+        """
+        choices = self.sample(correct, count - 1, exclude)
+        answer = self._rng.randrange(len(choices) + 1)
+        choices.insert(answer, correct)
+        return choices, answer
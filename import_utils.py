@@ -4,6 +4,190 @@ Import utilities for converting flashcard files
 import json
 import os
 
+from deck_journal import clear_journal
+from deck_store import atomic_open
+
+# How many characters to read at a time when splitting on a custom card separator
+CHUNK_SIZE = 1024 * 1024
+
+
+def _report_skipped(item):
+    """Default handler for items that can't be turned into a front/back pair."""
+    print(f"Item: '{item}' was not included in the deck.")
+
+
+def split_quizlet_lines(lines, fbsep="\t"):
+    """
+    Group the lines of a default Quizlet export into raw card strings.
+
+A line that contains fbsep starts a new card, a line that doesn't is a continuation of the card before it
+and gets joined to it with a "\n". Runs in a single pass, holding only the card currently being built.
+
+    :param lines: An iterable of lines, eg. an open file object. Trailing "\n"s are removed.
+    :param str fbsep: Separation value between front and back of card, default is tab "\t".
+    :return: A generator of raw card strings, with fbsep still inside them.
+    """
+    card_parts = []
+    last_line = ""
+    for line in lines:
+        last_line = line
+        if line.endswith("\n"):
+            line = line[:-1]
+        if fbsep in line:
+            if card_parts:
+                yield "\n".join(card_parts)
+            card_parts = [line]
+        elif card_parts:
+            card_parts.append(line)
+        else:
+            # Lines before the first card have nothing to be joined to
+            yield line
+    # A file ending with a linebreak leaves an empty continuation line on the last card
+    if last_line.endswith("\n") or last_line == "":
+        if card_parts:
+            card_parts.append("")
+        else:
+            yield ""
+    if card_parts:
+        yield "\n".join(card_parts)
+
+
+def split_on_separator(fileobj, cardsep, chunk_size=CHUNK_SIZE):
+    """
+    Split a file on cardsep while reading it in fixed size chunks.
+
+Gives the same pieces as fileobj.read().split(cardsep), but only the unfinished card at the end of the
+current chunk is carried over to the next one, so memory use doesn't grow with the file.
+
+    :param fileobj: An open text file.
+    :param str cardsep: Separation value between card and card.
+    :param int chunk_size: How many characters to read at a time.
+    :return: A generator of raw card strings.
+    """
+    carry = ""
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        buffer = carry + chunk
+        start = 0
+        # A separator can only start in the carried over text if it runs into the new chunk
+        search_from = max(0, len(carry) - len(cardsep) + 1)
+        while True:
+            found = buffer.find(cardsep, search_from)
+            if found == -1:
+                break
+            yield buffer[start:found]
+            start = search_from = found + len(cardsep)
+        carry = buffer[start:]
+    yield carry
+
+
+def parse_card(raw_card, fbsep="\t", on_skip=_report_skipped):
+    """
+    Turn a raw card string into a (front, back) pair.
+
+Cards with one fbsep too many have their last fbsep replaced by a "\n", anything else that doesn't split
+into exactly two parts is handed to on_skip.
+
+    :param str raw_card: The card text, with fbsep between the front and back.
+    :param str fbsep: Separation value between front and back of card, default is tab "\t".
+    :param on_skip: Called with the split item when it isn't included in the deck.
+    :return: A (front, back) tuple, or None if the card was empty or skipped.
+    """
+    if raw_card == "" or raw_card == "\n":
+        return None
+    if raw_card.count(fbsep) > 1:
+        # Reverse replace method
+        raw_card = "\n".join(raw_card.rsplit(fbsep, 1))
+    parts = raw_card.split(fbsep)
+    if len(parts) != 2:
+        if on_skip is not None:
+            on_skip(parts)
+        return None
+    return parts[0], parts[1]
+
+
+def iter_quizlet_cards(filepath, fbsep="\t", cardsep="\n", on_skip=_report_skipped, chunk_size=CHUNK_SIZE):
+    """
+    Stream the (front, back) pairs of a Quizlet export, without building the whole file in memory.
+
+    :param str filepath: File path of file to be converted, must be a .txt file
+    :param str fbsep: Separation value between front and back of card, default is tab "\t.
+    :param str cardsep: Separation value between card and card, default is linebreak "\n".
+    :param on_skip: Called with each item that was not included in the deck.
+    :param int chunk_size: How many characters to read at a time when cardsep isn't a linebreak.
+    :return: A generator of (front, back) tuples, in file order.
+    """
+    with open(filepath) as fileobj:
+        if cardsep == "\n":
+            raw_cards = split_quizlet_lines(fileobj, fbsep)
+        else:
+            raw_cards = split_on_separator(fileobj, cardsep, chunk_size)
+        for raw_card in raw_cards:
+            pair = parse_card(raw_card, fbsep, on_skip)
+            if pair is not None:
+                yield pair
+
+
+class JsonObjectWriter:
+    """
+    Write a JSON object one key at a time, in the same layout as json.dumps(..., indent=4).
+
+Use as a context manager, the closing brace is written on exit.
+    """
+
+    def __init__(self, fileobj, indent=4):
+        self.fileobj = fileobj
+        self.indent = " " * indent
+        self.count = 0
+
+    def __enter__(self):
+        self.fileobj.write("{")
+        return self
+
+    def write(self, key, value):
+        """Add one key/value pair to the object"""
+        separator = "\n" if self.count == 0 else ",\n"
+        self.fileobj.write(f"{separator}{self.indent}{json.dumps(key)}: {json.dumps(value)}")
+        self.count += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.fileobj.write("\n}" if self.count else "}")
+        return False
+
+
+def import_quizlet_streaming(filepath, fbsep="\t", cardsep="\n", chunk_size=CHUNK_SIZE, on_skip=_report_skipped):
+    """
+    Convert a Quizlet export to a .json deck without holding the deck in memory.
+
+Cards are written out as they are read, so peak memory stays flat no matter how big the export is. Unlike
+import_quizlet_lineskip_fix the keys are left in file order and a repeated front is written twice, loading
+the deck keeps the last one, as building a dictionary would.
+
+    :param str filepath: File path of file to be converted, must be a .txt file
+    :param str fbsep: Separation value between front and back of card, default is tab "\t.
+    :param str cardsep: Separation value between card and card, default is linebreak "\n".
+    :param int chunk_size: How many characters to read at a time when cardsep isn't a linebreak.
+    :param on_skip: Called with each item that was not included in the deck.
+    :return int: number of cards in the deck, a repeated front is counted once.
+    :raises ValueError: if no cards were found, an existing deck of the same name is then left as it was.
+    """
+    write_file_path = os.path.splitext(filepath)[0] + ".json"
+    # Hashes rather than the fronts themselves, to keep memory small while counting the distinct cards
+    fronts = set()
+    with atomic_open(write_file_path) as write_to_file:
+        with JsonObjectWriter(write_to_file) as writer:
+            for front, back in iter_quizlet_cards(filepath, fbsep, cardsep, on_skip, chunk_size):
+                writer.write(front, back)
+                fronts.add(hash(front))
+        if not writer.count:
+            # Most likely the wrong separators. Raising here throws the new file away instead of the old deck
+            raise ValueError("no cards found")
+    # Edits journaled against an older deck of the same name don't belong to the new one
+    clear_journal(write_file_path)
+    return len(fronts)
+
 
 def import_quizlet_lineskip_fix(filepath, fbsep="\t", cardsep="\n"):
     """
@@ -19,47 +203,10 @@ write a new file to same directory, using the same filename but changing the ext
     :param str cardsep: Separation value between card and card, default is linebreak "\n".
     :return dict: converted dictionary.
     """
-    with open(filepath) as fileobj:
-        data0 = fileobj.readlines()
-    # First combine all lines into a long string.
-    data1 = ""
-    for line1 in data0:
-        data1 += line1
-    # Then split by the cardsep
-    data3 = data1.split(cardsep)
-    # For default setting, we must rejoin the lines that were separated by a linebreak
-    if cardsep == "\n":
-        clean_counter = 0
-        while clean_counter < len(data3):
-            clean_counter = 0
-            for itm0 in data3:
-                if fbsep not in itm0:
-                    data3[data3.index(itm0)-1] += "\n" + data3.pop(data3.index(itm0))
-                    break
-                elif fbsep in itm0:
-                    clean_counter += 1
-    # Then cull entries with too many fbsep's
-    for itm1 in data3:
-        if itm1.count(fbsep) > 1:
-            # Reverse replace method
-            data3[data3.index(itm1)] = "\n".join(itm1.rsplit(fbsep, 1))
-    # Then separate by fbsep, culling trailing punctuation on the way
-    data4 = []
-    for itm2 in data3:
-        if itm2 != "" and itm2 != "\n" and itm2 != "":
-            data4.append(itm2.split(fbsep))
-    # Then clean out wrong sized items, making sure our list of paired strings lists are all len(2) pairs
-    data5 = []
-    for itm3 in data4:
-        if len(itm3) != 2:
-            print(f"Item: '{itm3}' was not included in the deck.")
-        else:
-            data5.append(itm3)
-    # Finally make the dictionary
-    data6 = dict(data5)
+    deck = dict(iter_quizlet_cards(filepath, fbsep, cardsep))
     # Write the dictionary to a new file with the same name, but a .json extension
     write_file_path = os.path.splitext(filepath)[0] + ".json"
-    write_to_file = open(write_file_path, 'w+')
-    write_to_file.write(json.dumps(data6, sort_keys=True, indent=4))
-    write_to_file.close()
-    return data6
+    with atomic_open(write_file_path) as write_to_file:
+        write_to_file.write(json.dumps(deck, sort_keys=True, indent=4))
+    clear_journal(write_file_path)
+    return deck
@@ -16,31 +16,58 @@ Would still like to add:
 - Matching test
 - Multitype combined quiz
 """
-import glob
 import os
+import sys
+
+PROFILE_FLAG = "--profile-startup"
+
+# Started before the application modules are imported, so their import times are part of the report
+if PROFILE_FLAG in sys.argv[1:]:
+	from startup_profile import ImportTimer
+	_import_timer = ImportTimer().install()
+else:
+	_import_timer = None
 
 from app_controller import get_program_directory, handle_import_functionality, get_valid_deck_choice, load_deck, \
-	run_main_menu
+	run_main_menu, shutdown_deck_writer
 from deck_utils import deck_menu_constructor
+from deck_catalog import refresh_catalog
 from constants import WELCOME
 
 
+def report_startup(title: str = "the deck chooser") -> None:
+	"""
+	Print the import timings, if --profile-startup was given.
+
+	Args:
+		title: what the total time is up to
+	"""
+	global _import_timer
+	if _import_timer is not None:
+		_import_timer.uninstall()
+		print(_import_timer.report(title), file=sys.stderr)
+		_import_timer = None
+
+
 def main() -> None:
 	"""Main application controller function."""
 	program_directory = get_program_directory()
 	print(WELCOME)
+	catalog = None
 
 	while True:
 		try:
-			# Find all json files in local directory
-			decks = glob.glob(os.path.join(program_directory, "*.json"))
+			# Find all json and compact deck files in local directory, only re-reading decks that changed
+			catalog = refresh_catalog(program_directory, catalog)
+			decks = [os.path.join(program_directory, name) for name in catalog]
 			if not decks:
 				print("No deck files found. Please add some .json deck files or use the importer.")
 				if not handle_import_functionality(program_directory):
 					break
 				continue
 
-			deck_choice = get_valid_deck_choice(decks)
+			report_startup()
+			deck_choice = get_valid_deck_choice(decks, [entry["cards"] for entry in catalog.values()])
 
 			if deck_choice == "i":
 				# Handle import functionality
@@ -68,4 +95,18 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    arguments = [argument for argument in sys.argv[1:] if argument != PROFILE_FLAG]
+    if arguments:
+        # Any other argument is a command of the command line interface, which never prompts
+        from cli import main as run_command
+        try:
+            status = run_command(arguments)
+        finally:
+            shutdown_deck_writer()
+            report_startup("the end of the command")
+        sys.exit(status)
+    try:
+        main()
+    finally:
+        # Decks may still be queued for writing in the background
+        shutdown_deck_writer()
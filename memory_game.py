@@ -1,34 +1,67 @@
-"""
-Memory game functionality
-"""
-from random import randrange
-import math
-import copy
-from display_utils import card_displayer
-
 # memory_game.py
 """
 Memory game functionality
 """
-from random import randrange
 import math
-import copy
+import random
+import re
+import sys
 from display_utils import card_displayer
 
 
+# Marks a cell whose card has been matched and taken off the board
+EMPTY = -1
+# Spreadsheet style coordinates, a row number then a column label: '3b', '12aa'
+_COORDINATE = re.compile(r"(\d+)([a-z]+)")
+
+
+def board_size(game_length):
+	"""
+	Work out the board dimensions for a number of pairs.
+
+	:param int game_length: number of pairs on the board
+	:return tuple: (rows, columns)
+	"""
+	total_cards = game_length * 2
+	columns_count = math.floor(math.sqrt(total_cards))
+	return math.ceil(total_cards / columns_count), columns_count
+
+
+def column_label(index):
+	"""Return the letters of a column: 'a' to 'z', then 'aa', 'ab' and so on."""
+	label = ""
+	index += 1
+	while index:
+		index, letter = divmod(index - 1, 26)
+		label = chr(97 + letter) + label
+	return label
+
+
+def column_index(label):
+	"""Return the index of a column from its letters, the reverse of column_label."""
+	index = 0
+	for letter in label:
+		index = index * 26 + ord(letter) - 96
+	return index - 1
+
+
 class MemoryGame:
 	"""Class to handle memory game functionality"""
 
-	def __init__(self, deck_dict):
+	def __init__(self, deck_dict, rng=None):
 		"""
 		Initialize the memory game with a deck of flashcards
 
 		:param deck_dict: a dictionary containing pairs of flashcards
+		:param rng: a random.Random to deal the cards with, eg. seeded for a reproducible board
 		"""
 		self.deck_dict = deck_dict
+		self.rng = rng if rng is not None else random.Random()
 		self.initial_pairs = [[key, value] for key, value in deck_dict.items()]
 		self.f_b_pairs = []
-		self.grid = []
+		# The board, row by row. Each cell holds a card id, 2 * pair index + side (0 front, 1 back), or EMPTY
+		self.cells = []
+		self.remaining_pairs = 0
 		self.rows_count = 0
 		self.columns_count = 0
 		self.game_round = 0
@@ -40,88 +73,74 @@ class MemoryGame:
 
 		while not length_chosen:
 			game_length = input(
-				f"Please choose how many cards you'd like to include in the game, between 2 and {min(24, max_cards)}: ")
+				f"Please choose how many cards you'd like to include in the game, between 2 and {max_cards}: ")
 			if game_length.isdigit():
 				game_length_int = int(game_length)
-				if 2 <= game_length_int <= min(24, max_cards):
+				if 2 <= game_length_int <= max_cards:
 					length_chosen = True
 					return game_length_int
 				else:
-					print(f"Please pick a number between 2 and {min(24, max_cards)}")
+					print(f"Please pick a number between 2 and {max_cards}")
 			else:
 				print("Please enter a valid number")
 
 	def select_cards(self, game_length):
 		"""Select random cards from the deck for the game"""
-		self.f_b_pairs = []
-		available_pairs = copy.deepcopy(self.initial_pairs)
-
-		while len(self.f_b_pairs) < game_length:
-			quest_to_add = available_pairs.pop(randrange(len(available_pairs)))
-			self.f_b_pairs.append(quest_to_add)
+		self.f_b_pairs = self.rng.sample(self.initial_pairs, game_length)
 
 	def calculate_board_size(self, game_length):
 		"""Calculate optimal board dimensions"""
-		total_cards = game_length * 2
-		self.columns_count = math.floor(math.sqrt(total_cards))
-		self.rows_count = math.ceil(total_cards / self.columns_count)
+		self.rows_count, self.columns_count = board_size(game_length)
 
 	def create_grid(self):
 		"""Create and populate the game grid"""
-		self.grid = [["0" for _ in range(self.columns_count)] for _ in range(self.rows_count)]
-
-		# Create a list of all cards (each pair appears twice)
-		all_cards = []
-		for pair in self.f_b_pairs:
-			all_cards.extend(pair)
-
-		# Fill grid randomly
-		for card in all_cards:
-			placed = False
-			while not placed:
-				target_row = randrange(self.rows_count)
-				target_col = randrange(self.columns_count)
-				if self.grid[target_row][target_col] == "0":
-					self.grid[target_row][target_col] = card
-					placed = True
-
-	def get_card_choice(self, prompt, excluded_card=None):
-		"""Get a valid card choice from the user"""
+		# Each pair's front and back, then blanks for the cells left over, shuffled in one pass
+		card_count = 2 * len(self.f_b_pairs)
+		self.cells = list(range(card_count)) + [EMPTY] * (self.rows_count * self.columns_count - card_count)
+		self.rng.shuffle(self.cells)
+		self.remaining_pairs = len(self.f_b_pairs)
+
+	def card_text(self, card):
+		"""Return the text of a card id"""
+		return self.f_b_pairs[card // 2][card % 2]
+
+	def parse_choice(self, choice):
+		"""
+		Turn a coordinate like '3b' or '12aa' into a cell index
+
+		:return: the index into cells, or None if the choice isn't a cell on the board
+		"""
+		match = _COORDINATE.fullmatch(choice.strip().lower())
+		if match:
+			row = int(match.group(1)) - 1
+			col = column_index(match.group(2))
+			if 0 <= row < self.rows_count and 0 <= col < self.columns_count:
+				return row * self.columns_count + col
+		return None
+
+	def get_card_choice(self, prompt, excluded_cell=None):
+		"""Get a valid card choice from the user, returns (cell index, card id)"""
 		valid_choice = False
 		while not valid_choice:
-			choice = input(prompt)
-			if len(choice) == 2 and choice[0].isdigit() and choice[1].isalpha():
-				row = int(choice[0]) - 1
-				col = ord(choice[1]) - 97
-
-				if 0 <= row < self.rows_count and 0 <= col < self.columns_count:
-					chosen_card = self.grid[row][col]
-					if chosen_card != "0" and chosen_card != excluded_card:
-						return choice, chosen_card
+			cell = self.parse_choice(input(prompt))
+			if cell is not None and cell != excluded_cell and self.cells[cell] != EMPTY:
+				return cell, self.cells[cell]
 
 			print("Invalid choice. Please try again.")
 
 	def check_match(self, card1, card2):
-		"""Check if two cards form a matching pair"""
-		for pair in self.f_b_pairs:
-			if card1 in pair and card2 in pair:
-				return True
-		return False
+		"""Check if two different cards form a matching pair"""
+		return card1 != card2 and card1 // 2 == card2 // 2
 
-	def remove_matched_cards(self, choice1, choice2):
+	def remove_matched_cards(self, cell1, cell2):
 		"""Remove matched cards from the grid"""
-		row1, col1 = int(choice1[0]) - 1, ord(choice1[1]) - 97
-		row2, col2 = int(choice2[0]) - 1, ord(choice2[1]) - 97
-		self.grid[row1][col1] = "0"
-		self.grid[row2][col2] = "0"
+		self.cells[cell1] = EMPTY
+		self.cells[cell2] = EMPTY
+		self.remaining_pairs -= 1
 
 	def is_game_complete(self):
 		"""Check if all cards have been matched"""
-		for row in self.grid:
-			for card in row:
-				if card != "0":
-					return False
-		return True
+		return self.remaining_pairs == 0
 
 	def play(self):
 		"""Main game loop"""
@@ -136,39 +155,40 @@ class MemoryGame:
 		self.create_grid()
 
 		print("Pick two cards. Try to find the pairs!\nWhen guessing, input row # and column letter")
-		print("eg. Row 3, Column b would be '3b'")
+		print("eg. Row 3, Column b would be '3b', and Row 12, Column aa would be '12aa'")
 
 		self.game_round = 0
 
 		while not self.is_game_complete():
 			self.game_round += 1
-			print_grid(self.grid, self.columns_count)
+			print_grid(self.cells, self.columns_count)
 
 			# Get first card choice
-			choice1, card1 = self.get_card_choice("Please pick a card to turn over: ")
-			print(card_displayer(card1))
+			cell1, card1 = self.get_card_choice("Please pick a card to turn over: ")
+			print(card_displayer(self.card_text(card1)))
 
 			# Get second card choice
-			choice2, card2 = self.get_card_choice("Try to find the match!: ", excluded_card=card1)
-			print(card_displayer(card2))
+			cell2, card2 = self.get_card_choice("Try to find the match!: ", excluded_cell=cell1)
+			print(card_displayer(self.card_text(card2)))
 
 			# Check for match
 			if self.check_match(card1, card2):
 				print("Congratulations! You found a match!")
-				self.remove_matched_cards(choice1, choice2)
+				self.remove_matched_cards(cell1, cell2)
 			else:
 				print("Sorry, please try again.")
 
 		print(f"Congratulations, you won! It took you {self.game_round} rounds.")
 
 
-def memory_game(deck_dict):
+def memory_game(deck_dict, rng=None):
 	"""
 	Plays a game of 'memory' using the MemoryGame class
 
 	:param deck_dict: a dictionary containing pairs of flashcards
+	:param rng: a random.Random to deal the cards with
 	"""
-	game = MemoryGame(deck_dict)
+	game = MemoryGame(deck_dict, rng)
 	game.play()
 
 
@@ -177,22 +197,27 @@ def grid_maker(h, w):
 	return grid1
 
 
-def print_grid(grid2, columns_count):
-	y = 0
-	print("\n      columns\n      ", end="")
-	for i in range(columns_count):
-		# 'a' is ord(97), chr(97) is 'a'
-		print(chr(97 + y), end="  ")
-		y += 1
-	print()
-	x = 1
-	for row1 in grid2:
-		print("row " + str(x), end=" ")
-		x += 1
-		for e in row1:
-			# Print a blank if the card is empty, otherwise print a square
-			if e == "0":
-				print("   ", end="")
-			else:
-				print("口 ", end="")
-		print()
+def print_grid(cells, columns_count):
+	"""
+	Print the board, a square for each card still on it, as one write of the whole frame
+
+	:param list cells: the board row by row, EMPTY for cells without a card
+	:param int columns_count: number of columns in a row
+	"""
+	labels = [column_label(col) for col in range(columns_count)]
+	# A square is two characters wide, and each column is at least a space wider than its label
+	cell_width = max(3, len(labels[-1]) + 1) if labels else 3
+	row_count = -(-len(cells) // columns_count) if columns_count else 0
+	number_width = len(str(row_count))
+	card = "口".ljust(cell_width - 1)
+	blank = " " * cell_width
+
+	frame = ["\n      columns\n", " " * (5 + number_width)]
+	frame.extend(label.ljust(cell_width) for label in labels)
+	frame.append("\n")
+	for row in range(row_count):
+		frame.append(f"row {str(row + 1).ljust(number_width)} ")
+		frame.extend(blank if e == EMPTY else card for e in cells[row * columns_count:(row + 1) * columns_count])
+		frame.append("\n")
+	sys.stdout.write("".join(frame))
+	sys.stdout.flush()
@@ -0,0 +1,117 @@
+"""
+Quiz session engine shared by the quiz modes
+"""
+import random
+import time
+from display_utils import card_displayer
+
+
+def choose_quiz_length(deck_size):
+    """
+    Ask how many cards the quiz should have until a number between 1 and the deck size is given.
+
+    :param int deck_size: number of cards in the deck
+    :return int: the chosen quiz length
+    """
+    while True:
+        quiz_length = input("Please choose how many cards you'd like to include in the quiz")
+        try:
+            quiz_length = int(quiz_length)
+        except ValueError:
+            print(f"Please enter a number between 1 and {deck_size}.")
+            continue
+        if 0 < quiz_length <= deck_size:
+            return quiz_length
+        print(f"Please enter a number between 1 and {deck_size}.")
+
+
+class QuizSession:
+    """
+    The questions of one quiz and the score so far.
+
+The questions are a random.sample of the deck, so they are already in random order and each one is drawn by
+popping the last, in constant time. Setting up a quiz takes time linear in the size of the deck.
+
+    :param deck_dict: A dictionary of word-definition pairs.
+    :param int length: how many cards to ask about, at most the size of the deck
+    :param str quiz_direction: "f" for front to back, and "b" for back to front.
+    :param rng: a random.Random to draw with, defaults to the random module
+    :param questions: (front, back) pairs to ask in this order instead of a random sample, length is then ignored
+    """
+
+    def __init__(self, deck_dict, length, quiz_direction="f", rng=None, questions=None):
+        if questions is not None:
+            # Reversed, as questions are popped from the end
+            self.questions = list(questions)[::-1]
+            length = len(self.questions)
+        else:
+            rng = rng if rng is not None else random
+            self.questions = rng.sample(list(deck_dict.items()), length)
+        # Cause our default mode is "f" so lets let f's backs and fronts be correct
+        self.front = 0
+        self.back = 1
+        # And "b" will be flipped
+        if quiz_direction == "b":
+            self.front = 1
+            self.back = 0
+        self.score = 0
+        self.top_score = length
+
+    def __len__(self):
+        return len(self.questions)
+
+    def __iter__(self):
+        """Yield the (front, back) pair of each remaining card, removing it from the quiz."""
+        while self.questions:
+            yield self.questions.pop()
+
+    def sides(self, pair):
+        """Return the (question, answer) of a card in the quiz's direction."""
+        return pair[self.front], pair[self.back]
+
+    def record(self, correct):
+        """Count an answer towards the score."""
+        if correct:
+            self.score += 1
+
+    def summary(self):
+        """Return the end of quiz message."""
+        return (f"End of quiz. Your score was {str(round(100 * self.score / self.top_score, 2))}%. "
+                f"You got {str(self.score)} out of {str(self.top_score)} questions correct.")
+
+
+def run_quiz(deck_dict, quiz_direction, title, ask_question, rng=None, questions=None, on_answer=None):
+    """
+    Run a quiz, asking the user for its length first unless the questions are given.
+
+    :param dict deck_dict: A dictionary of word-definition pairs.
+    :param str quiz_direction: "f" for front to back, and "b" for back to front.
+    :param str title: name of the quiz mode, shown when it starts
+    :param ask_question: function taking (question, answer) that asks one question and returns whether it was
+answered correctly
+    :param rng: a random.Random to draw the questions with
+    :param questions: (front, back) pairs to ask, in order, instead of a random sample of the deck
+    :param on_answer: called with ((front, back), correct, seconds taken) after each answer
+    :return QuizSession: the finished session
+    """
+    length = choose_quiz_length(len(deck_dict)) if questions is None else 0
+    session = QuizSession(deck_dict, length, quiz_direction, rng, questions)
+    print(f"\nQuiz --- {title}\n----------------------------\n")
+    for pair in session:
+        started = time.monotonic()
+        correct = ask_question(*session.sides(pair))
+        session.record(correct)
+        if on_answer is not None:
+            on_answer(pair, correct, time.monotonic() - started)
+    print(session.summary())
+    return session
+
+
+def show_correct_answer(answer):
+    """Tell the user they were wrong and show the card's answer."""
+    print(f"Incorrect. The correct answer is：{card_displayer(answer)}")
+
+
+def answers_text(answers):
+    """Join the answers accepted for a question, eg. every front of a back, for display."""
+    return "\nor\n".join(answers)
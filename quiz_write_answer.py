@@ -1,52 +1,49 @@
 """
 Write answer quiz functionality
 """
-from random import randrange
+from answer_matching import AnswerGrader
+from deck_model import reverse_index
 from display_utils import card_displayer
+from quiz_session import run_quiz, show_correct_answer, answers_text
 
 
-def write_answer_quiz(deck_dict, quiz_direction):
+def ask_write_answer(question, answers, grader):
     """
-    give a flashcard quiz where quiz taker must pick the correct answer from a choice of four.
+    Ask for the answer to be typed in. Small typos, case, punctuation and word order are forgiven.
 
-    :param dict deck_dict: A dictionary of word-definition pairs, must be at least 4 terms long.
+    :param str question: the side of the card shown
+    :param answers: every answer accepted, eg. each front of a back when quizzing back to front
+    :param AnswerGrader grader: grader caching the normalized answers
+    :return bool: whether the answer was correct
+    """
+    guess = input(card_displayer(question) + "\n: ")
+    grades = [grader.grade(guess, answer) for answer in answers]
+    if any(grade.exact for grade in grades):
+        print("Correct!")
+        return True
+    if any(grade.correct for grade in grades):
+        print(f"Correct! The exact answer is：{card_displayer(answers_text(answers))}")
+        return True
+    show_correct_answer(answers_text(answers))
+    return False
+
+
+def write_answer_quiz(deck_dict, quiz_direction, questions=None, on_answer=None, grader=None):
+    """
+    give a flashcard quiz where quiz taker must type in the correct answer as written on the card
+
+    :param dict deck_dict: A dictionary of word-definition pairs.
     :param str quiz_direction:  "f" for front to back, and "b" for back to front.
+    :param questions: (front, back) pairs to ask, in order, instead of asking for a quiz length
+    :param on_answer: called with ((front, back), correct, seconds taken) after each answer
+    :param AnswerGrader grader: grader to reuse, keeping the answers it already normalized
     """
-    # Converts dict into list of key/value tuples
-    initial_pairs = [pair for pair in deck_dict.items()]
-    # Make use choose quiz length
-    length_chosen = False
-    while not length_chosen:
-        quiz_length = input("Please choose how many cards you'd like to include in the quiz")
-        if int(quiz_length) > 0 and int(quiz_length) < len(initial_pairs):
-            length_chosen = True
-    # Add as many questions to the quiz as the user had specified
-    f_b_pairs = []
-    while len(f_b_pairs) < int(quiz_length):
-        quest_to_add = initial_pairs[randrange(len(initial_pairs))]
-        if quest_to_add not in f_b_pairs:
-            f_b_pairs.append(quest_to_add)
-    # Cause our default mode is "f" so lets let f's backs and fronts be correct
-    front = 0
-    back = 1
-    # And "b" will be flipped
-    if quiz_direction == "b":
-        front = 0
-        back = 1
-    score = 0
-    top_score = len(f_b_pairs)
-    print("\nQuiz --- Write tne answer\n----------------------------\n")
-    # Front to back. Display front of card(key) in prompt, and answer must be its value
-    while f_b_pairs:
-        # From the tuple list, select a random index, and the 0th value of that (which is the card front)
-        random_pair = f_b_pairs[randrange(0, len(f_b_pairs))]
-        guess = input(card_displayer(random_pair[front]) + "\n: ")
-        if guess == random_pair[back]:
-            print("Correct!")
-            score += 1
-            f_b_pairs.remove(random_pair)
-        else:
-            print(f"Incorrect. The correct answer is：{card_displayer(random_pair[back])}")
-            f_b_pairs.remove(random_pair)
-    print(f"End of quiz. Your score was {str(round(100 * score / top_score, 2))}%. "
-          f"You got {str(score)} out of {str(top_score)} questions correct.")
+    if grader is None:
+        grader = AnswerGrader()
+    # Back to front, any front of the card's back is accepted
+    index = reverse_index(deck_dict) if quiz_direction == "b" else None
+
+    def ask(question, answer):
+        return ask_write_answer(question, index.fronts_for(question) if index else (answer,), grader)
+
+    run_quiz(deck_dict, quiz_direction, "Write tne answer", ask, questions=questions, on_answer=on_answer)
@@ -0,0 +1,310 @@
+"""
+Columnar log of every quiz answer, with per-card statistics
+
+Each answer is an event with the time, deck, card, quiz mode, direction, whether it was correct and how long
+it took, NaN for answers that weren't timed. Events are kept in memory as one typed array per column and
+written to disk in segments, one file for each batch of answers, with the columns stored one after another:
+    header    magic b"FCRH", version (u16), reserved (u16), event count n (u32)
+    columns   n values of each column in COLUMNS order, little-endian
+
+Once there are more than MAX_SEGMENTS segments they are merged into a single base segment. The base is named
+after the last segment it contains, so segments it already covers are ignored if a crash leaves them behind.
+
+Several processes can use the same history, like the menus and a "main.py quiz --record" run. A flush holds
+a lock file while it reads back what the others wrote, so segment numbers and name ids are never claimed twice.
+
+Card and deck names are stored once, in "names.json", and the columns only hold their ids. The statistics
+are counted over whole columns with Counter and itertools.compress, so they run at C speed and take well
+under a second for millions of events.
+"""
+import json
+import math
+import os
+import struct
+import sys
+import time
+from array import array
+from contextlib import contextmanager
+from collections import Counter
+from itertools import compress, filterfalse, repeat
+from operator import floordiv
+
+from deck_store import atomic_open
+
+HISTORY_DIRECTORY = ".review_history"
+NAMES_FILE = "names.json"
+LOCK_FILE = "flush.lock"
+# A lock older than this many seconds was left by a process that died while flushing
+STALE_LOCK_SECONDS = 10
+SEGMENT_PREFIX = "segment-"
+BASE_PREFIX = "base-"
+SEGMENT_EXTENSION = ".seg"
+MAGIC = b"FCRH"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+MAX_SEGMENTS = 64
+DAY = 24 * 60 * 60
+
+# Column names and their array typecodes
+COLUMNS = (("time", "d"), ("deck", "I"), ("card", "I"), ("mode", "B"), ("direction", "B"),
+           ("correct", "B"), ("latency", "f"))
+MODES = ("multiple choice", "write the answer", "self report")
+DIRECTIONS = ("f", "b")
+
+
+def _segment_number(name):
+    """Sequence number of a segment or base file name, None for other files"""
+    for prefix in (SEGMENT_PREFIX, BASE_PREFIX):
+        if name.startswith(prefix) and name.endswith(SEGMENT_EXTENSION):
+            try:
+                return int(name[len(prefix):-len(SEGMENT_EXTENSION)])
+            except ValueError:
+                return None
+    return None
+
+
+@contextmanager
+def _locked(path):
+    """Hold a lock file while the with block runs, waiting for any other process holding it"""
+    while True:
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > STALE_LOCK_SECONDS:
+                    os.remove(path)
+                    continue
+            except OSError:
+                # Released in the meantime
+                continue
+            time.sleep(0.01)
+    try:
+        yield
+    finally:
+        os.remove(path)
+
+
+class ReviewHistory:
+    """
+    Review events of every deck, stored in a directory.
+
+    :param str directory: where the segments are kept, created when the first events are written
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._reset()
+        self._load()
+
+    def __len__(self):
+        return len(self.columns["time"])
+
+    def _reset(self):
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS}
+        self._decks = []
+        self._deck_ids = {}
+        self._cards = []
+        self._card_ids = {}
+        self._names_saved = 0
+        self._unsaved = 0
+        self._segments = []
+        self._next_segment = 1
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.directory, NAMES_FILE), 'r', encoding='utf-8') as file:
+                names = json.load(file)
+            files = os.listdir(self.directory)
+        except (OSError, ValueError):
+            return
+        for deck in names["decks"]:
+            self._deck_id(deck)
+        for deck_id, front in names["cards"]:
+            self._card_id(deck_id, front)
+        self._names_saved = len(self._cards)
+        numbered = sorted((_segment_number(name), name) for name in files if _segment_number(name) is not None)
+        bases = [number for number, name in numbered if name.startswith(BASE_PREFIX)]
+        base = bases[-1] if bases else 0
+        for number, name in numbered:
+            if number > base or (number == base and name.startswith(BASE_PREFIX)):
+                self._read_segment(name)
+            self._next_segment = max(self._next_segment, number + 1)
+
+    def _read_segment(self, name):
+        try:
+            with open(os.path.join(self.directory, name), "rb") as file:
+                data = file.read()
+        except OSError:
+            return
+        if len(data) < HEADER.size:
+            return
+        magic, version, _, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            return
+        position = HEADER.size
+        columns = []
+        for column_name, typecode in COLUMNS:
+            column = array(typecode)
+            end = position + count * column.itemsize
+            column.frombytes(data[position:end])
+            if sys.byteorder != "little":
+                column.byteswap()
+            columns.append((column_name, column))
+            position = end
+        if position != len(data):
+            # A torn segment, its events were never completely written
+            return
+        for column_name, column in columns:
+            self.columns[column_name].extend(column)
+        self._segments.append(name)
+
+    def _deck_id(self, deck):
+        deck_id = self._deck_ids.get(deck)
+        if deck_id is None:
+            deck_id = self._deck_ids[deck] = len(self._decks)
+            self._decks.append(deck)
+        return deck_id
+
+    def _card_id(self, deck_id, front):
+        card_id = self._card_ids.get((deck_id, front))
+        if card_id is None:
+            card_id = self._card_ids[(deck_id, front)] = len(self._cards)
+            self._cards.append((deck_id, front))
+        return card_id
+
+    def record(self, deck, front, mode, direction, correct, latency, when=None):
+        """
+        Add an answer event. It is kept in memory until the next flush.
+
+        :param str deck: name of the deck
+        :param str front: front of the card that was asked
+        :param str mode: one of MODES
+        :param str direction: "f" or "b"
+        :param bool correct: whether the answer was right
+        :param float latency: seconds taken to answer, None if the answer wasn't timed
+        :param float when: time of the answer, defaults to time.time()
+        """
+        self._append(time.time() if when is None else when, deck, front, MODES.index(mode),
+                     DIRECTIONS.index(direction), bool(correct), math.nan if latency is None else latency)
+        self._unsaved += 1
+
+    def _append(self, when, deck, front, *values):
+        deck_id = self._deck_id(deck)
+        for (name, _), value in zip(COLUMNS, (when, deck_id, self._card_id(deck_id, front), *values)):
+            self.columns[name].append(value)
+
+    def flush(self):
+        """Write the events recorded since the last flush as a new segment."""
+        if not self._unsaved:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with _locked(os.path.join(self.directory, LOCK_FILE)):
+            on_disk = {name for name in os.listdir(self.directory) if _segment_number(name) is not None}
+            if on_disk != set(self._segments):
+                self._reload()
+            if len(self._cards) != self._names_saved:
+                with atomic_open(os.path.join(self.directory, NAMES_FILE)) as file:
+                    json.dump({"decks": self._decks, "cards": self._cards}, file, ensure_ascii=False)
+                self._names_saved = len(self._cards)
+            if len(self._segments) >= MAX_SEGMENTS:
+                self._write_segment(BASE_PREFIX, 0)
+                self._remove_covered_segments()
+            else:
+                self._write_segment(SEGMENT_PREFIX, len(self) - self._unsaved)
+            self._unsaved = 0
+
+    def _reload(self):
+        """Read back what other processes wrote, then add the unsaved events after it"""
+        start = len(self) - self._unsaved
+        events = list(zip(*(self.columns[name][start:] for name, _ in COLUMNS)))
+        decks, cards = self._decks, self._cards
+        self._reset()
+        self._load()
+        for when, deck_id, card_id, *values in events:
+            self._append(when, decks[deck_id], cards[card_id][1], *values)
+        self._unsaved = len(events)
+
+    def _write_segment(self, prefix, start):
+        """Write the events from index start onwards as the next numbered segment"""
+        name = f"{prefix}{self._next_segment:08d}{SEGMENT_EXTENSION}"
+        self._next_segment += 1
+        with atomic_open(os.path.join(self.directory, name), "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, 0, len(self) - start))
+            for column_name, _ in COLUMNS:
+                column = self.columns[column_name][start:]
+                if sys.byteorder != "little":
+                    column.byteswap()
+                file.write(column.tobytes())
+        self._segments.append(name)
+
+    def _remove_covered_segments(self):
+        """Delete the segments and older bases merged into the newest base"""
+        base = self._segments.pop()
+        for name in self._segments:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+        self._segments = [base]
+
+    def _select(self, deck, *names):
+        """The given columns, only keeping a deck's events"""
+        deck_id = self._deck_ids.get(deck)
+        if deck_id is None:
+            return [[] for _ in names]
+        if len(self._decks) == 1:
+            return [self.columns[name] for name in names]
+        selected = list(map(deck_id.__eq__, self.columns["deck"]))
+        return [list(compress(self.columns[name], selected)) for name in names]
+
+    def card_accuracy(self, deck):
+        """
+        Count the answers to each card of a deck.
+
+        :param str deck: name of the deck
+        :return dict: front -> (correct answers, answers)
+        """
+        cards, correct = self._select(deck, "card", "correct")
+        answers = Counter(cards)
+        right = Counter(compress(cards, correct))
+        return {self._cards[card][1]: (right[card], count) for card, count in answers.items()}
+
+    def hardest_cards(self, deck, count=10, min_answers=1):
+        """
+        Find the cards of a deck answered correctly least often.
+
+        :param str deck: name of the deck
+        :param int count: how many cards to return
+        :param int min_answers: ignore cards answered fewer times than this
+        :return list: (front, accuracy from 0 to 1, answers) tuples, hardest first
+        """
+        scored = [(right / answers, -answers, front)
+                  for front, (right, answers) in self.card_accuracy(deck).items() if answers >= min_answers]
+        scored.sort()
+        return [(front, accuracy, -answers) for accuracy, answers, front in scored[:count]]
+
+    def learning_curve(self, deck, period=DAY):
+        """
+        Accuracy over time for a deck.
+
+        :param str deck: name of the deck
+        :param float period: length of each point of the curve in seconds, a day by default
+        :return list: (start time of the period, accuracy from 0 to 1, answers) tuples, oldest first
+        """
+        times, correct = self._select(deck, "time", "correct")
+        periods = list(map(floordiv, times, repeat(period)))
+        answers = Counter(periods)
+        right = Counter(compress(periods, correct))
+        return [(start * period, right[start] / answers[start], answers[start]) for start in sorted(answers)]
+
+    def deck_summary(self, deck):
+        """
+        Totals for a deck.
+
+        :param str deck: name of the deck
+        :return tuple: (answers, correct answers, average seconds per timed answer, None if none were timed)
+        """
+        correct, latency = self._select(deck, "correct", "latency")
+        timed = list(filterfalse(math.isnan, latency))
+        return len(correct), sum(correct), sum(timed) / len(timed) if timed else None
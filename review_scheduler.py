@@ -0,0 +1,233 @@
+"""
+Spaced repetition scheduling of a deck's cards, using the SM-2 algorithm
+
+Each reviewed card keeps an ease factor, an interval in days and a due time. Answering a card correctly
+pushes it further into the future, answering it wrong brings it back the next day. Cards that were never
+reviewed are due straight away.
+
+Due times are kept in a heap, so finding the next due card takes O(log n) time instead of scanning the deck.
+Each entry carries a sequence number, and only the latest entry pushed for a card is live. Entries of cards
+that were reviewed again, removed, or removed and added back are left in the heap and skipped when they come
+up.
+
+The schedule is saved next to its deck as "<deck>.schedule". Only reviewed cards are stored, new ones are
+picked up from the deck when it is opened.
+"""
+import heapq
+import json
+import time
+from itertools import count
+
+from deck_store import atomic_open
+
+SCHEDULE_SUFFIX = ".schedule"
+SCHEDULE_VERSION = 1
+DAY = 24 * 60 * 60
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# SM-2 grades on a 0 to 5 scale, quizzes only know right or wrong
+CORRECT_QUALITY = 4
+WRONG_QUALITY = 1
+
+# Schedules opened this session, by deck path, so card edits can keep them up to date
+_open_schedules = {}
+
+
+class CardState:
+    """
+    Review state of one card.
+
+    :param float ease: SM-2 ease factor, how fast the interval grows
+    :param int interval: days until the next review after the last one
+    :param int repetitions: correct answers in a row
+    :param float due: time the card is next due, in seconds since the epoch
+    """
+    __slots__ = ("ease", "interval", "repetitions", "due")
+
+    def __init__(self, ease=DEFAULT_EASE, interval=0, repetitions=0, due=0.0):
+        self.ease = ease
+        self.interval = interval
+        self.repetitions = repetitions
+        self.due = due
+
+    def review(self, quality, now):
+        """Update the state after an answer graded from 0 (forgot) to 5 (perfect)."""
+        if quality >= 3:
+            self.repetitions += 1
+            if self.repetitions == 1:
+                self.interval = 1
+            elif self.repetitions == 2:
+                self.interval = 6
+            else:
+                self.interval = round(self.interval * self.ease)
+        else:
+            self.repetitions = 0
+            self.interval = 1
+        self.ease = max(MIN_EASE, self.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        self.due = now + self.interval * DAY
+
+
+class ReviewSchedule:
+    """
+    Review states of a deck's cards, with an index of when each card is due.
+
+    :param fronts: the fronts of every card in the deck
+    :param dict states: front -> CardState of the cards reviewed before
+    """
+
+    def __init__(self, fronts, states=None):
+        self.dirty = False
+        self._states = {}
+        self._due = {}
+        # front -> sequence number of its live heap entry
+        self._live = {}
+        self._sequence = count()
+        self._heap = []
+        for front in fronts:
+            state = states.get(front) if states else None
+            if state is not None:
+                self._states[front] = state
+            due = state.due if state is not None else 0.0
+            self._due[front] = due
+            self._live[front] = sequence = next(self._sequence)
+            self._heap.append((due, sequence, front))
+        heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._due)
+
+    def state(self, front):
+        """Return a card's CardState, None if it was never reviewed."""
+        return self._states.get(front)
+
+    def _push(self, front, due):
+        self._due[front] = due
+        self._live[front] = sequence = next(self._sequence)
+        heapq.heappush(self._heap, (due, sequence, front))
+
+    def _drop_stale(self):
+        """Pop heap entries whose card was removed or rescheduled since they were pushed"""
+        heap = self._heap
+        while heap and self._live.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+
+    def add(self, front):
+        """Add a new card, due straight away."""
+        if front not in self._due:
+            self._push(front, 0.0)
+
+    def remove(self, front):
+        """Remove a card and forget its reviews."""
+        self._live.pop(front, None)
+        if self._due.pop(front, None) is not None and self._states.pop(front, None) is not None:
+            self.dirty = True
+
+    def next_due(self):
+        """
+        Return the card due soonest.
+
+        :return tuple: (due time, front), or None if the deck is empty
+        """
+        self._drop_stale()
+        if not self._heap:
+            return None
+        due, _, front = self._heap[0]
+        return due, front
+
+    def due_cards(self, limit, now=None):
+        """
+        Return the cards due by now, most overdue first, without taking them off the schedule.
+
+        :param int limit: the most cards to return
+        :param float now: the current time, defaults to time.time()
+        :return list: fronts of the due cards
+        """
+        if now is None:
+            now = time.time()
+        due = []
+        popped = []
+        self._drop_stale()
+        while self._heap and len(due) < limit and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            popped.append(entry)
+            due.append(entry[2])
+            self._drop_stale()
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+        return due
+
+    def review(self, front, correct, now=None):
+        """
+        Record an answer to a card and reschedule it.
+
+        :param str front: the card's front
+        :param bool correct: whether it was answered correctly
+        :param float now: the time of the answer, defaults to time.time()
+        """
+        if front not in self._due:
+            return
+        state = self._states.setdefault(front, CardState())
+        state.review(CORRECT_QUALITY if correct else WRONG_QUALITY, time.time() if now is None else now)
+        self._push(front, state.due)
+        self.dirty = True
+
+    def record_answer(self, pair, correct, latency):
+        """Quiz on_answer callback, reviews the card of a (front, back) pair."""
+        self.review(pair[0], correct)
+
+    def to_json(self):
+        """Return the reviewed cards' states as a JSON serialisable dictionary."""
+        return {"version": SCHEDULE_VERSION,
+                "cards": {front: [state.ease, state.interval, state.repetitions, state.due]
+                          for front, state in self._states.items()}}
+
+    @classmethod
+    def from_json(cls, fronts, saved):
+        """Rebuild a schedule saved with to_json, for a deck with the given fronts."""
+        if saved.get("version") != SCHEDULE_VERSION:
+            raise ValueError("Unsupported review schedule version.")
+        states = {front: CardState(*values) for front, values in saved["cards"].items()}
+        return cls(fronts, states)
+
+
+def schedule_path(deck_path):
+    """Return the path of a deck's review schedule file."""
+    return deck_path + SCHEDULE_SUFFIX
+
+
+def open_schedule(deck_dict, deck_path):
+    """
+    Get the review schedule of a deck, loading it if this is the first time this session.
+
+    :param deck_dict: the deck, its cards without a saved state are new
+    :param str deck_path: path of the deck file
+    :return ReviewSchedule: the schedule, also kept open so card edits update it
+    """
+    schedule = _open_schedules.get(deck_path)
+    if schedule is not None:
+        return schedule
+    try:
+        with open(schedule_path(deck_path), 'r', encoding='utf-8') as file:
+            schedule = ReviewSchedule.from_json(deck_dict, json.load(file))
+    except FileNotFoundError:
+        schedule = ReviewSchedule(deck_dict)
+    except (OSError, ValueError, KeyError, TypeError):
+        print("Could not read the review schedule, starting a new one.")
+        schedule = ReviewSchedule(deck_dict)
+    _open_schedules[deck_path] = schedule
+    return schedule
+
+
+def get_open_schedule(deck_path):
+    """Return a deck's review schedule if it was opened this session, otherwise None."""
+    return _open_schedules.get(deck_path)
+
+
+def save_schedule(deck_path):
+    """Write a deck's open review schedule next to the deck, if it changed."""
+    schedule = _open_schedules.get(deck_path)
+    if schedule is None or not schedule.dirty:
+        return
+    with atomic_open(schedule_path(deck_path)) as file:
+        json.dump(schedule.to_json(), file, ensure_ascii=False)
+    schedule.dirty = False
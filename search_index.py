@@ -0,0 +1,212 @@
+"""
+Full-text search over the fronts and backs of a deck
+
+Cards are indexed by their words, normalized like typed answers (see answer_matching.normalize):
+    - an inverted index maps each word to the ids of the cards containing it, with the words also kept
+      sorted so short search terms can match every word they begin,
+    - a trigram index maps every three character piece of a word to the words containing it, so a search
+      term of three or more characters can match anywhere inside a word.
+
+Trigrams are kept per distinct word rather than per card, so indexing a card is mostly a few set additions,
+and a search only looks at the words sharing the rarest trigrams of each term. Searching and suggesting
+fronts take milliseconds on decks of 100,000 cards, and the index is updated card by card as cards are added
+and removed.
+"""
+import heapq
+from bisect import bisect_left, insort
+from collections import Counter, namedtuple
+
+from answer_matching import normalize
+
+SEARCH_LIMIT = 20
+# Trigrams of a search term intersected to find candidate words, the rarest ones first
+MATCH_GRAMS = 4
+SUGGESTION_LIMIT = 3
+# Known words looked at for each word of a front that wasn't found, and cards compared with it
+SUGGESTION_WORDS = 5
+SUGGESTION_CANDIDATES = 50
+
+# Matching fronts, best first, and how many cards matched in total
+SearchResult = namedtuple("SearchResult", ["total", "fronts"])
+
+# Indexes opened this session, by deck path, so card edits can keep them up to date
+_open_indexes = {}
+
+
+def trigrams(text):
+    """Return the set of three character pieces of text, padded so short words have some."""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _dice(first, second):
+    """Share of pieces two sets have in common, from 0 to 1"""
+    return 2 * len(first & second) / (len(first) + len(second)) if first or second else 1.0
+
+
+class SearchIndex:
+    """
+    Word and trigram index over a deck's cards.
+
+    :param deck: a mapping of card fronts to card backs to index
+    """
+
+    def __init__(self, deck=None):
+        self.deck = deck
+        self._next_id = 0
+        self._ids = {}
+        self._fronts = {}
+        self._texts = {}
+        self._words = {}
+        self._sorted_words = []
+        self._trigrams = {}
+        if deck is not None:
+            for front, back in deck.items():
+                self._index(front, back)
+            # Sorted once, rather than inserting each new word in place
+            self._sorted_words = sorted(self._words)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, front, back):
+        """Index a card, replacing the card with the same front if there is one."""
+        if front in self._ids:
+            self.remove(front)
+        for word in self._index(front, back):
+            insort(self._sorted_words, word)
+
+    def _index(self, front, back):
+        """Add a card to the word and trigram indexes, returning the words that were new to them"""
+        card_id = self._next_id
+        self._next_id += 1
+        self._ids[front] = card_id
+        self._fronts[card_id] = front
+        text = self._texts[card_id] = (normalize(front), normalize(back))
+        new_words = []
+        for word in set(text[0].split()).union(text[1].split()):
+            posting = self._words.get(word)
+            if posting is None:
+                posting = self._words[word] = set()
+                new_words.append(word)
+                for gram in trigrams(word):
+                    self._trigrams.setdefault(gram, set()).add(word)
+            posting.add(card_id)
+        return new_words
+
+    def remove(self, front):
+        """Take a card out of the index."""
+        card_id = self._ids.pop(front, None)
+        if card_id is None:
+            return
+        text = self._texts.pop(card_id)
+        del self._fronts[card_id]
+        for word in set(text[0].split()).union(text[1].split()):
+            posting = self._words[word]
+            posting.discard(card_id)
+            if posting:
+                continue
+            del self._words[word]
+            del self._sorted_words[bisect_left(self._sorted_words, word)]
+            for gram in trigrams(word):
+                words = self._trigrams[gram]
+                words.discard(word)
+                if not words:
+                    del self._trigrams[gram]
+
+    def _matching_words(self, term):
+        """The indexed words containing a normalized search term"""
+        if len(term) < 3:
+            # Too short for trigrams, match the words it begins instead
+            position = bisect_left(self._sorted_words, term)
+            end = bisect_left(self._sorted_words, term + "\U0010ffff", position)
+            return self._sorted_words[position:end]
+        # Unpadded, so the term can match in the middle of a word
+        grams = {term[i:i + 3] for i in range(len(term) - 2)}
+        postings = sorted((self._trigrams.get(gram, ()) for gram in grams), key=len)
+        if not postings[0]:
+            return []
+        candidates = set(postings[0]).intersection(*postings[1:MATCH_GRAMS])
+        return [word for word in candidates if term in word]
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """
+        Find the cards containing every word of a query, in their front or back.
+
+        :param str query: the words to look for, matched anywhere inside the card's words
+        :param int limit: the most fronts to return
+        :return SearchResult: matching fronts, those matching in the front and shortest first
+        """
+        terms = normalize(query).split()
+        if not terms:
+            return self._scan(query.strip(), limit)
+        matches = None
+        for term in sorted(terms, key=len, reverse=True):
+            found = set()
+            for word in self._matching_words(term):
+                found |= self._words[word]
+            matches = found if matches is None else matches & found
+            if not matches:
+                return SearchResult(0, [])
+        texts = self._texts
+
+        def rank(card_id):
+            front = texts[card_id][0]
+            return not all(term in front for term in terms), len(front), card_id
+
+        best = heapq.nsmallest(limit, matches, key=rank)
+        return SearchResult(len(matches), [self._fronts[card_id] for card_id in best])
+
+    def _scan(self, query, limit):
+        """Match a query with nothing but punctuation, like "!=", by looking at every card"""
+        if not query or self.deck is None:
+            return SearchResult(0, [])
+        matches = [front for front, back in self.deck.items() if query in front or query in back]
+        return SearchResult(len(matches), matches[:limit])
+
+    def _close_words(self, word):
+        """The indexed words spelled most like a word, which may be misspelled"""
+        wanted = trigrams(word)
+        shared = Counter()
+        for gram in wanted:
+            shared.update(self._trigrams.get(gram, ()))
+        candidates = shared.most_common(SUGGESTION_WORDS * 4)
+        scored = [(_dice(wanted, trigrams(candidate)), candidate) for candidate, _ in candidates]
+        return [candidate for score, candidate in heapq.nlargest(SUGGESTION_WORDS, scored)]
+
+    def suggest(self, text, limit=SUGGESTION_LIMIT):
+        """
+        Find the fronts closest to a front that wasn't found, for a "did you mean".
+
+        :param str text: the front that was typed
+        :param int limit: the most suggestions to return
+        :return list: the closest fronts, best first
+        """
+        normalized = normalize(text)
+        shared = Counter()
+        for word in set(normalized.split()):
+            for close in self._close_words(word):
+                shared.update(self._words[close])
+        wanted = trigrams(normalized)
+        scored = [(_dice(wanted, trigrams(self._texts[card_id][0])), card_id)
+                  for card_id, _ in shared.most_common(SUGGESTION_CANDIDATES)]
+        return [self._fronts[card_id] for score, card_id in heapq.nlargest(limit, scored) if score > 0]
+
+
+def open_search_index(deck, deck_path):
+    """
+    Get the search index of a deck, building it if this deck wasn't indexed yet this session.
+
+    :param deck: the loaded deck
+    :param str deck_path: path of the deck file
+    :return SearchIndex: the index, also kept open so card edits update it
+    """
+    index = _open_indexes.get(deck_path)
+    if index is None or index.deck is not deck:
+        index = _open_indexes[deck_path] = SearchIndex(deck)
+    return index
+
+
+def get_open_search_index(deck_path):
+    """Return a deck's search index if it was built this session, otherwise None."""
+    return _open_indexes.get(deck_path)
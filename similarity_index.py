@@ -0,0 +1,250 @@
+"""
+Similarity index over the answers of a deck, used to pick hard, similar-looking multiple choice distractors
+
+Answers are compared as character trigram TF-IDF vectors by cosine similarity. Candidates are found through
+an inverted index over each answer's rarest trigrams only, so building the index never compares every answer
+with every other one, and only the best few candidates are scored exactly. Each answer's nearest neighbours
+are kept precomputed, so looking them up while quizzing takes constant time, and adding or removing a card
+only updates the answers near it.
+
+The index is saved next to its deck as "<deck>.similar" and brought up to date with the deck when opened.
+"""
+import heapq
+import json
+import math
+from collections import Counter
+
+from deck_store import atomic_open
+
+INDEX_SUFFIX = ".similar"
+INDEX_VERSION = 1
+NGRAM = 3
+# Neighbours kept per answer
+TOP_K = 8
+# Only this many of an answer's rarest trigrams are used to look for candidates,
+# and trigrams shared by more answers than MAX_POSTING are too common to be worth following
+CANDIDATE_GRAMS = 12
+MAX_POSTING = 128
+# Candidates scored exactly for every neighbour kept
+RERANK_FACTOR = 3
+
+# Indexes opened this session, by deck path, so card edits can keep them up to date
+_open_indexes = {}
+
+
+def char_ngrams(text, n=NGRAM):
+    """Count the character n-grams of text, case and runs of whitespace ignored."""
+    padded = " " + " ".join(text.lower().split()) + " "
+    return Counter(padded[i:i + n] for i in range(max(1, len(padded) - n + 1)))
+
+
+def _unit_vector(counts, idf):
+    """Scale n-gram counts by their inverse document frequencies and normalise to unit length"""
+    weights = {gram: count * idf[gram] for gram, count in counts.items()}
+    norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+    return {gram: weight / norm for gram, weight in weights.items()}
+
+
+class SimilarityIndex:
+    """
+    Nearest neighbour index over a collection of answers.
+
+    :param int top_k: how many neighbours to keep for each answer
+    """
+
+    def __init__(self, top_k=TOP_K):
+        self.top_k = top_k
+        self.dirty = False
+        self._counts = Counter()
+        self._vectors = {}
+        self._postings = {}
+        self._neighbours = {}
+        self._listed_by = {}
+
+    def _index_answers(self, answers):
+        """Count answers and vectorise each distinct one, with every answer counted before weighting"""
+        self._counts.update(answers)
+        grams = {answer: char_ngrams(answer) for answer in self._counts}
+        for answer, counts in grams.items():
+            for gram in counts:
+                self._postings.setdefault(gram, {})[answer] = 0.0
+        idf = {gram: self._idf(gram) for gram in self._postings}
+        for answer, counts in grams.items():
+            self._index_vector(answer, _unit_vector(counts, idf))
+
+    def __len__(self):
+        return len(self._vectors)
+
+    def __contains__(self, answer):
+        return answer in self._vectors
+
+    def _idf(self, gram):
+        return math.log((1 + len(self._counts)) / (1 + len(self._postings.get(gram, ())))) + 1
+
+    def _vectorise(self, answer):
+        """Unit length TF-IDF vector of an answer, using the document frequencies as they are now"""
+        counts = char_ngrams(answer)
+        return _unit_vector(counts, {gram: self._idf(gram) for gram in counts})
+
+    def _index_vector(self, answer, vector):
+        self._vectors[answer] = vector
+        for gram, weight in vector.items():
+            self._postings.setdefault(gram, {})[answer] = weight
+
+    def _search(self, answer):
+        """Score the closest other answers to answer, returns [(score, other)] best first"""
+        vector = self._vectors[answer]
+        rare = heapq.nsmallest(CANDIDATE_GRAMS, vector, key=lambda gram: len(self._postings[gram]))
+        # Candidates are ranked by how many rare trigrams they share, then the best are scored exactly
+        shared_rare = Counter()
+        for gram in rare:
+            posting = self._postings[gram]
+            if len(posting) <= MAX_POSTING:
+                shared_rare.update(posting.keys())
+        shared_rare.pop(answer, None)
+        scored = []
+        for other, _ in shared_rare.most_common(self.top_k * RERANK_FACTOR):
+            other_vector = self._vectors[other]
+            shared = vector.keys() & other_vector.keys()
+            scored.append((sum(vector[gram] * other_vector[gram] for gram in shared), other))
+        return heapq.nlargest(self.top_k, scored)
+
+    def _set_neighbours(self, answer, scored):
+        for _, other in self._neighbours.get(answer, ()):
+            listed_by = self._listed_by.get(other)
+            if listed_by is not None:
+                listed_by.discard(answer)
+        self._neighbours[answer] = scored
+        for _, other in scored:
+            self._listed_by.setdefault(other, set()).add(answer)
+
+    def _offer(self, answer, score, other):
+        """Put other in answer's neighbours if it is closer than the ones there"""
+        scored = self._neighbours[answer]
+        if len(scored) >= self.top_k and score <= scored[-1][0]:
+            return
+        scored = sorted(scored + [(score, other)], reverse=True)
+        self._set_neighbours(answer, scored[:self.top_k])
+
+    def build(self, answers):
+        """
+        Index a whole collection of answers at once.
+
+        :param answers: an iterable of answers, eg. deck_dict.values(), repeats are counted
+        """
+        self.__init__(self.top_k)
+        self._index_answers(answers)
+        for answer in self._vectors:
+            self._set_neighbours(answer, self._search(answer))
+        self.dirty = True
+
+    def add(self, answer):
+        """Add one answer, updating the neighbours of the answers close to it."""
+        self._counts[answer] += 1
+        if self._counts[answer] > 1:
+            return
+        self._index_vector(answer, self._vectorise(answer))
+        scored = self._search(answer)
+        self._set_neighbours(answer, scored)
+        for score, other in scored:
+            self._offer(other, score, answer)
+        self.dirty = True
+
+    def remove(self, answer):
+        """Remove one answer, recomputing the neighbours of the answers that listed it."""
+        if self._counts[answer] == 0:
+            return
+        self._counts[answer] -= 1
+        if self._counts[answer] > 0:
+            return
+        del self._counts[answer]
+        self._set_neighbours(answer, [])
+        del self._neighbours[answer]
+        for gram in self._vectors.pop(answer):
+            posting = self._postings[gram]
+            del posting[answer]
+            if not posting:
+                del self._postings[gram]
+        for other in self._listed_by.pop(answer, set()):
+            self._set_neighbours(other, self._search(other))
+        self.dirty = True
+
+    def nearest(self, answer, k=None):
+        """
+        Return the answers most similar to answer, most similar first.
+
+        :param str answer: an answer in the index
+        :param int k: how many to return, at most top_k
+        :return list: the neighbouring answers, empty if answer isn't indexed
+        """
+        scored = self._neighbours.get(answer, ())
+        return [other for _, other in scored[:k]]
+
+    def sync(self, answers):
+        """Add and remove answers so the index matches a deck that changed since the index was saved."""
+        wanted = Counter(answers)
+        for answer, count in list(self._counts.items()):
+            for _ in range(count - wanted.get(answer, 0)):
+                self.remove(answer)
+        for answer, count in wanted.items():
+            for _ in range(count - self._counts.get(answer, 0)):
+                self.add(answer)
+
+    def to_json(self):
+        """Return the index as a JSON serialisable dictionary."""
+        return {"version": INDEX_VERSION, "top_k": self.top_k, "counts": dict(self._counts),
+                "neighbours": {answer: [[score, other] for score, other in scored]
+                               for answer, scored in self._neighbours.items()}}
+
+    @classmethod
+    def from_json(cls, saved):
+        """Rebuild an index saved with to_json. Vectors are recomputed, neighbour lists are reused."""
+        if saved.get("version") != INDEX_VERSION:
+            raise ValueError("Unsupported similarity index version.")
+        index = cls(saved["top_k"])
+        index._index_answers(saved["counts"])
+        for answer, scored in saved["neighbours"].items():
+            index._set_neighbours(answer, [(score, other) for score, other in scored])
+        return index
+
+
+def index_path(deck_path):
+    """Return the path of a deck's similarity index file."""
+    return deck_path + INDEX_SUFFIX
+
+
+def open_similarity_index(deck_dict, deck_path):
+    """
+    Get the similarity index of a deck's backs, loading or building it if this is the first time this session.
+
+    :param deck_dict: the deck, used to bring a saved index up to date
+    :param str deck_path: path of the deck file
+    :return SimilarityIndex: the index, also kept open so card edits update it
+    """
+    index = _open_indexes.get(deck_path)
+    if index is not None:
+        return index
+    try:
+        with open(index_path(deck_path), 'r', encoding='utf-8') as file:
+            index = SimilarityIndex.from_json(json.load(file))
+        index.sync(deck_dict.values())
+    except (OSError, ValueError, KeyError, TypeError):
+        index = SimilarityIndex()
+        index.build(deck_dict.values())
+    _open_indexes[deck_path] = index
+    return index
+
+
+def get_open_index(deck_path):
+    """Return a deck's similarity index if it was opened this session, otherwise None."""
+    return _open_indexes.get(deck_path)
+
+
+def save_similarity_index(deck_path):
+    """Write a deck's open similarity index next to the deck, if it changed."""
+    index = _open_indexes.get(deck_path)
+    if index is None or not index.dirty:
+        return
+    with atomic_open(index_path(deck_path)) as file:
+        json.dump(index.to_json(), file, ensure_ascii=False)
+    index.dirty = False
@@ -0,0 +1,91 @@
+"""
+Import timings for --profile-startup, in the layout of python -X importtime
+
+ImportTimer is put first on sys.meta_path. It lets the usual finders find each module and wraps the loader
+they return, timing how long running the module takes. Modules imported while another one runs are nested
+under it, so each module gets its own time and the cumulative time including everything it imported.
+"""
+import sys
+import time
+from importlib.abc import MetaPathFinder
+
+
+class _TimedLoader:
+    """Wraps a module loader, timing exec_module and passing everything else through"""
+
+    def __init__(self, loader, timer):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._timer.started(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.finished()
+
+
+class ImportTimer(MetaPathFinder):
+    """
+    Meta path finder recording how long every module imported after install() takes.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._stack = []
+        self.start = time.perf_counter()
+
+    def install(self):
+        """Start timing imports."""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        return self
+
+    def uninstall(self):
+        """Stop timing imports."""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, self)
+                return spec
+        return None
+
+    def started(self, name):
+        """Called as a module starts running"""
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def finished(self):
+        """Called once a module has run, records its own and cumulative time"""
+        name, start, children = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        if self._stack:
+            self._stack[-1][2] += elapsed
+        self.records.append((name, elapsed - children, elapsed, len(self._stack)))
+
+    def report(self, title="startup"):
+        """
+        Format the timings recorded so far.
+
+        :param str title: what the total time is up to
+        :return str: one line per module, nested modules first, then the total
+        """
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for name, own, cumulative, depth in self.records:
+            lines.append(f"import time: {own * 1e6:9.0f} | {cumulative * 1e6:10.0f} | {'  ' * depth}{name}")
+        imported = sum(cumulative for _, _, cumulative, depth in self.records if depth == 0)
+        lines.append(f"{len(self.records)} modules imported in {imported * 1e3:.1f} ms, "
+                     f"{(time.perf_counter() - self.start) * 1e3:.1f} ms to {title}.")
+        return "\n".join(lines)
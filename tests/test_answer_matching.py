@@ -0,0 +1,96 @@
+"""
+Unit tests for answer_matching.py using pytest
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path to import answer_matching
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from answer_matching import AnswerGrader, bounded_distance, normalize
+
+
+class TestNormalize:
+    """Test cases for the normalize function"""
+
+    def test_case_punctuation_and_whitespace(self):
+        """Test case, punctuation and extra whitespace are ignored"""
+        assert normalize("  An ORDERED,\n mutable  collection! ") == "an ordered mutable collection"
+
+    def test_unicode_forms(self):
+        """Test compatibility forms like full width letters are folded"""
+        assert normalize("Ｐｙｔｈｏｎ Straße") == normalize("python STRASSE")
+
+
+class TestBoundedDistance:
+    """Test cases for the bounded_distance function"""
+
+    @pytest.mark.parametrize("first,second,distance", [
+        ("print", "print", 0),
+        ("print", "prnt", 1),
+        ("print", "pritn", 1),
+        ("kitten", "sitting", 3),
+        ("", "abc", 3),
+    ])
+    def test_distances(self, first, second, distance):
+        """Test distances within the limit are exact"""
+        assert bounded_distance(first, second, 3) == distance
+
+    def test_over_limit(self):
+        """Test distances over the limit stop at limit + 1"""
+        assert bounded_distance("kitten", "sitting", 2) == 3
+        assert bounded_distance("a", "abcdefgh", 2) == 3
+        assert bounded_distance("x" * 1000, "y" * 1000, 1) == 2
+
+
+class TestAnswerGrader:
+    """Test cases for the AnswerGrader class"""
+
+    def test_exact_answer(self):
+        """Test an exact answer is marked exact"""
+        assert AnswerGrader().grade("print", "print") == (True, True)
+
+    def test_forgiven_answers(self):
+        """Test case, punctuation, small typos and word order are forgiven"""
+        grader = AnswerGrader()
+        answer = "An ordered, mutable collection"
+        for guess in ["an ordered mutable collection", "An ordred, mutable colection", "mutable ordered collection, an"]:
+            assert grader.grade(guess, answer) == (True, False)
+
+    def test_wrong_answers(self):
+        """Test wrong and empty answers are rejected"""
+        grader = AnswerGrader()
+        assert not grader.grade("An unordered collection of unique items", "An ordered, mutable collection").correct
+        assert not grader.grade("", "print").correct
+        assert not grader.grade("prxxt", "print").correct
+
+    @pytest.mark.parametrize("guess, answer", [
+        ("Python 2", "Python 3"),
+        ("port 8080", "port 8081"),
+        ("O(n log n)", "O(n^2 log n)"),
+        ("the list is not ordered and not mutable", "the list is ordered and mutable"),
+        ("mutable collection", "An ordered, mutable collection"),
+    ])
+    def test_close_but_wrong_answers(self, guess, answer):
+        """Test numbers must match and short answers aren't graded by their words alone"""
+        assert not AnswerGrader().grade(guess, answer).correct
+
+    def test_punctuation_only_answers(self):
+        """Test answers made only of punctuation still have to match"""
+        grader = AnswerGrader()
+        assert not grader.grade("!=", "==").correct
+        assert grader.grade(" == ", "==").correct
+
+    def test_long_answer_by_words(self):
+        """Test a long answer with a word missing is accepted by its words"""
+        answer = " ".join(f"word{first}{second}" for first in "abcdefghij" for second in "abcdefghij")
+        guess = answer.replace("wordfa ", "")
+        assert AnswerGrader().grade(guess, answer).correct
+        assert not AnswerGrader().grade(guess + " 7", answer + " 8").correct
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
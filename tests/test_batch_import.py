@@ -0,0 +1,134 @@
+"""
+Unit tests for batch_import.py using pytest
+"""
+
+import pytest
+import sys
+import os
+import json
+import shutil
+
+# Add the parent directory to the path to import batch_import
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from batch_import import find_exports, convert_export, import_many, format_summary, ImportResult, main
+from import_utils import import_quizlet_lineskip_fix
+from deck_journal import append_operation, journal_path
+
+FIXTURE = "testcards(python knowledge, quizlet export default).txt"
+
+
+@pytest.fixture
+def export_file(tmp_path):
+    """Fixture providing a copy of the bundled default Quizlet export"""
+    path = tmp_path / "python.txt"
+    shutil.copy(os.path.join(parent_dir, FIXTURE), path)
+    return str(path)
+
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+class TestFindExports:
+    """Test cases for finding the files to import"""
+
+    def test_directory_and_glob(self, tmp_path):
+        """Test a directory gives its .txt files and a pattern gives its matches, sorted"""
+        for name in ("b.txt", "a.txt", "c.json"):
+            (tmp_path / name).write_text("")
+        (tmp_path / "d.txt").mkdir()
+        expected = [str(tmp_path / "a.txt"), str(tmp_path / "b.txt")]
+        assert find_exports(str(tmp_path)) == expected
+        assert find_exports(str(tmp_path / "*.txt")) == expected
+
+
+class TestConvertExport:
+    """Test cases for converting one export"""
+
+    def test_conversion(self, export_file):
+        """Test the deck is written and the cards reported are the cards in it"""
+        result = convert_export(export_file)
+        assert result.error is None
+        deck = read_json(export_file[:-4] + ".json")
+        assert result.cards == len(deck) > 0
+        assert result.size == os.path.getsize(export_file)
+
+    def test_no_cards_keeps_deck(self, export_file):
+        """Test an export read with the wrong separator leaves the existing deck and its journal alone"""
+        deck_path = export_file[:-4] + ".json"
+        with open(deck_path, 'w', encoding='utf-8') as file:
+            json.dump({"What is Python?": "A high-level programming language"}, file)
+        append_operation(deck_path, "add", "What is a list?", "An ordered, mutable collection")
+        result = convert_export(export_file, fbsep="|||", cardsep="*****")
+        assert result.error == "no cards found"
+        assert read_json(deck_path) == {"What is Python?": "A high-level programming language"}
+        assert os.path.exists(journal_path(deck_path))
+        assert [name for name in os.listdir(os.path.dirname(deck_path)) if name.endswith(".tmp")] == []
+
+    def test_no_cards_no_deck(self, tmp_path):
+        """Test a failed conversion doesn't leave a deck behind"""
+        path = tmp_path / "notes.txt"
+        path.write_text("nothing to see here\n")
+        assert convert_export(str(path), fbsep="|||", cardsep="*****").error == "no cards found"
+        assert not (tmp_path / "notes.json").exists()
+
+
+class TestImportMany:
+    """Test cases for converting many exports in parallel"""
+
+    def test_skip_existing(self, tmp_path):
+        """Test overwrite=False leaves exports that already have a deck"""
+        (tmp_path / "old.txt").write_text("a\t1")
+        (tmp_path / "old.json").write_text('{"kept": "yes"}')
+        (tmp_path / "new.txt").write_text("b\t2")
+        results = import_many(find_exports(str(tmp_path)), workers=1, overwrite=False)
+        assert [os.path.basename(result.path) for result in results] == ["new.txt"]
+        assert read_json(tmp_path / "old.json") == {"kept": "yes"}
+        assert read_json(tmp_path / "new.json") == {"b": "2"}
+
+    def test_same_cards_as_single_import(self, tmp_path):
+        """Test a batch import loads as the same cards as a single file import of the export"""
+        (tmp_path / "cards.txt").write_text("b\t1\na\t2\nb\t3")
+        single = import_quizlet_lineskip_fix(str(tmp_path / "cards.txt"))
+        import_many([str(tmp_path / "cards.txt")], workers=1)
+        assert read_json(tmp_path / "cards.json") == single == {"a": "2", "b": "3"}
+
+    def test_main_keeps_decks(self, tmp_path, capsys):
+        """Test the command line leaves existing decks alone unless --overwrite is given"""
+        (tmp_path / "old.txt").write_text("a\t1")
+        (tmp_path / "old.json").write_text('{"kept": "yes"}')
+        assert main([str(tmp_path), "--workers", "1"]) == 0
+        assert "1 of 1 files already have a deck" in capsys.readouterr().out
+        assert read_json(tmp_path / "old.json") == {"kept": "yes"}
+        assert main([str(tmp_path), "--workers", "1", "--overwrite"]) == 0
+        assert read_json(tmp_path / "old.json") == {"a": "1"}
+
+    def test_errors_in_results(self, tmp_path):
+        """Test a file that fails is reported in its place without stopping the others"""
+        (tmp_path / "good.txt").write_text("a\t1\nb\t2\n")
+        paths = [str(tmp_path / "missing.txt"), str(tmp_path / "good.txt")]
+        missing, good = import_many(paths, workers=2)
+        assert missing.path == paths[0] and missing.error is not None
+        assert (good.cards, good.error) == (2, None)
+
+
+class TestFormatSummary:
+    """Test cases for the batch import report"""
+
+    def test_summary(self):
+        """Test each file gets a line and the totals come last"""
+        lines = format_summary([ImportResult("/decks/a.txt", 10, 1, 1000, 0.5, None),
+                                ImportResult("/decks/b.txt", 0, 0, 0, 0.1, "no cards found")]).splitlines()
+        assert lines[0] == "ok      a.txt: 10 cards, 1 skipped, 20 cards/s, 0.00 MB/s"
+        assert lines[1] == "FAILED  b.txt: no cards found"
+        assert lines[2] == "1 of 2 files imported, 10 cards, 1 skipped, 1 failed."
+        assert lines[3].startswith("The decks keep their cards in file order")
+        failed = ImportResult("/decks/b.txt", 0, 0, 0, 0.1, "no cards found")
+        assert len(format_summary([failed]).splitlines()) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,131 @@
+"""
+Unit tests for bulk_edit.py using pytest
+"""
+
+import pytest
+import sys
+import os
+import json
+from types import MappingProxyType
+
+# Add the parent directory to the path to import bulk_edit
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from bulk_edit import apply_edits, read_edits, main, BulkEditError, CardEdit
+from deck_journal import append_operation, journal_path
+from deck_store import load_deck_file
+from deck_model import Deck
+
+
+class TestApplyEdits:
+    """Test cases for applying a batch of edits"""
+
+    def test_add_update_remove(self, sample_deck):
+        """Test each kind of edit is applied in order"""
+        deck = dict(sample_deck)
+        result = apply_edits(deck, [("add", "What is a set?", "An unordered collection"),
+                                    ("update", "What is a list?", "A mutable sequence"),
+                                    ("remove", "What is a tuple?", None),
+                                    ("add", "What is a tuple?", "An immutable sequence")])
+        assert deck["What is a set?"] == "An unordered collection"
+        assert deck["What is a list?"] == "A mutable sequence"
+        assert deck["What is a tuple?"] == "An immutable sequence"
+        assert (result.added, result.updated, result.removed) == (2, 1, 1)
+
+    def test_conflict_policies(self, sample_deck):
+        """Test adding an existing front skips, overwrites or renames the new card"""
+        edit = ("add", "What is a list?", "A mutable sequence")
+        deck = dict(sample_deck)
+        assert apply_edits(deck, [edit], "skip").skipped == ["What is a list?"]
+        assert deck == sample_deck
+        assert apply_edits(deck, [edit], "overwrite").updated == 1
+        assert deck["What is a list?"] == "A mutable sequence"
+        deck = dict(sample_deck)
+        result = apply_edits(deck, [edit, edit], "rename")
+        assert result.renamed == [("What is a list?", "What is a list? (2)"),
+                                  ("What is a list?", "What is a list? (3)")]
+        assert deck["What is a list?"] == sample_deck["What is a list?"]
+        assert deck["What is a list? (3)"] == "A mutable sequence"
+
+    def test_invalid_batch_changes_nothing(self, sample_deck):
+        """Test every problem is reported and the deck is left as it was"""
+        deck = dict(sample_deck)
+        edits = [("add", "New card", "A back"), ("add", "", "No front"), ("add", "No back", ""),
+                 ("rename", "What is a list?", "x"), ("remove", "Missing card", None)]
+        with pytest.raises(BulkEditError) as error:
+            apply_edits(deck, edits)
+        assert len(error.value.problems) == 4
+        assert "edit 2" in error.value.problems[0]
+        assert "Missing card" in error.value.problems[3]
+        assert deck == sample_deck
+
+    def test_unknown_policy(self, sample_deck):
+        """Test an unknown conflict policy is rejected"""
+        with pytest.raises(ValueError):
+            apply_edits(dict(sample_deck), [], "merge")
+
+    def test_read_only_deck(self, sample_deck):
+        """Test a deck that can't be changed is rejected before anything is planned"""
+        with pytest.raises(ValueError, match="read-only"):
+            apply_edits(MappingProxyType(sample_deck), [("add", "What is a set?", "An unordered collection")])
+
+    def test_deck_model(self, sample_deck):
+        """Test a Deck keeps its reverse index through a batch"""
+        deck = Deck(sample_deck)
+        apply_edits(deck, [("remove", "What is a list?"), ("add", "What is a deque?", "An ordered, mutable collection")])
+        assert deck.fronts_for("An ordered, mutable collection") == ("What is a deque?",)
+
+    def test_written_once(self, tmp_path, sample_deck):
+        """Test the deck file holds the edits and the journal they replace is cleared"""
+        path = str(tmp_path / "deck.json")
+        append_operation(path, "add", "Journaled", "Card")
+        deck = dict(sample_deck)
+        apply_edits(deck, [CardEdit("add", "New", "Card")], deck_path=path)
+        assert json.loads(open(path, encoding="utf-8").read()) == deck
+        assert not os.path.exists(journal_path(path))
+
+
+class TestReadEdits:
+    """Test cases for reading edits from CSV and TSV files"""
+
+    def test_csv_with_header(self, tmp_path):
+        """Test the op, front and back columns are found by name"""
+        path = tmp_path / "edits.csv"
+        path.write_text('back,front,op\n"Multi\nline, with comma",first,\n,second,remove\n', encoding="utf-8")
+        edits = list(read_edits(str(path)))
+        assert [(edit.op, edit.front, edit.back) for edit in edits] == [
+            ("", "first", "Multi\nline, with comma"), ("remove", "second", "")]
+        assert edits[1].line == 4
+
+    def test_tsv_without_header(self, tmp_path):
+        """Test a .tsv file without a header is read as front and back columns"""
+        path = tmp_path / "edits.tsv"
+        path.write_text("first\tone\n\nsecond\ttwo\n", encoding="utf-8")
+        assert [(edit.front, edit.back) for edit in read_edits(str(path))] == [("first", "one"), ("second", "two")]
+
+
+class TestMain:
+    """Test cases for the command line entry point"""
+
+    def test_main(self, tmp_path, capsys):
+        """Test a new deck is created from a file of edits"""
+        edits = tmp_path / "edits.csv"
+        edits.write_text("front,back\nfirst,one\nfirst,uno\n", encoding="utf-8")
+        deck = str(tmp_path / "deck.json")
+        assert main([deck, str(edits), "--policy", "rename"]) == 0
+        assert load_deck_file(deck) == {"first": "one", "first (2)": "uno"}
+        assert "2 added" in capsys.readouterr().out
+
+    def test_main_invalid(self, tmp_path, capsys):
+        """Test an invalid batch is reported and no deck is written"""
+        edits = tmp_path / "edits.csv"
+        edits.write_text("op,front,back\nupdate,missing,card\n", encoding="utf-8")
+        deck = str(tmp_path / "deck.json")
+        assert main([deck, str(edits)]) == 1
+        assert "No changes were made" in capsys.readouterr().out
+        assert not os.path.exists(deck)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
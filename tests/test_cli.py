@@ -0,0 +1,115 @@
+"""
+Unit tests for cli.py using pytest
+"""
+
+import pytest
+import sys
+import os
+import csv
+import json
+import subprocess
+
+# Add the parent directory to the path to import cli
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from cli import main
+
+
+@pytest.fixture
+def deck_directory(tmp_path, sample_deck):
+    """Fixture providing a directory holding the sample deck as python.json"""
+    (tmp_path / "python.json").write_text(json.dumps(sample_deck), encoding='utf-8')
+    return str(tmp_path)
+
+
+def run(capsys, directory, *arguments):
+    """Run a command on the directory, returning its exit status and output"""
+    status = main(list(arguments) + ["--directory", directory])
+    return status, capsys.readouterr().out
+
+
+class TestCommands:
+    """Test cases for the subcommands"""
+
+    def test_list(self, capsys, deck_directory):
+        """Test the decks are listed with their card counts"""
+        assert run(capsys, deck_directory, "list") == (0, "python (3 cards)\n")
+
+    def test_show_search(self, capsys, deck_directory):
+        """Test show prints the matching cards"""
+        status, output = run(capsys, deck_directory, "show", "python", "--search", "programming", "--json")
+        shown = json.loads(output)
+        assert status == 0
+        assert shown["total"] == 1
+        assert shown["cards"] == [{"front": "What is Python?", "back": "A high-level programming language"}]
+
+    def test_add_and_remove(self, capsys, deck_directory):
+        """Test cards added and removed are saved to the deck"""
+        assert run(capsys, deck_directory, "add", "python", "What is a set?", "An unordered collection")[0] == 0
+        assert run(capsys, deck_directory, "remove", "python", "What is a tuple?")[0] == 0
+        with open(os.path.join(deck_directory, "python.json"), 'r', encoding='utf-8') as file:
+            saved = json.load(file)
+        assert "What is a set?" in saved and "What is a tuple?" not in saved
+
+    def test_remove_missing_suggests(self, capsys, deck_directory):
+        """Test removing a missing front fails with suggestions and no changes"""
+        status, output = run(capsys, deck_directory, "remove", "python", "What is a tuple?", "What is a lst?")
+        assert status == 1
+        assert "Did you mean: What is a list?" in output
+        with open(os.path.join(deck_directory, "python.json"), 'r', encoding='utf-8') as file:
+            assert "What is a tuple?" in json.load(file)
+
+    def test_quiz(self, capsys, tmp_path, deck_directory):
+        """Test a file of answers is graded and recorded"""
+        answers = tmp_path / "answers.txt"
+        answers.write_text("What is Python?\tA high-level programming language\nWhat is a list?\tA tuple\n",
+                           encoding='utf-8')
+        status, output = run(capsys, deck_directory, "quiz", "python", "--answers-from", str(answers), "--record")
+        assert status == 0
+        assert "Wrong: What is a list? (the answer is: An ordered, mutable collection)" in output
+        assert output.endswith("1 of 2 correct, 50.0%\n")
+        status, output = run(capsys, deck_directory, "stats", "python", "--json")
+        assert (json.loads(output)["answers"], json.loads(output)["correct"]) == (2, 1)
+
+    def test_import_keeps_decks(self, capsys, tmp_path, deck_directory, sample_deck):
+        """Test import leaves existing decks alone unless --overwrite is given"""
+        (tmp_path / "python.txt").write_text("What is a set?\tAn unordered collection", encoding='utf-8')
+        status, output = run(capsys, deck_directory, "import")
+        assert status == 0
+        assert "1 of 1 files already have a deck" in output
+        with open(os.path.join(deck_directory, "python.json"), 'r', encoding='utf-8') as file:
+            assert json.load(file) == sample_deck
+        assert run(capsys, deck_directory, "import", "--overwrite", "--workers", "1")[0] == 0
+        with open(os.path.join(deck_directory, "python.json"), 'r', encoding='utf-8') as file:
+            assert json.load(file) == {"What is a set?": "An unordered collection"}
+
+    def test_unreadable_cards_file(self, capsys, tmp_path, deck_directory):
+        """Test a CSV file the csv module can't parse is an error rather than a traceback"""
+        cards = tmp_path / "cards.csv"
+        cards.write_text("front,back\nWhat is a set?," + "x" * (csv.field_size_limit() + 1), encoding='utf-8')
+        status, output = run(capsys, deck_directory, "add", "python", "--from", str(cards))
+        assert status == 1
+        assert output.startswith("Error: field larger than field limit")
+
+    def test_missing_deck(self, capsys, deck_directory):
+        """Test an unknown deck is an error rather than a prompt"""
+        status, output = run(capsys, deck_directory, "show", "java")
+        assert status == 1
+        assert output.startswith("Error: No deck named 'java'")
+
+
+class TestMainDispatch:
+    """Test cases for running commands through main.py"""
+
+    def test_command_without_terminal(self, deck_directory):
+        """Test main.py runs a command and exits without reading standard input"""
+        output = subprocess.run([sys.executable, os.path.join(parent_dir, "main.py"), "list",
+                                 "--directory", deck_directory],
+                                stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=60)
+        assert output.returncode == 0
+        assert output.stdout == "python (3 cards)\n"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,113 @@
+"""
+Unit tests for compact_deck.py using pytest
+"""
+
+import pytest
+import sys
+import os
+import json
+
+# Add the parent directory to the path to import compact_deck
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from compact_deck import CompactDeck, write_compact_deck, json_to_compact, compact_to_json
+from display_utils import display_deck
+
+
+@pytest.fixture
+def compact_path(tmp_path, sample_deck):
+    """Fixture providing the sample deck written in the compact format"""
+    path = str(tmp_path / "deck.fcdk")
+    write_compact_deck(sample_deck, path)
+    return path
+
+
+class TestCompactDeck:
+    """Test cases for reading decks through CompactDeck"""
+
+    def test_lookup(self, compact_path, sample_deck):
+        """Test every front maps to its back"""
+        with CompactDeck(compact_path) as deck:
+            assert len(deck) == len(sample_deck)
+            for front, back in sample_deck.items():
+                assert front in deck
+                assert deck[front] == back
+
+    def test_missing_front(self, compact_path):
+        """Test unknown fronts raise KeyError like a dict"""
+        with CompactDeck(compact_path) as deck:
+            assert "Not a card" not in deck
+            assert deck.get("Not a card") is None
+            with pytest.raises(KeyError):
+                deck["Not a card"]
+
+    def test_items_sorted_by_front(self, compact_path, sample_deck):
+        """Test iteration is in sorted front order"""
+        with CompactDeck(compact_path) as deck:
+            assert list(deck) == sorted(sample_deck)
+            assert list(deck.items()) == sorted(sample_deck.items())
+            assert deck.card(0) == sorted(sample_deck.items())[0]
+
+    def test_unicode_cards(self, tmp_path):
+        """Test non-ASCII fronts are still found by the byte-wise search"""
+        cards = {"金": "Metal", "木": "Wood", "水": "Water", "é": "e acute", "z": "zed"}
+        path = str(tmp_path / "unicode.fcdk")
+        write_compact_deck(cards, path)
+        with CompactDeck(path) as deck:
+            assert dict(deck) == cards
+
+    def test_fronts_for(self, tmp_path):
+        """Test the fronts of a shared back are found"""
+        path = str(tmp_path / "shared.fcdk")
+        write_compact_deck({"list": "sequence", "tuple": "sequence", "dict": "mapping"}, path)
+        with CompactDeck(path) as deck:
+            assert deck.fronts_for("sequence") == ("list", "tuple")
+            assert deck.fronts_for("missing") == ()
+
+    def test_empty_deck(self, tmp_path):
+        """Test a deck with no cards"""
+        path = str(tmp_path / "empty.fcdk")
+        write_compact_deck({}, path)
+        with CompactDeck(path) as deck:
+            assert len(deck) == 0
+            assert not deck
+
+    def test_display_deck_accepts_compact_deck(self, compact_path, sample_deck):
+        """Test the display code works on a compact deck"""
+        with CompactDeck(compact_path) as deck:
+            assert display_deck(deck) == display_deck(dict(sorted(sample_deck.items())))
+
+    def test_not_a_compact_deck(self, tmp_path):
+        """Test other files are rejected"""
+        path = tmp_path / "deck.fcdk"
+        path.write_text('{"a": "b"}')
+        with pytest.raises(ValueError):
+            CompactDeck(str(path))
+
+    def test_truncated_file(self, compact_path):
+        """Test a file cut short is rejected"""
+        with open(compact_path, "rb") as fileobj:
+            data = fileobj.read()
+        with open(compact_path, "wb") as fileobj:
+            fileobj.write(data[:-3])
+        with pytest.raises(ValueError):
+            CompactDeck(compact_path)
+
+
+class TestConverters:
+    """Test cases for converting between JSON and compact decks"""
+
+    def test_round_trip(self, tmp_path, sample_deck):
+        """Test JSON -> compact -> JSON gives back the same deck"""
+        json_path = tmp_path / "deck.json"
+        json_path.write_text(json.dumps(sample_deck))
+        compact_path = json_to_compact(str(json_path))
+        assert compact_path == str(tmp_path / "deck.fcdk")
+        back_path = compact_to_json(compact_path, str(tmp_path / "copy.json"))
+        with open(back_path, encoding="utf-8") as fileobj:
+            assert json.load(fileobj) == sample_deck
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,102 @@
+"""
+Unit tests for deck_api.py using pytest
+"""
+
+import pytest
+import sys
+import os
+import json
+
+# Add the parent directory to the path to import deck_api
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from deck_api import list_decks, find_deck, search_cards, edit_cards, read_answers, grade_answers, record_answers, \
+    deck_stats
+
+
+@pytest.fixture
+def deck_file(tmp_path, sample_deck):
+    """Fixture providing the sample deck saved as a JSON deck"""
+    path = tmp_path / "python.json"
+    path.write_text(json.dumps(sample_deck), encoding='utf-8')
+    return str(path)
+
+
+class TestDecks:
+    """Test cases for finding and reading decks"""
+
+    def test_list_decks(self, tmp_path, deck_file):
+        """Test decks are listed with their card counts"""
+        (tmp_path / "empty.json").write_text("{}", encoding='utf-8')
+        decks = list_decks(str(tmp_path))
+        assert [(deck.name, deck.cards) for deck in decks] == [("empty", 0), ("python", 3)]
+        assert decks[1].path == deck_file
+
+    def test_find_deck(self, tmp_path, deck_file):
+        """Test a deck is found by path, file name or name"""
+        for name in (deck_file, "python.json", "python"):
+            assert find_deck(str(tmp_path), name) == deck_file
+        with pytest.raises(FileNotFoundError):
+            find_deck(str(tmp_path), "java")
+
+    def test_search_cards(self, sample_deck):
+        """Test searching returns the matching fronts"""
+        total, fronts = search_cards(sample_deck, "ordered", 10)
+        assert total == 2
+        assert set(fronts) == {"What is a list?", "What is a tuple?"}
+
+
+class TestEditCards:
+    """Test cases for editing a deck file"""
+
+    def test_edit_cards(self, deck_file):
+        """Test edits are written to the deck file"""
+        result = edit_cards(deck_file, [("add", "What is a set?", "An unordered collection"),
+                                        ("remove", "What is a tuple?", None)])
+        assert (result.added, result.removed) == (1, 1)
+        with open(deck_file, 'r', encoding='utf-8') as file:
+            saved = json.load(file)
+        assert "What is a set?" in saved and "What is a tuple?" not in saved
+
+
+class TestScriptedQuiz:
+    """Test cases for grading and recording answers read from a file"""
+
+    def test_read_answers(self):
+        """Test answer lines are split at the tab, skipping blank lines"""
+        assert read_answers(["What is Python?\tA language\n", "\n", " What is a list? \t \n"]) == \
+            [("What is Python?", "A language"), ("What is a list?", "")]
+        with pytest.raises(ValueError, match="Line 1"):
+            read_answers(["What is Python? A language"])
+
+    def test_grade_forward(self, sample_deck):
+        """Test answers to fronts are graded against the backs"""
+        result = grade_answers(sample_deck, [("What is a list?", "an ordered, mutable collection"),
+                                             ("What is a tuple?", "A list"),
+                                             ("What is a set?", "An unordered collection")])
+        assert [(answer.question, answer.correct) for answer in result.answers] == \
+            [("What is a list?", True), ("What is a tuple?", False)]
+        assert result.unknown == ["What is a set?"]
+
+    def test_grade_reverse(self, sample_deck):
+        """Test answers to backs are graded against the fronts of the cards with that back"""
+        result = grade_answers(sample_deck, [("An ordered, mutable collection", "What is a list?")], "b")
+        answer, = result.answers
+        assert (answer.front, answer.correct, answer.exact) == ("What is a list?", True, True)
+
+    def test_record_and_stats(self, deck_file, sample_deck):
+        """Test recorded answers show up in the deck's stats and schedule"""
+        assert deck_stats(deck_file)["answers"] == 0
+        result = grade_answers(sample_deck, [("What is a list?", "An ordered, mutable collection"),
+                                             ("What is a tuple?", "A list")])
+        record_answers(sample_deck, deck_file, result.answers)
+        stats = deck_stats(deck_file)
+        assert (stats["answers"], stats["correct"], stats["average_seconds"]) == (2, 1, None)
+        assert stats["hardest"][0][0] == "What is a tuple?"
+        assert len(stats["by_day"]) == 1
+        assert os.path.exists(deck_file + ".schedule")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
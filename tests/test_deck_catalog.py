@@ -0,0 +1,62 @@
+"""
+Unit tests for deck_catalog.py using pytest
+"""
+
+import pytest
+import sys
+import os
+import json
+
+# Add the parent directory to the path to import deck_catalog
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from deck_catalog import refresh_catalog
+from deck_journal import append_operation, journal_path, COMPACTING_SUFFIX
+
+
+@pytest.fixture
+def deck_directory(tmp_path, sample_deck):
+    """Fixture providing a directory holding the sample deck as python.json"""
+    (tmp_path / "python.json").write_text(json.dumps(sample_deck), encoding='utf-8')
+    return tmp_path
+
+
+class TestRefreshCatalog:
+    """Test cases for refreshing a directory's catalog"""
+
+    def test_counts_cards(self, deck_directory):
+        """Test every deck is listed with its card count, and other files are not"""
+        (deck_directory / "notes.txt").write_text("not a deck")
+        assert {name: entry["cards"] for name, entry in refresh_catalog(str(deck_directory)).items()} == \
+            {"python.json": 3}
+
+    def test_not_a_deck(self, deck_directory):
+        """Test JSON files that aren't decks are listed as unreadable rather than breaking the catalog"""
+        (deck_directory / "number.json").write_text("5")
+        (deck_directory / "list.json").write_text("[1, 2]")
+        append_operation(str(deck_directory / "list.json"), "add", "a", "1")
+        catalog = refresh_catalog(str(deck_directory))
+        assert (catalog["number.json"]["cards"], catalog["list.json"]["cards"]) == (None, None)
+        assert catalog["python.json"]["cards"] == 3
+
+    def test_journal_in_deck_name(self, deck_directory):
+        """Test a deck with .journal in its name is a deck, not a journal"""
+        (deck_directory / "my.journal.json").write_text('{"a": "1"}', encoding='utf-8')
+        assert refresh_catalog(str(deck_directory))["my.journal.json"]["cards"] == 1
+
+    def test_journal_changes_signature(self, deck_directory):
+        """Test journals, including ones moved aside for compaction, are part of their deck's signature"""
+        deck_path = str(deck_directory / "python.json")
+        before = refresh_catalog(str(deck_directory))["python.json"]["signature"]
+        append_operation(deck_path, "add", "What is a set?", "An unordered collection")
+        os.rename(journal_path(deck_path), journal_path(deck_path) + COMPACTING_SUFFIX + "1")
+        append_operation(deck_path, "remove", "What is a list?")
+        catalog = refresh_catalog(str(deck_directory))
+        assert list(catalog) == ["python.json"]
+        assert len(catalog["python.json"]["signature"]) == len(before) + 4
+        assert catalog["python.json"]["cards"] == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,159 @@
+"""
+Unit tests for deck_journal.py using pytest
+"""
+
+import pytest
+import sys
+import os
+import json
+from types import MappingProxyType
+
+# Add the parent directory to the path to import deck_journal
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+import deck_journal
+from deck_journal import append_operation, apply_operation, replay_journal, needs_compaction, rotate_journal, \
+    finish_compaction, clear_journal, compacting_journals, journal_path
+from app_controller import checkpoint_deck, shutdown_deck_writer
+
+
+@pytest.fixture
+def deck_file(tmp_path, sample_deck):
+    """Fixture providing the sample deck saved as a JSON deck"""
+    path = tmp_path / "python.json"
+    path.write_text(json.dumps(sample_deck), encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture
+def small_journals(monkeypatch):
+    """Fixture making journals big enough to compact after a few bytes"""
+    monkeypatch.setattr(deck_journal, "COMPACT_MIN_BYTES", 10)
+
+
+class TestJournal:
+    """Test cases for appending and replaying edits"""
+
+    def test_replay(self, deck_file, sample_deck):
+        """Test journaled edits are applied in order on top of the deck"""
+        append_operation(deck_file, "add", "What is a set?", "An unordered collection")
+        append_operation(deck_file, "remove", "What is a tuple?")
+        append_operation(deck_file, "add", "What is a set?", "A collection of unique items")
+        deck = dict(sample_deck)
+        assert replay_journal(deck, deck_file) == 3
+        assert deck["What is a set?"] == "A collection of unique items"
+        assert "What is a tuple?" not in deck
+
+    def test_torn_line(self, deck_file):
+        """Test a line cut short by a crash is skipped and the next edit starts on a fresh line"""
+        with open(journal_path(deck_file), 'w', encoding='utf-8') as file:
+            file.write('["add", "a", "1"]\n["add", "b", "')
+        append_operation(deck_file, "add", "c", "3")
+        deck = {}
+        assert replay_journal(deck, deck_file) == 2
+        assert deck == {"a": "1", "c": "3"}
+
+    def test_unknown_operation(self):
+        """Test an entry with an unknown operation is an error"""
+        with pytest.raises(ValueError, match="Unknown journal operation"):
+            apply_operation({}, ["rename", "a", "b"])
+
+    def test_no_journal(self, deck_file, sample_deck):
+        """Test a deck without a journal is left as it is"""
+        deck = dict(sample_deck)
+        assert replay_journal(deck, deck_file) == 0
+        assert deck == sample_deck
+
+
+class TestCompaction:
+    """Test cases for deciding when to compact and moving journals aside"""
+
+    def test_needs_compaction(self, deck_file, small_journals, monkeypatch):
+        """Test a journal needs compacting once it is bigger than both the minimum and its share of the deck"""
+        assert not needs_compaction(deck_file)
+        deck_size = os.path.getsize(deck_file)
+        with open(journal_path(deck_file), 'w', encoding='utf-8') as file:
+            file.write("x" * int(deck_size * deck_journal.COMPACT_RATIO))
+        assert not needs_compaction(deck_file)
+        with open(journal_path(deck_file), 'a', encoding='utf-8') as file:
+            file.write("x")
+        assert needs_compaction(deck_file)
+        monkeypatch.setattr(deck_journal, "COMPACT_MIN_BYTES", deck_size)
+        assert not needs_compaction(deck_file)
+
+    def test_needs_compaction_without_deck(self, tmp_path, small_journals):
+        """Test a journal whose deck file doesn't exist yet only has to pass the minimum"""
+        deck_path = str(tmp_path / "new.json")
+        append_operation(deck_path, "add", "What is a set?", "An unordered collection")
+        assert needs_compaction(deck_path)
+
+    def test_rotate_and_finish(self, deck_file):
+        """Test a rotated journal is still replayed alongside new edits until the compaction finishes"""
+        append_operation(deck_file, "add", "a", "1")
+        moved = rotate_journal(deck_file)
+        assert compacting_journals(deck_file) == [moved]
+        assert not os.path.exists(journal_path(deck_file))
+        append_operation(deck_file, "add", "b", "2")
+        deck = {}
+        assert replay_journal(deck, deck_file) == 2
+        assert deck == {"a": "1", "b": "2"}
+        finish_compaction(moved)
+        assert compacting_journals(deck_file) == []
+        assert os.path.exists(journal_path(deck_file))
+
+    def test_rotate_without_journal(self, deck_file):
+        """Test rotating a deck without a journal does nothing"""
+        assert rotate_journal(deck_file) is None
+        finish_compaction(None)
+        assert compacting_journals(deck_file) == []
+
+    def test_clear_journal(self, deck_file):
+        """Test clearing removes the journal and the ones moved aside"""
+        append_operation(deck_file, "add", "a", "1")
+        rotate_journal(deck_file)
+        append_operation(deck_file, "add", "b", "2")
+        clear_journal(deck_file)
+        assert os.listdir(os.path.dirname(deck_file)) == ["python.json"]
+
+
+class TestCheckpointDeck:
+    """Test cases for merging a deck's journal back into its file when leaving a menu"""
+
+    def test_small_journal_is_kept(self, deck_file, sample_deck):
+        """Test a small journal is left for later instead of rewriting the deck"""
+        deck = dict(sample_deck)
+        deck["What is a set?"] = "An unordered collection"
+        append_operation(deck_file, "add", "What is a set?", "An unordered collection")
+        assert checkpoint_deck(deck, deck_file)
+        shutdown_deck_writer()
+        with open(deck_file, 'r', encoding='utf-8') as file:
+            assert json.load(file) == sample_deck
+        assert os.path.exists(journal_path(deck_file))
+
+    def test_big_journal_is_compacted(self, deck_file, sample_deck, small_journals):
+        """Test a big journal is written into the deck file and then removed"""
+        deck = dict(sample_deck)
+        for index in range(20):
+            deck[f"card {index}"] = str(index)
+            append_operation(deck_file, "add", f"card {index}", str(index))
+        assert checkpoint_deck(deck, deck_file)
+        shutdown_deck_writer()
+        with open(deck_file, 'r', encoding='utf-8') as file:
+            assert json.load(file) == deck
+        assert not os.path.exists(journal_path(deck_file))
+        assert compacting_journals(deck_file) == []
+
+    def test_read_only_deck(self, deck_file, sample_deck, small_journals):
+        """Test a read-only deck is never rewritten"""
+        for index in range(20):
+            append_operation(deck_file, "add", f"card {index}", str(index))
+        assert checkpoint_deck(MappingProxyType(sample_deck), deck_file)
+        shutdown_deck_writer()
+        with open(deck_file, 'r', encoding='utf-8') as file:
+            assert json.load(file) == sample_deck
+        assert os.path.exists(journal_path(deck_file))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,130 @@
+"""
+Unit tests for deck_merge.py using pytest
+"""
+
+import pytest
+import sys
+import os
+import json
+
+# Add the parent directory to the path to import deck_merge
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from deck_merge import NearDuplicateFinder, find_decks, merge_decks, normalize_side, main, MERGED_FILE, \
+    REPORT_FILE
+from search_index import trigrams
+
+
+def write_decks(directory, decks):
+    """Write each deck as NAME.json in directory and return their paths in order"""
+    paths = []
+    for name, deck in decks.items():
+        path = directory / f"{name}.json"
+        path.write_text(json.dumps(deck), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+class TestMergeDecks:
+    """Test cases for merging decks"""
+
+    def test_exact_duplicates(self, tmp_path, sample_deck):
+        """Test a card found in several decks, even spaced differently, is kept once"""
+        respaced = {f" {front}  ": back.replace(" ", "\n") for front, back in sample_deck.items()}
+        paths = write_decks(tmp_path, {"a": sample_deck, "b": respaced})
+        merged, report = merge_decks(paths)
+        assert merged == sample_deck
+        assert report["cards"] == 6
+        assert report["exact_duplicates"] == 3
+        assert report["conflicts"] == []
+
+    def test_conflicts(self, tmp_path):
+        """Test the first deck's back wins a conflict and the others are reported"""
+        paths = write_decks(tmp_path, {"a": {"list": "ordered collection"},
+                                       "b": {"list": "mutable sequence"},
+                                       "c": {"list": "a Python type"}})
+        merged, report = merge_decks(paths)
+        assert merged == {"list": "ordered collection"}
+        conflict, = report["conflicts"]
+        assert conflict["kept"] == {"deck": "a.json", "front": "list", "back": "ordered collection"}
+        assert [card["deck"] for card in conflict["dropped"]] == ["b.json", "c.json"]
+
+    def test_case_and_punctuation_kept(self, tmp_path):
+        """Test cards only differing in case or punctuation are not merged"""
+        deck = {"%d": "signed integer", "%D": "signed integer", "\\d": "any digit"}
+        merged, report = merge_decks(write_decks(tmp_path, {"a": deck}))
+        assert merged == deck
+        assert report["exact_duplicates"] == 0
+
+    def test_near_duplicates(self, tmp_path):
+        """Test a card with a small change is reported as a near duplicate but kept"""
+        paths = write_decks(tmp_path, {
+            "a": {"What does the len function return?": "The number of items in a container"},
+            "b": {"What does the len function return": "The number of items in a container.",
+                  "What is a dict?": "A mapping of keys to values"}})
+        merged, report = merge_decks(paths)
+        assert len(merged) == 3
+        near, = report["near_duplicates"]
+        assert near["card"]["deck"] == "b.json"
+        assert near["similar_to"]["deck"] == "a.json"
+        assert merge_decks(paths, threshold=None)[1]["near_duplicates"] == []
+
+    def test_unreadable_deck_skipped(self, tmp_path, sample_deck):
+        """Test files that aren't decks are reported and the rest are still merged"""
+        paths = write_decks(tmp_path, {"a": sample_deck, "b": ["not", "a", "deck"]})
+        merged, report = merge_decks(paths)
+        assert merged == sample_deck
+        assert [skipped["deck"] for skipped in report["skipped_decks"]] == ["b.json"]
+
+
+class TestNearDuplicateFinder:
+    """Test cases for MinHash signatures and LSH buckets"""
+
+    def test_identical_cards(self):
+        """Test identical cards have identical signatures"""
+        finder = NearDuplicateFinder()
+        assert finder.add(trigrams("an ordered mutable collection")) is None
+        assert finder.add(trigrams("an ordered mutable collection")) == (0, 1.0)
+
+    def test_different_cards(self):
+        """Test unrelated cards are not matched"""
+        finder = NearDuplicateFinder()
+        finder.add(trigrams("an ordered mutable collection"))
+        assert finder.add(trigrams("matches any whitespace character")) is None
+        assert finder.similarity(0, 1) < 0.5
+
+    def test_empty_card(self):
+        """Test a card with nothing to hash gets a signature"""
+        assert NearDuplicateFinder().signature(set()) == [0] * 32
+
+
+class TestCommandLine:
+    """Test cases for finding decks and the command line entry point"""
+
+    def test_normalize_side(self):
+        """Test spacing and Unicode forms are evened out but case is not"""
+        assert normalize_side("  Ｐython\n list ") == "Python list"
+        assert normalize_side("%D") != normalize_side("%d")
+
+    def test_find_decks_excludes_outputs(self, tmp_path, sample_deck):
+        """Test the merged deck and report of an earlier run are not merged again"""
+        paths = write_decks(tmp_path, {"a": sample_deck, "merged_deck": sample_deck})
+        assert find_decks(str(tmp_path), exclude=[paths[1]]) == [paths[0]]
+
+    def test_main(self, tmp_path, sample_deck, capsys):
+        """Test the merged deck and report are written"""
+        write_decks(tmp_path, {"a": sample_deck, "b": sample_deck})
+        assert main([str(tmp_path)]) == 0
+        assert json.loads((tmp_path / MERGED_FILE).read_text(encoding="utf-8")) == sample_deck
+        assert json.loads((tmp_path / REPORT_FILE).read_text(encoding="utf-8"))["exact_duplicates"] == 3
+        assert main([str(tmp_path)]) == 0
+        assert "2 decks" in capsys.readouterr().out
+
+    def test_main_missing_directory(self, tmp_path):
+        """Test a directory that doesn't exist is an error"""
+        assert main([str(tmp_path / "missing")]) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
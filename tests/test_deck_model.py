@@ -0,0 +1,67 @@
+"""
+Unit tests for deck_model.py using pytest
+"""
+
+import pytest
+import sys
+import os
+import json
+
+# Add the parent directory to the path to import deck_model
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from deck_model import Deck, reverse_index
+from deck_store import write_deck_file
+
+
+class TestDeck:
+    """Test cases for the Deck class"""
+
+    def test_behaves_like_dict(self, sample_deck):
+        """Test a Deck holds the same cards as the dictionary it was made from"""
+        deck = Deck(sample_deck)
+        assert dict(deck) == sample_deck
+        assert len(deck) == len(sample_deck)
+        assert list(deck) == list(sample_deck)
+
+    def test_shared_backs(self):
+        """Test every front of a shared back is found"""
+        deck = Deck({"list": "sequence", "tuple": "sequence", "dict": "mapping"})
+        assert deck.fronts_for("sequence") == ("list", "tuple")
+        assert deck.fronts_for("missing") == ()
+        assert sorted(deck.backs()) == ["mapping", "sequence"]
+
+    def test_index_follows_edits(self):
+        """Test adding, changing and removing cards keeps the reverse index right"""
+        deck = Deck({"list": "sequence", "tuple": "sequence"})
+        deck["list"] = "mutable sequence"
+        assert deck.fronts_for("sequence") == ("tuple",)
+        assert deck.fronts_for("mutable sequence") == ("list",)
+        del deck["tuple"]
+        deck.pop("list")
+        assert deck.fronts_for("sequence") == ()
+        assert list(deck.backs()) == []
+
+    def test_written_as_json(self, tmp_path, sample_deck):
+        """Test a Deck is saved like a plain dictionary"""
+        path = tmp_path / "deck.json"
+        write_deck_file(Deck(sample_deck), str(path))
+        assert json.loads(path.read_text(encoding="utf-8")) == sample_deck
+
+
+class TestReverseIndex:
+    """Test cases for the reverse_index function"""
+
+    def test_deck_used_as_is(self):
+        """Test a Deck is its own reverse index"""
+        deck = Deck({"a": "1"})
+        assert reverse_index(deck) is deck
+
+    def test_plain_dict_indexed(self):
+        """Test a plain dictionary gets an index built"""
+        assert reverse_index({"a": "1", "b": "1"}).fronts_for("1") == ("a", "b")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,133 @@
+"""
+Unit tests for deck_store.py using pytest
+"""
+
+import pytest
+import sys
+import os
+import json
+import threading
+
+# Add the parent directory to the path to import deck_store
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from deck_store import atomic_open, write_deck_file, load_deck_file, BackgroundDeckWriter
+from deck_journal import append_operation
+from deck_model import Deck
+from compact_deck import CompactDeck, write_compact_deck
+
+
+class TestAtomicOpen:
+    """Test cases for the atomic_open context manager"""
+
+    def test_replaces_file(self, tmp_path):
+        """Test the new content replaces the old file"""
+        path = tmp_path / "deck.json"
+        path.write_text("old")
+        with atomic_open(str(path)) as fileobj:
+            fileobj.write("new")
+        assert path.read_text() == "new"
+        assert os.listdir(tmp_path) == ["deck.json"]
+
+    def test_error_keeps_old_file(self, tmp_path):
+        """Test a failed write leaves the old file and no temporary file"""
+        path = tmp_path / "deck.json"
+        path.write_text("old")
+        with pytest.raises(RuntimeError):
+            with atomic_open(str(path)) as fileobj:
+                fileobj.write("half a deck")
+                raise RuntimeError("crash")
+        assert path.read_text() == "old"
+        assert os.listdir(tmp_path) == ["deck.json"]
+
+    def test_write_deck_file(self, tmp_path, sample_deck):
+        """Test decks are written sorted and indented"""
+        path = tmp_path / "deck.json"
+        write_deck_file(sample_deck, str(path))
+        assert path.read_text(encoding="utf-8") == json.dumps(sample_deck, sort_keys=True, indent=4)
+
+
+class TestLoadDeckFile:
+    """Test cases for reading deck files"""
+
+    def test_replays_journal(self, tmp_path, sample_deck):
+        """Test a JSON deck is read as a Deck with its journaled edits applied"""
+        path = str(tmp_path / "deck.json")
+        write_deck_file(sample_deck, path)
+        append_operation(path, "add", "What is a set?", "An unordered collection")
+        deck = load_deck_file(path)
+        assert isinstance(deck, Deck)
+        assert deck == dict(sample_deck, **{"What is a set?": "An unordered collection"})
+
+    def test_compact_deck(self, tmp_path, sample_deck):
+        """Test a .fcdk deck is opened as a compact deck"""
+        path = str(tmp_path / "deck.fcdk")
+        write_compact_deck(sample_deck, path)
+        deck = load_deck_file(path)
+        assert isinstance(deck, CompactDeck)
+        assert dict(deck.items()) == sample_deck
+        deck.close()
+
+    def test_missing_file(self, tmp_path):
+        """Test a missing deck is an error, or an empty deck with missing_ok"""
+        path = str(tmp_path / "deck.json")
+        with pytest.raises(FileNotFoundError):
+            load_deck_file(path)
+        assert load_deck_file(path, missing_ok=True) == {}
+
+    def test_not_a_deck(self, tmp_path):
+        """Test JSON that isn't a deck of text cards is rejected"""
+        path = tmp_path / "deck.json"
+        for text in ('["a", "b"]', '{"a": 1}', '{"a": '):
+            path.write_text(text)
+            with pytest.raises(ValueError):
+                load_deck_file(str(path))
+
+
+class TestBackgroundDeckWriter:
+    """Test cases for the BackgroundDeckWriter class"""
+
+    def test_writes_snapshot(self, tmp_path, sample_deck):
+        """Test the deck as it was when submitted is written, even if it changes afterwards"""
+        path = str(tmp_path / "deck.json")
+        writer = BackgroundDeckWriter()
+        writer.submit(sample_deck, path)
+        sample_deck["Added later"] = "Not written"
+        writer.close()
+        with open(path) as fileobj:
+            assert "Added later" not in json.load(fileobj)
+
+    def test_coalesces_queued_writes(self, tmp_path):
+        """Test a deck submitted twice before it is written is only written once, newest first"""
+        started = threading.Event()
+        release = threading.Event()
+        writes = []
+
+        def slow_write(deck, path):
+            started.set()
+            release.wait()
+            writes.append((path, deck))
+
+        writer = BackgroundDeckWriter(write=slow_write)
+        done = []
+        writer.submit({"a": "1"}, "blocker")
+        started.wait()
+        writer.submit({"b": "1"}, "deck", on_done=lambda: done.append(1))
+        writer.submit({"b": "2"}, "deck", on_done=lambda: done.append(2))
+        release.set()
+        writer.flush()
+        writer.close()
+        assert writes == [("blocker", {"a": "1"}), ("deck", {"b": "2"})]
+        assert done == [1, 2]
+
+    def test_submit_after_close(self):
+        """Test a closed writer refuses new decks"""
+        writer = BackgroundDeckWriter()
+        writer.close()
+        with pytest.raises(RuntimeError):
+            writer.submit({}, "deck.json")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
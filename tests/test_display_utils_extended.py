@@ -5,11 +5,13 @@ Extended unit tests for display_utils.py - additional edge cases and scenarios
 import pytest
 import sys
 import os
+from itertools import islice
 
 # Add the parent directory to the path to import display_utils
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../inputs/PythonFlashCards'))
 
-from display_utils import grid_builder, out_put_builder, card_displayer, display_deck
+from display_utils import grid_builder, out_put_builder, card_displayer, display_deck, iter_display_deck, DeckPager, \
+    RenderCache, clear_render_cache, render_cache_info
 
 
 class TestGridBuilderExtended:
@@ -74,6 +76,20 @@ class TestGridBuilderExtended:
             assert len(line) <= 20
 
 
+    def test_exact_multiple_of_rowlen(self):
+        """Test a line exactly twice rowlen long, whose last row is repeated"""
+        test_str = "x" * 20
+        result = grid_builder(test_str, rowlen=10)
+        assert result == ["x" * 10 + "-", "x" * 10, "x" * 10]
+
+    def test_many_long_lines(self):
+        """Test wrapping a card with thousands of long lines"""
+        line = "word " * 40
+        result = grid_builder("\n".join([line] * 5000), rowlen=80)
+        assert len(result) == 5000 * 3
+        assert all(len(row) <= 81 for row in result)
+
+
 class TestOutputBuilderExtended:
     """Extended test cases for out_put_builder function"""
     
@@ -105,6 +121,12 @@ class TestOutputBuilderExtended:
         assert "| B |" in result
         assert "| C |" in result
     
+    def test_repeated_rows_keep_their_place(self):
+        """Test identical rows between different rows are each boxed in order"""
+        grid = ["Same", "Other", "Same"]
+        result = out_put_builder(grid)
+        assert result.split("\n")[3:6] == ["| Same  |", "| Other |", "| Same  |"]
+
     def test_grid_with_max_length_difference(self):
         """Test grid where one line is much longer than others"""
         grid = ["a", "b" * 100, "c"]
@@ -171,6 +193,95 @@ class TestIntegrationExtended:
         assert "Answer 99" in result
 
 
+class TestIterDisplayDeck:
+    """Test cases for the iter_display_deck generator and DeckPager class"""
+
+    def test_joins_to_display_deck(self, sample_deck):
+        """Test the streamed pieces make up the full deck display"""
+        pieces = list(iter_display_deck(sample_deck))
+        assert len(pieces) == len(sample_deck) + 1
+        assert "".join(pieces) == display_deck(sample_deck)
+
+    def test_lazy(self):
+        """Test the first card is rendered without reading the rest of the deck"""
+        def cards():
+            yield "Q1", "A1"
+            raise AssertionError("read too far")
+
+        class LazyDeck(dict):
+            def items(self):
+                return cards()
+
+        first_cards = list(islice(iter_display_deck(LazyDeck()), 2))
+        assert "Q1" in first_cards[1]
+
+    def test_pages(self):
+        """Test a deck is split into pages of page_size cards"""
+        deck = {f"Question {i}": f"Answer {i}" for i in range(25)}
+        pager = DeckPager(deck, page_size=10)
+        assert pager.page_count == 3
+        assert pager.page(0)[0] == ("Question 0", "Answer 0")
+        assert len(pager.page(2)) == 5
+        assert "Page 3 of 3" in pager.render_page(2)
+
+    def test_empty_deck_has_one_page(self):
+        """Test an empty deck still has a page to show"""
+        pager = DeckPager({}, page_size=10)
+        assert pager.page_count == 1
+        assert pager.page(0) == []
+
+    def test_search_wraps_around(self):
+        """Test searching continues from the start of the deck"""
+        deck = {f"Question {i}": f"Answer {i}" for i in range(25)}
+        pager = DeckPager(deck, page_size=10)
+        assert pager.search("answer 21") == 2
+        assert pager.search("QUESTION 3", after_page=1) == 0
+        assert pager.search("missing") is None
+
+
+class TestRenderCache:
+    """Test cases for the card rendering cache"""
+
+    def test_repeated_card_is_a_hit(self):
+        """Test rendering the same card twice uses the cache"""
+        clear_render_cache()
+        first = card_displayer("Cached card")
+        assert card_displayer("Cached card") is first
+        info = render_cache_info()
+        assert info["hits"] == 1
+        assert info["misses"] == 1
+
+    def test_rowlen_change_invalidates(self):
+        """Test a new row length drops the cards cached for the old one"""
+        clear_render_cache()
+        card_displayer("Cached card")
+        narrow = card_displayer("Cached card", rowlen=5)
+        assert narrow == out_put_builder(grid_builder("Cached card", rowlen=5))
+        assert render_cache_info()["entries"] == 1
+        assert render_cache_info()["rowlen"] == 5
+
+    def test_least_recently_used_evicted(self):
+        """Test the oldest unused card is dropped when the cache is full"""
+        cache = RenderCache(max_entries=2)
+        cache.put("a", 80, "A")
+        cache.put("b", 80, "B")
+        cache.get("a", 80)
+        cache.put("c", 80, "C")
+        assert cache.get("b", 80) is None
+        assert cache.get("a", 80) == "A"
+        assert cache.get("c", 80) == "C"
+
+    def test_size_limit(self):
+        """Test the cache stays within its character budget"""
+        cache = RenderCache(max_chars=10)
+        cache.put("aaaa", 80, "AAAA")
+        cache.put("bb", 80, "BB")
+        assert cache.chars <= 10
+        assert cache.get("aaaa", 80) is None
+        cache.put("x" * 20, 80, "X")
+        assert cache.get("x" * 20, 80) is None
+
+
 class TestErrorHandling:
     """Test error handling and boundary conditions"""
     
@@ -0,0 +1,72 @@
+"""
+Unit tests for distractors.py using pytest
+"""
+
+import pytest
+import sys
+import os
+import random
+
+# Add the parent directory to the path to import distractors
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from distractors import DistractorSampler
+
+
+class TestDistractorSampler:
+    """Test cases for the DistractorSampler class"""
+
+    def test_never_returns_correct_answer(self, sample_deck):
+        """Test the right answer is never drawn as a distractor"""
+        sampler = DistractorSampler(sample_deck.values(), rng=random.Random(0))
+        for _ in range(100):
+            distractors = sampler.sample("An ordered, mutable collection", 2)
+            assert len(distractors) == 2
+            assert "An ordered, mutable collection" not in distractors
+
+    def test_duplicate_answers_kept_once(self):
+        """Test a deck whose cards share backs still gives distinct choices"""
+        sampler = DistractorSampler(["same", "same", "same", "other"])
+        assert sampler.sample("other", 3) == ["same"]
+
+    def test_small_deck(self):
+        """Test asking for more distractors than the deck has"""
+        sampler = DistractorSampler(["a", "b"])
+        choices, answer = sampler.choices("a", 4)
+        assert sorted(choices) == ["a", "b"]
+        assert choices[answer] == "a"
+
+    def test_configurable_count(self):
+        """Test any number of choices can be drawn"""
+        sampler = DistractorSampler([str(i) for i in range(100)], rng=random.Random(1))
+        choices, answer = sampler.choices("42", 7)
+        assert len(choices) == len(set(choices)) == 7
+        assert choices[answer] == "42"
+
+    def test_answer_not_in_deck(self):
+        """Test an answer that isn't one of the deck's answers"""
+        sampler = DistractorSampler(["a", "b", "c"])
+        assert sorted(sampler.sample("z", 3)) == ["a", "b", "c"]
+
+    def test_similar_answers_first(self):
+        """Test neighbours from a similarity index are used before random answers"""
+        class Neighbours:
+            def nearest(self, answer, k=None):
+                return ["b", "gone", "a", "c"]
+
+        sampler = DistractorSampler(["a", "b", "c", "d", "e"], rng=random.Random(2), similar=Neighbours())
+        assert sampler.sample("a", 2) == ["b", "c"]
+        distractors = sampler.sample("a", 4)
+        assert distractors[:2] == ["b", "c"]
+        assert sorted(distractors[2:]) == ["d", "e"]
+
+    def test_other_right_answers_excluded(self):
+        """Test answers that are also right are never offered as wrong choices"""
+        sampler = DistractorSampler(["list", "bytearray", "tuple", "dict"], rng=random.Random(3))
+        for _ in range(50):
+            assert sorted(sampler.sample("list", 3, exclude=("list", "bytearray"))) == ["dict", "tuple"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,190 @@
+"""
+Unit tests for import_utils.py using pytest
+"""
+
+import pytest
+import sys
+import os
+import io
+import json
+
+# Add the parent directory to the path to import import_utils
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from import_utils import split_quizlet_lines, split_on_separator, parse_card, iter_quizlet_cards, \
+    JsonObjectWriter, import_quizlet_streaming, import_quizlet_lineskip_fix
+
+
+def write_export(tmp_path, text, name="export.txt"):
+    """Write a fake Quizlet export and return its path as a string"""
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+class TestSplitQuizletLines:
+    """Test cases for the split_quizlet_lines generator"""
+
+    def test_one_card_per_line(self):
+        """Test lines that each hold a full card"""
+        result = list(split_quizlet_lines(["a\tb\n", "c\td"]))
+        assert result == ["a\tb", "c\td"]
+
+    def test_continuation_lines_are_folded(self):
+        """Test lines without a tab are joined to the card before them"""
+        result = list(split_quizlet_lines(["a\tline 1\n", "line 2\n", "\n", "line 3\n", "c\td"]))
+        assert result == ["a\tline 1\nline 2\n\nline 3", "c\td"]
+
+    def test_trailing_linebreak_kept_on_last_card(self):
+        """Test a file ending in a linebreak, which the original importer kept on the last back"""
+        result = list(split_quizlet_lines(["a\tb\n", "c\td\n"]))
+        assert result == ["a\tb", "c\td\n"]
+
+    def test_lines_before_first_card(self):
+        """Test lines before the first card are passed through on their own"""
+        result = list(split_quizlet_lines(["header\n", "a\tb"]))
+        assert result == ["header", "a\tb"]
+
+    def test_empty_input(self):
+        """Test an empty file"""
+        assert list(split_quizlet_lines([])) == [""]
+
+
+class TestSplitOnSeparator:
+    """Test cases for the split_on_separator generator"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 1024])
+    def test_matches_str_split(self, chunk_size):
+        """Test the chunked split gives the same pieces as str.split for any chunk size"""
+        text = "a&&b*****c&&d****e*****f&&g*****"
+        result = list(split_on_separator(io.StringIO(text), "*****", chunk_size))
+        assert result == text.split("*****")
+
+    def test_separator_across_chunk_boundary(self):
+        """Test a separator split over two reads is still found"""
+        result = list(split_on_separator(io.StringIO("ab||cd||ef"), "||", chunk_size=3))
+        assert result == ["ab", "cd", "ef"]
+
+    def test_empty_file(self):
+        """Test an empty file gives one empty piece, like str.split"""
+        assert list(split_on_separator(io.StringIO(""), "||")) == [""]
+
+
+class TestParseCard:
+    """Test cases for the parse_card function"""
+
+    def test_simple_card(self):
+        """Test a card with one separator"""
+        assert parse_card("front\tback") == ("front", "back")
+
+    def test_empty_card(self):
+        """Test empty cards are dropped silently"""
+        skipped = []
+        assert parse_card("", on_skip=skipped.append) is None
+        assert parse_card("\n", on_skip=skipped.append) is None
+        assert skipped == []
+
+    def test_one_extra_separator(self):
+        """Test the last of two separators becomes a linebreak"""
+        assert parse_card("a\tb\tc") == ("a", "b\nc")
+
+    def test_too_many_separators_skipped(self):
+        """Test cards that still don't split in two are handed to on_skip"""
+        skipped = []
+        assert parse_card("a\tb\tc\td", on_skip=skipped.append) is None
+        assert skipped == [["a", "b", "c\nd"]]
+
+    def test_default_skip_message(self, capsys):
+        """Test the default skip handler prints the dropped item"""
+        parse_card("no separator")
+        assert "Item: '['no separator']' was not included in the deck." in capsys.readouterr().out
+
+
+class TestIterQuizletCards:
+    """Test cases for the iter_quizlet_cards generator"""
+
+    def test_default_export(self, tmp_path):
+        """Test a default tab/linebreak export"""
+        path = write_export(tmp_path, "a\tb\nmore b\nc\td\n")
+        assert list(iter_quizlet_cards(path)) == [("a", "b\nmore b"), ("c", "d\n")]
+
+    def test_custom_separators(self, tmp_path):
+        """Test an export with custom separators"""
+        path = write_export(tmp_path, "a&&&b\nstill b*****c&&&d")
+        result = list(iter_quizlet_cards(path, fbsep="&&&", cardsep="*****"))
+        assert result == [("a", "b\nstill b"), ("c", "d")]
+
+    def test_many_continuation_lines(self, tmp_path):
+        """Test a large export with multi-line backs is read in one pass"""
+        lines = []
+        for i in range(20000):
+            lines.append(f"front {i}\tback {i}\n")
+            lines.append("continued\n")
+        path = write_export(tmp_path, "".join(lines))
+        cards = list(iter_quizlet_cards(path))
+        assert len(cards) == 20000
+        assert cards[0] == ("front 0", "back 0\ncontinued")
+
+
+class TestJsonObjectWriter:
+    """Test cases for the JsonObjectWriter class"""
+
+    def test_same_layout_as_json_dumps(self):
+        """Test the streamed object matches json.dumps with indent=4"""
+        deck = {"a": "1", "é\"quoted\"": "line\nbreak"}
+        out = io.StringIO()
+        with JsonObjectWriter(out) as writer:
+            for key, value in deck.items():
+                writer.write(key, value)
+        assert out.getvalue() == json.dumps(deck, indent=4)
+        assert writer.count == 2
+
+    def test_empty_object(self):
+        """Test an object with no keys"""
+        out = io.StringIO()
+        with JsonObjectWriter(out):
+            pass
+        assert out.getvalue() == "{}"
+
+
+class TestImportQuizletStreaming:
+    """Test cases for the import_quizlet_streaming function"""
+
+    def test_small_chunks(self, tmp_path):
+        """Test converting a custom export with chunks smaller than a card"""
+        path = write_export(tmp_path, "a&&&1*****b&&&2*****bad*****")
+        count = import_quizlet_streaming(path, fbsep="&&&", cardsep="*****", chunk_size=4, on_skip=None)
+        assert count == 2
+        with open(tmp_path / "export.json") as fileobj:
+            assert json.load(fileobj) == {"a": "1", "b": "2"}
+
+    def test_loads_like_lineskip_fix(self, tmp_path):
+        """Test the streamed deck loads to the same dictionary as the in-memory importer"""
+        path = write_export(tmp_path, "a&&&1*****b&&&2*****a&&&3")
+        expected = import_quizlet_lineskip_fix(path, fbsep="&&&", cardsep="*****")
+        count = import_quizlet_streaming(path, fbsep="&&&", cardsep="*****", chunk_size=3)
+        with open(tmp_path / "export.json") as fileobj:
+            assert json.load(fileobj) == expected
+        assert count == len(expected)
+
+
+class TestImportQuizletLineskipFix:
+    """Test cases for the import_quizlet_lineskip_fix function"""
+
+    def test_writes_json_next_to_file(self, tmp_path):
+        """Test the converted deck is returned and written to a .json file"""
+        path = write_export(tmp_path, "b\t2\na\t1")
+        result = import_quizlet_lineskip_fix(path)
+        assert result == {"b": "2", "a": "1"}
+        with open(tmp_path / "export.json") as fileobj:
+            assert json.load(fileobj) == {"a": "1", "b": "2"}
+
+    def test_duplicate_fronts_keep_last_back(self, tmp_path):
+        """Test later cards win when fronts repeat, like building a dict"""
+        path = write_export(tmp_path, "a\t1\nb\t2\na\t3")
+        assert import_quizlet_lineskip_fix(path) == {"a": "3", "b": "2"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
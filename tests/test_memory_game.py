@@ -0,0 +1,105 @@
+"""
+Unit tests for memory_game.py using pytest
+"""
+
+import pytest
+import sys
+import os
+import random
+
+# Add the parent directory to the path to import memory_game
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from memory_game import MemoryGame, EMPTY, column_label, column_index, print_grid
+
+
+@pytest.fixture
+def game():
+    """Fixture providing a memory game set up with four pairs"""
+    deck = {"0": "zero", "1": "0", "2": "two", "3": "three"}
+    game = MemoryGame(deck)
+    game.select_cards(4)
+    game.calculate_board_size(4)
+    game.create_grid()
+    return game
+
+
+def cell_of(game, card):
+    """Find the cell holding a card id"""
+    return game.cells.index(card)
+
+
+class TestMemoryGame:
+    """Test cases for the MemoryGame class"""
+
+    def test_every_card_placed_once(self, game):
+        """Test each pair's front and back are both on the board"""
+        assert sorted(card for card in game.cells if card != EMPTY) == list(range(8))
+        assert game.remaining_pairs == 4
+
+    def test_matching(self, game):
+        """Test only a pair's front and back match, even if a card's text is "0" """
+        assert game.check_match(0, 1)
+        assert not game.check_match(1, 2)
+        assert not game.check_match(0, 0)
+
+    def test_game_completes(self, game):
+        """Test the game is complete once every pair is removed"""
+        for pair in range(4):
+            assert not game.is_game_complete()
+            game.remove_matched_cards(cell_of(game, 2 * pair), cell_of(game, 2 * pair + 1))
+        assert game.is_game_complete()
+        assert set(game.cells) == {EMPTY}
+
+    def test_seeded_boards_repeat(self):
+        """Test the same seed deals the same board"""
+        deck = {str(index): f"back {index}" for index in range(50)}
+        boards = []
+        for _ in range(2):
+            game = MemoryGame(deck, rng=random.Random(7))
+            game.select_cards(20)
+            game.calculate_board_size(20)
+            game.create_grid()
+            boards.append((game.f_b_pairs, game.cells))
+        assert boards[0] == boards[1]
+
+    def test_parse_choice(self, game):
+        """Test coordinates map to cells on the board only"""
+        assert game.parse_choice("1a") == 0
+        assert game.parse_choice(f"2{chr(97 + game.columns_count - 1)}") == 2 * game.columns_count - 1
+        assert game.parse_choice("9z") is None
+        assert game.parse_choice("a1") is None
+
+
+class TestLargeBoards:
+    """Test cases for boards beyond 9 rows and 26 columns"""
+
+    def test_column_labels(self):
+        """Test columns are labelled like a spreadsheet and parsed back"""
+        assert [column_label(index) for index in (0, 25, 26, 27, 701, 702)] == ["a", "z", "aa", "ab", "zz", "aaa"]
+        for index in range(1000):
+            assert column_index(column_label(index)) == index
+
+    def test_large_board_coordinates(self):
+        """Test multi-digit rows and multi-letter columns pick the right cell"""
+        game = MemoryGame({str(index): f"back {index}" for index in range(600)}, rng=random.Random(0))
+        game.select_cards(500)
+        game.calculate_board_size(500)
+        game.create_grid()
+        assert game.columns_count > 26
+        assert game.parse_choice("12aa") == 11 * game.columns_count + 26
+        assert game.parse_choice(" 12AA ") == 11 * game.columns_count + 26
+        assert game.parse_choice(f"{game.rows_count + 1}a") is None
+
+    def test_multi_digit_rows_aligned(self, capsys):
+        """Test a board is drawn with aligned rows"""
+        print_grid([0, EMPTY, 1] * 10, 3)
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[2] == "       a  b  c  "
+        assert lines[3] == "row 1  口    口 "
+        assert lines[-1] == "row 10 口    口 "
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
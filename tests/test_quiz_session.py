@@ -0,0 +1,72 @@
+"""
+Unit tests for quiz_session.py using pytest
+"""
+
+import pytest
+import sys
+import os
+import random
+from unittest.mock import patch
+
+# Add the parent directory to the path to import quiz_session
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from quiz_session import QuizSession, choose_quiz_length, run_quiz
+
+
+class TestChooseQuizLength:
+    """Test cases for the choose_quiz_length function"""
+
+    def test_whole_deck_allowed(self):
+        """Test a quiz can cover every card in the deck"""
+        with patch('builtins.input', return_value="5"):
+            assert choose_quiz_length(5) == 5
+
+    def test_invalid_input_asked_again(self):
+        """Test non-numbers and out of range lengths are rejected"""
+        with patch('builtins.input', side_effect=["three", "0", "6", "3"]), patch('builtins.print') as mock_print:
+            assert choose_quiz_length(5) == 3
+        assert mock_print.call_count == 3
+
+
+class TestQuizSession:
+    """Test cases for the QuizSession class"""
+
+    def test_each_card_asked_once(self, sample_deck):
+        """Test a full length quiz asks every card exactly once"""
+        session = QuizSession(sample_deck, len(sample_deck), rng=random.Random(0))
+        asked = list(session)
+        assert sorted(asked) == sorted(sample_deck.items())
+        assert len(session) == 0
+
+    def test_partial_quiz(self):
+        """Test a shorter quiz asks distinct cards"""
+        deck = {str(i): str(i * 2) for i in range(1000)}
+        session = QuizSession(deck, 10, rng=random.Random(1))
+        asked = list(session)
+        assert len(asked) == len(set(asked)) == 10
+        assert all(deck[question] == answer for question, answer in asked)
+
+    def test_back_to_front(self, sample_deck):
+        """Test the back is asked and the front is the answer in the "b" direction"""
+        session = QuizSession(sample_deck, len(sample_deck), "b", rng=random.Random(2))
+        for pair in session:
+            assert session.sides(pair) == (pair[1], pair[0])
+
+    def test_given_questions_in_order(self, sample_deck):
+        """Test questions passed in are asked in the order given"""
+        pairs = sorted(sample_deck.items())
+        assert list(QuizSession(sample_deck, 0, questions=pairs)) == pairs
+
+    def test_score(self, sample_deck):
+        """Test correct answers are counted in the summary"""
+        with patch('builtins.input', return_value=str(len(sample_deck))), patch('builtins.print'):
+            session = run_quiz(sample_deck, "f", "Test", lambda question, answer: question < "m")
+        expected = sum(1 for front in sample_deck if front < "m")
+        assert session.score == expected
+        assert f"You got {expected} out of {len(sample_deck)}" in session.summary()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
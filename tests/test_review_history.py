@@ -0,0 +1,100 @@
+"""
+Unit tests for review_history.py using pytest
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path to import review_history
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+import review_history
+from review_history import ReviewHistory, DAY
+
+NOW = 1_000_000_000.0
+
+
+def record_answers(history, answers, deck="deck.json", when=NOW):
+    """Record (front, correct) answers to a deck, one second apart"""
+    for offset, (front, correct) in enumerate(answers):
+        history.record(deck, front, "write the answer", "f", correct, 2.0, when=when + offset)
+
+
+class TestReviewHistory:
+    """Test cases for the ReviewHistory class"""
+
+    def test_card_accuracy(self, tmp_path):
+        """Test answers are counted per card and per deck"""
+        history = ReviewHistory(str(tmp_path))
+        record_answers(history, [("a", True), ("a", False), ("b", True)])
+        record_answers(history, [("a", False)], deck="other.json")
+        assert history.card_accuracy("deck.json") == {"a": (1, 2), "b": (1, 1)}
+        assert history.card_accuracy("other.json") == {"a": (0, 1)}
+        assert history.card_accuracy("missing.json") == {}
+
+    def test_hardest_cards(self, tmp_path):
+        """Test the least often correct cards come first"""
+        history = ReviewHistory(str(tmp_path))
+        record_answers(history, [("easy", True), ("hard", False), ("hard", False), ("medium", True),
+                                 ("medium", False)])
+        assert [front for front, _, _ in history.hardest_cards("deck.json")] == ["hard", "medium", "easy"]
+        assert history.hardest_cards("deck.json", count=1, min_answers=2) == [("hard", 0.0, 2)]
+
+    def test_learning_curve(self, tmp_path):
+        """Test accuracy is grouped by day"""
+        history = ReviewHistory(str(tmp_path))
+        record_answers(history, [("a", False), ("b", True)], when=0.0)
+        record_answers(history, [("a", True)], when=DAY)
+        assert history.learning_curve("deck.json") == [(0.0, 0.5, 2), (DAY, 1.0, 1)]
+
+    def test_flush_and_reload(self, tmp_path):
+        """Test flushed events are read back, and unflushed ones are not"""
+        history = ReviewHistory(str(tmp_path))
+        record_answers(history, [("a", True), ("b", False)])
+        history.flush()
+        record_answers(history, [("c", True)])
+        reloaded = ReviewHistory(str(tmp_path))
+        assert len(reloaded) == 2
+        assert reloaded.deck_summary("deck.json") == (2, 1, 2.0)
+
+    def test_untimed_answers(self, tmp_path):
+        """Test answers recorded without a latency are counted but left out of the average time"""
+        history = ReviewHistory(str(tmp_path))
+        history.record("deck.json", "a", "write the answer", "f", True, None, when=NOW)
+        assert history.deck_summary("deck.json") == (1, 1, None)
+        record_answers(history, [("b", False)])
+        history.flush()
+        assert ReviewHistory(str(tmp_path)).deck_summary("deck.json") == (2, 1, 2.0)
+
+    def test_two_writers(self, tmp_path):
+        """Test two histories open on the same directory keep each other's events and card names"""
+        first = ReviewHistory(str(tmp_path))
+        second = ReviewHistory(str(tmp_path))
+        record_answers(first, [("a", True), ("b", False)])
+        record_answers(second, [("c", False)], deck="other.json")
+        first.flush()
+        second.flush()
+        record_answers(first, [("a", True)])
+        first.flush()
+        reloaded = ReviewHistory(str(tmp_path))
+        assert len(reloaded) == 4
+        assert reloaded.card_accuracy("deck.json") == {"a": (2, 2), "b": (0, 1)}
+        assert reloaded.card_accuracy("other.json") == {"c": (0, 1)}
+        assert not os.path.exists(tmp_path / review_history.LOCK_FILE)
+
+    def test_segments_are_merged(self, tmp_path, monkeypatch):
+        """Test many flushes are merged into one base segment without losing events"""
+        monkeypatch.setattr(review_history, "MAX_SEGMENTS", 3)
+        history = ReviewHistory(str(tmp_path))
+        for index in range(7):
+            record_answers(history, [(str(index), True)])
+            history.flush()
+        segments = [name for name in os.listdir(tmp_path) if name.endswith(".seg")]
+        assert len(segments) <= 3
+        assert len(ReviewHistory(str(tmp_path))) == 7
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
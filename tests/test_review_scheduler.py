@@ -0,0 +1,115 @@
+"""
+Unit tests for review_scheduler.py using pytest
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path to import review_scheduler
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+import review_scheduler
+from review_scheduler import CardState, ReviewSchedule, DAY, MIN_EASE, open_schedule, save_schedule, \
+    schedule_path
+
+NOW = 1_000_000_000.0
+
+
+@pytest.fixture(autouse=True)
+def forget_open_schedules():
+    """Each test starts without schedules opened by earlier ones"""
+    review_scheduler._open_schedules.clear()
+    yield
+    review_scheduler._open_schedules.clear()
+
+
+class TestCardState:
+    """Test cases for the SM-2 updates of CardState"""
+
+    def test_intervals_grow(self):
+        """Test correct answers space the reviews 1, 6 and then ease times more days apart"""
+        state = CardState()
+        intervals = []
+        for _ in range(4):
+            state.review(4, NOW)
+            intervals.append(state.interval)
+        assert intervals == [1, 6, 15, 38]
+        assert state.due == NOW + 38 * DAY
+
+    def test_wrong_answer_resets(self):
+        """Test a wrong answer brings the card back the next day and lowers its ease"""
+        state = CardState(interval=15, repetitions=3)
+        state.review(1, NOW)
+        assert state.repetitions == 0
+        assert state.interval == 1
+        assert state.ease < 2.5
+        for _ in range(10):
+            state.review(0, NOW)
+        assert state.ease == MIN_EASE
+
+
+class TestReviewSchedule:
+    """Test cases for the ReviewSchedule class"""
+
+    def test_new_cards_due(self, sample_deck):
+        """Test cards that were never reviewed are due straight away"""
+        schedule = ReviewSchedule(sample_deck)
+        assert sorted(schedule.due_cards(100, NOW)) == sorted(sample_deck)
+
+    def test_reviewed_card_not_due(self, sample_deck):
+        """Test a reviewed card leaves the due cards until its interval has passed"""
+        schedule = ReviewSchedule(sample_deck)
+        schedule.review("What is Python?", True, NOW)
+        assert "What is Python?" not in schedule.due_cards(100, NOW)
+        assert "What is Python?" in schedule.due_cards(100, NOW + DAY)
+        assert len(schedule.due_cards(2, NOW)) == 2
+
+    def test_most_overdue_first(self):
+        """Test due cards come in order of when they became due"""
+        schedule = ReviewSchedule(["a", "b", "c"])
+        schedule.review("a", False, NOW)
+        schedule.review("b", False, NOW - DAY)
+        schedule.review("c", True, NOW - 2 * DAY)
+        assert schedule.due_cards(3, NOW + 2 * DAY) == ["c", "b", "a"]
+        assert schedule.next_due() == (NOW - DAY, "c")
+
+    def test_add_and_remove(self):
+        """Test edited cards are added to and dropped from the schedule"""
+        schedule = ReviewSchedule(["a"])
+        schedule.review("a", True, NOW)
+        schedule.add("b")
+        schedule.remove("a")
+        assert schedule.due_cards(5, NOW + 10 * DAY) == ["b"]
+        assert schedule.state("a") is None
+
+    def test_remove_and_add_back(self):
+        """Test a card removed and added back, eg. to fix its back, is only due once"""
+        schedule = ReviewSchedule(["a", "b"])
+        schedule.remove("a")
+        schedule.add("a")
+        assert sorted(schedule.due_cards(10, NOW)) == ["a", "b"]
+        schedule.review("b", True, NOW)
+        schedule.remove("b")
+        schedule.add("b")
+        schedule.review("b", False, NOW)
+        assert schedule.due_cards(10, NOW + DAY) == ["a", "b"]
+
+    def test_saved_schedule_reopened(self, tmp_path):
+        """Test review states survive saving and reopening, and new cards are picked up"""
+        deck_path = str(tmp_path / "deck.json")
+        deck = {"a": "1", "b": "2"}
+        open_schedule(deck, deck_path).review("a", True, NOW)
+        save_schedule(deck_path)
+        assert os.path.exists(schedule_path(deck_path))
+
+        review_scheduler._open_schedules.clear()
+        deck["c"] = "3"
+        schedule = open_schedule(deck, deck_path)
+        assert schedule.state("a").due == NOW + DAY
+        assert schedule.due_cards(5, NOW) == ["b", "c"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,125 @@
+"""
+Unit tests for search_index.py using pytest
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path to import search_index
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from search_index import SearchIndex, trigrams, open_search_index, get_open_search_index
+
+
+class TestSearch:
+    """Test cases for searching an index"""
+
+    def test_whole_words(self, sample_deck):
+        """Test a word finds the card it is on, in the front or the back"""
+        index = SearchIndex(sample_deck)
+        assert index.search("python").fronts == ["What is Python?"]
+        assert index.search("collection").total == 2
+
+    def test_parts_of_words(self):
+        """Test terms match inside words, and short terms match the start of words"""
+        index = SearchIndex({"photosynthesis": "Plants making food from light", "photon": "Particle of light"})
+        assert sorted(index.search("synth").fronts) == ["photosynthesis"]
+        assert sorted(index.search("ph").fronts) == ["photon", "photosynthesis"]
+        assert index.search("ot").total == 0
+
+    def test_every_word_must_match(self):
+        """Test a card only matches if it contains all the words of the query"""
+        index = SearchIndex({"cat": "A small pet", "dog": "A loyal pet", "lion": "A big cat"})
+        assert index.search("pet").total == 2
+        assert index.search("small PET").fronts == ["cat"]
+        assert index.search("pet big").total == 0
+
+    def test_front_matches_first(self):
+        """Test cards matching in their front are listed before cards matching in their back"""
+        index = SearchIndex({"lion": "A big cat", "cat": "A small pet", "wildcat": "A cat of the wild"})
+        assert index.search("cat").fronts[:2] == ["cat", "wildcat"]
+
+    def test_limit(self):
+        """Test the number of fronts returned is limited but the total counts every match"""
+        index = SearchIndex({f"card {number}": "same back" for number in range(30)})
+        result = index.search("same", limit=5)
+        assert result.total == 30
+        assert len(result.fronts) == 5
+
+    def test_punctuation_query(self):
+        """Test a query made only of punctuation is matched as written"""
+        index = SearchIndex({"not equal": "!=", "equal": "=="})
+        assert index.search("!=").fronts == ["not equal"]
+        assert index.search("   ").total == 0
+
+
+class TestEdits:
+    """Test cases for keeping an index up to date"""
+
+    def test_add_and_remove(self):
+        """Test added cards are found and removed cards are not"""
+        index = SearchIndex({"cat": "A small pet"})
+        index.add("parrot", "A talking pet")
+        assert sorted(index.search("pet").fronts) == ["cat", "parrot"]
+        assert sorted(index.search("ta").fronts) == ["parrot"]
+        index.remove("parrot")
+        assert index.search("talking").total == 0
+        assert index.search("ta").total == 0
+        assert len(index) == 1
+
+    def test_replace_card(self):
+        """Test adding a front again replaces its old back"""
+        index = SearchIndex({"cat": "A small pet"})
+        index.add("cat", "A feline")
+        assert index.search("small").total == 0
+        assert index.search("feline").fronts == ["cat"]
+
+    def test_same_as_rebuilt(self, sample_deck):
+        """Test an index edited card by card matches one built from scratch"""
+        index = SearchIndex({})
+        for front, back in sample_deck.items():
+            index.add(front, back)
+        index.add("extra", "Not in the deck")
+        index.remove("extra")
+        rebuilt = SearchIndex(sample_deck)
+        assert index._sorted_words == rebuilt._sorted_words
+        assert set(index._trigrams) == set(rebuilt._trigrams)
+
+
+class TestSuggest:
+    """Test cases for "did you mean" suggestions"""
+
+    def test_misspelled_front(self):
+        """Test the closest front is suggested first"""
+        index = SearchIndex({"mitochondria": "Powerhouse of the cell", "ribosome": "Makes proteins",
+                             "chloroplast": "Makes food from light"})
+        assert index.suggest("mitocondria")[0] == "mitochondria"
+        assert index.suggest("Ribosomes")[0] == "ribosome"
+
+    def test_nothing_close(self):
+        """Test nothing is suggested when no front shares anything with the text"""
+        index = SearchIndex({"cat": "A small pet"})
+        assert index.suggest("zzzz") == []
+
+
+class TestHelpers:
+    """Test cases for trigrams and the open indexes"""
+
+    def test_trigrams(self):
+        """Test trigrams are padded so short words have some"""
+        assert trigrams("cat") == {" ca", "cat", "at "}
+        assert trigrams("a") == {" a "}
+
+    def test_open_index_follows_deck(self, sample_deck):
+        """Test the open index is reused for the same deck and rebuilt for a reloaded one"""
+        path = "/decks/test_search.json"
+        index = open_search_index(sample_deck, path)
+        assert get_open_search_index(path) is index
+        assert open_search_index(sample_deck, path) is index
+        assert open_search_index(dict(sample_deck), path) is not index
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
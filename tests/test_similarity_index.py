@@ -0,0 +1,105 @@
+"""
+Unit tests for similarity_index.py using pytest
+"""
+
+import pytest
+import sys
+import os
+import json
+
+# Add the parent directory to the path to import similarity_index
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+import similarity_index
+from similarity_index import SimilarityIndex, open_similarity_index, save_similarity_index, index_path
+
+ANSWERS = [
+    "An ordered, mutable collection",
+    "An ordered, immutable collection",
+    "An unordered collection of unique items",
+    "A mapping of keys to values",
+    "A block of reusable code",
+    "A named block of reusable code",
+]
+
+
+@pytest.fixture(autouse=True)
+def forget_open_indexes():
+    """Each test starts without indexes opened by earlier ones"""
+    similarity_index._open_indexes.clear()
+    yield
+    similarity_index._open_indexes.clear()
+
+
+class TestSimilarityIndex:
+    """Test cases for the SimilarityIndex class"""
+
+    def test_nearest_is_most_similar(self):
+        """Test the closest answer is found first"""
+        index = SimilarityIndex()
+        index.build(ANSWERS)
+        assert index.nearest("An ordered, mutable collection", 1) == ["An ordered, immutable collection"]
+        assert index.nearest("A block of reusable code", 1) == ["A named block of reusable code"]
+        assert "A block of reusable code" not in index.nearest("A block of reusable code")
+
+    def test_add_and_remove_match_build(self):
+        """Test incremental updates give the same neighbours as building from scratch"""
+        index = SimilarityIndex()
+        index.build(ANSWERS[:3])
+        for answer in ANSWERS[3:]:
+            index.add(answer)
+        index.add("A small temporary answer")
+        index.remove("A small temporary answer")
+        assert len(index) == len(ANSWERS)
+        assert index.nearest("A block of reusable code", 1) == ["A named block of reusable code"]
+        index.remove("A named block of reusable code")
+        assert "A named block of reusable code" not in index.nearest("A block of reusable code")
+
+    def test_repeated_answers_are_counted(self):
+        """Test an answer shared by two cards stays until both are removed"""
+        index = SimilarityIndex()
+        index.build(["same", "same", "other"])
+        index.remove("same")
+        assert "same" in index
+        index.remove("same")
+        assert "same" not in index
+
+    def test_json_round_trip(self):
+        """Test a saved index gives the same neighbours"""
+        index = SimilarityIndex()
+        index.build(ANSWERS)
+        loaded = SimilarityIndex.from_json(json.loads(json.dumps(index.to_json())))
+        for answer in ANSWERS:
+            assert loaded.nearest(answer) == index.nearest(answer)
+
+
+class TestIndexFile:
+    """Test cases for saving and opening a deck's index"""
+
+    def test_saved_index_is_synced_with_deck(self, tmp_path):
+        """Test an index saved before the deck changed is brought up to date"""
+        deck_path = str(tmp_path / "deck.json")
+        deck = {str(i): answer for i, answer in enumerate(ANSWERS)}
+        open_similarity_index(deck, deck_path)
+        save_similarity_index(deck_path)
+        assert os.path.exists(index_path(deck_path))
+
+        similarity_index._open_indexes.clear()
+        del deck["5"]
+        deck["6"] = "An unordered mapping of keys to values"
+        index = open_similarity_index(deck, deck_path)
+        assert "A named block of reusable code" not in index
+        assert index.nearest("A mapping of keys to values", 1) == ["An unordered mapping of keys to values"]
+
+    def test_unreadable_index_is_rebuilt(self, tmp_path):
+        """Test a corrupt index file is replaced by a fresh index"""
+        deck_path = str(tmp_path / "deck.json")
+        with open(index_path(deck_path), "w") as file:
+            file.write("not json")
+        index = open_similarity_index({"a": ANSWERS[0], "b": ANSWERS[1]}, deck_path)
+        assert index.nearest(ANSWERS[0]) == [ANSWERS[1]]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,88 @@
+"""
+Unit tests for startup_profile.py and the lazily loaded modules using pytest
+"""
+
+import pytest
+import sys
+import os
+import subprocess
+
+# Add the parent directory to the path to import startup_profile
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, parent_dir)
+
+from startup_profile import ImportTimer
+
+
+@pytest.fixture
+def module_files(tmp_path, monkeypatch):
+    """Fixture providing two new modules, the outer one importing the inner one"""
+    (tmp_path / "timed_outer.py").write_text("import timed_inner\nVALUE = timed_inner.VALUE + 1\n")
+    (tmp_path / "timed_inner.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield
+    for name in ("timed_outer", "timed_inner"):
+        sys.modules.pop(name, None)
+
+
+class TestImportTimer:
+    """Test cases for the import timing finder"""
+
+    def test_nested_imports(self, module_files):
+        """Test imports are recorded innermost first, with the inner time inside the outer one"""
+        timer = ImportTimer().install()
+        try:
+            import timed_outer
+        finally:
+            timer.uninstall()
+        assert timed_outer.VALUE == 2
+        (inner, inner_own, inner_total, inner_depth), (outer, outer_own, outer_total, outer_depth) = timer.records
+        assert (inner, inner_depth, outer, outer_depth) == ("timed_inner", 1, "timed_outer", 0)
+        assert inner_own == inner_total
+        assert outer_total >= outer_own + inner_total * 0.99
+
+    def test_uninstall(self, module_files):
+        """Test nothing is recorded once the timer is uninstalled"""
+        timer = ImportTimer().install()
+        timer.uninstall()
+        assert timer not in sys.meta_path
+        import timed_outer
+        assert timer.records == []
+
+    def test_report(self, module_files):
+        """Test the report has a line per module and the total"""
+        timer = ImportTimer().install()
+        try:
+            import timed_outer
+        finally:
+            timer.uninstall()
+        lines = timer.report("the test").splitlines()
+        assert lines[0].startswith("import time: self [us]")
+        assert lines[2].endswith("| timed_outer")
+        assert lines[-1].startswith("2 modules imported") and lines[-1].endswith("to the test.")
+
+
+class TestLazyStartup:
+    """Test cases for the modules left out of startup"""
+
+    def test_modes_not_imported(self):
+        """Test importing the main module doesn't import indexes, quiz modes, games or importers"""
+        lazy = ["quiz_multiple_choice", "quiz_write_answer", "quiz_self_report", "memory_game", "import_utils",
+                "batch_import", "similarity_index", "review_scheduler", "search_index", "review_history",
+                "answer_matching", "quiz_session"]
+        code = f"import sys, main; print([name for name in {lazy!r} if name in sys.modules])"
+        output = subprocess.run([sys.executable, "-c", code], cwd=parent_dir, capture_output=True, text=True)
+        assert output.stdout.strip() == "[]"
+
+    def test_registered_entries_load(self):
+        """Test every registered entry can be loaded"""
+        from app_controller import LAZY_ENTRIES, load_entry, register_entry
+        for name in LAZY_ENTRIES:
+            assert callable(load_entry(name))
+        register_entry("choose_quiz_length", "quiz_session")
+        assert load_entry("choose_quiz_length").__name__ == "choose_quiz_length"
+        del LAZY_ENTRIES["choose_quiz_length"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])